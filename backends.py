@@ -0,0 +1,257 @@
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+
+from data_store import data_path, cache_path
+from instrumentation import timed
+
+
+class StorageBackend:
+    '''
+    Storage interface behind ProfessorRepository.
+    A profile is a dict with the keys name, keywords, publications and num_contributions.
+    '''
+
+    def fetch_profiles(self, names):
+        raise NotImplementedError
+
+    def fetch_keyword_entries(self):
+        '''
+        Get the {"keyword", "names"} documents of every research keyword
+        '''
+        raise NotImplementedError
+
+    def keywords_version(self):
+        '''
+        Get a token that changes whenever the keywords change, or None if the
+        backend cannot tell without fetching them
+        '''
+        return None
+
+    def fetch_all_publications(self):
+        '''
+        Get the {"name", "publications"} records of every professor with publication data
+        '''
+        raise NotImplementedError
+
+    def publications_version(self):
+        '''
+        Get a token that changes whenever the publications change, or None if the
+        backend cannot tell without fetching them
+        '''
+        return None
+
+    def warm_up(self):
+        '''
+        Establish the connection ahead of the first query
+        '''
+
+
+def empty_profile(name):
+    return {"name": name, "keywords": [], "publications": None, "num_contributions": None}
+
+
+class MongoBackend(StorageBackend):
+    '''
+    Backend reading the scsedash MongoDB database
+    '''
+
+    def __init__(self, db):
+        self.db = db
+
+    @timed
+    def warm_up(self):
+        # Blocks for at most serverSelectionTimeoutMS when the server is unreachable
+        self.db.command('ping')
+
+    @timed
+    def fetch_profiles(self, names):
+        # One $in query per collection: a name may be in either collection only
+        profiles = {name: empty_profile(name) for name in names}
+        for dic in self.db.professors.find({"name": {"$in": names}}, {"_id": 0, "name": 1, "keywords": 1}):
+            profiles[dic["name"]]["keywords"] = dic.get("keywords", [])
+        for dic in self.db.DBLP_publications.find({"name": {"$in": names}},
+                                                  {"_id": 0, "name": 1, "publications": 1, "num_contributions": 1}):
+            profile = profiles[dic["name"]]
+            profile["publications"] = dic.get("publications")
+            profile["num_contributions"] = dic.get("num_contributions")
+        return profiles
+
+    @timed
+    def fetch_all_publications(self):
+        return list(self.db.DBLP_publications.find({"publications": {"$ne": None}},
+                                                   {"_id": 0, "name": 1, "publications": 1}))
+
+    @timed
+    def fetch_keyword_entries(self):
+        return list(self.db.keywordsAndNames.find({}, {"_id": 0, "keyword": 1, "names": 1}))
+
+
+# Exports of the MongoDB collections the local backend is built from.
+# DBLP_publications.json is optional, without it no publication data is served.
+local_sources = {
+    'keywordsAndNames': 'keywordsAndNames.json',
+    'professors': 'namesAndKeywords.json',
+    'DBLP_publications': 'DBLP_publications.json',
+}
+
+_schema = '''
+CREATE TABLE meta (source TEXT PRIMARY KEY, signature TEXT);
+CREATE TABLE keywords (keyword TEXT, name TEXT);
+CREATE INDEX keywords_keyword ON keywords (keyword);
+CREATE TABLE professors (name TEXT PRIMARY KEY, keywords TEXT);
+CREATE TABLE publications (name TEXT PRIMARY KEY, publications TEXT, num_contributions TEXT);
+'''
+
+
+def _source_signature(path):
+    if not os.path.exists(path):
+        return ''
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class SQLiteBackend(StorageBackend):
+    '''
+    Embedded backend serving the JSON exports in data/ from a local SQLite file.
+    The file is (re)built whenever one of the exports changes: the signatures
+    (mtime and size) of the exports are checked on every connection.
+    '''
+
+    def __init__(self, path=None, data_dir=None):
+        self.path = path or cache_path('scsedash.sqlite3')
+        self.data_dir = data_dir
+        self._local = threading.local()
+        self._build_lock = threading.Lock()
+        # Signatures of the exports the file was last checked against, and the
+        # number of checks that found it rebuilt (connections of older ones are reopened)
+        self._signatures_checked = None
+        self._generation = 0
+
+    def _source_path(self, filename):
+        if self.data_dir is None:
+            return data_path(filename)
+        return os.path.join(self.data_dir, filename)
+
+    def _signatures(self):
+        return {source: _source_signature(self._source_path(filename))
+                for source, filename in local_sources.items()}
+
+    def _is_current(self, signatures):
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with closing(sqlite3.connect(self.path)) as conn:
+                stored = dict(conn.execute("SELECT source, signature FROM meta"))
+        except sqlite3.DatabaseError:
+            return False
+        return stored == signatures
+
+    @timed
+    def build(self):
+        '''
+        Build the SQLite file from the JSON exports
+        '''
+        signatures = self._signatures()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # A unique name, as several workers may build at the same time
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(self.path) + '.',
+                                        dir=os.path.dirname(self.path) or '.')
+        os.close(fd)
+
+        try:
+            conn = sqlite3.connect(tmp_path)
+            with conn:
+                conn.executescript(_schema)
+                keywords = _read_json(self._source_path(local_sources['keywordsAndNames']))
+                conn.executemany("INSERT INTO keywords VALUES (?, ?)",
+                                 ((dic["keyword"], name) for dic in keywords
+                                  for name in dict.fromkeys(dic["names"])))
+                professors = _read_json(self._source_path(local_sources['professors']))
+                conn.executemany("INSERT OR REPLACE INTO professors VALUES (?, ?)",
+                                 ((dic["name"], json.dumps(dic.get("keywords", []))) for dic in professors))
+                publications = _read_json(self._source_path(local_sources['DBLP_publications']))
+                conn.executemany("INSERT OR REPLACE INTO publications VALUES (?, ?, ?)",
+                                 ((dic["name"], json.dumps(dic.get("publications")),
+                                   json.dumps(dic.get("num_contributions"))) for dic in publications))
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", signatures.items())
+            conn.close()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return signatures
+
+    @timed
+    def warm_up(self):
+        self._connection()
+
+    def _connection(self):
+        signatures = self._signatures()
+        if signatures != self._signatures_checked:
+            with self._build_lock:
+                if signatures != self._signatures_checked:
+                    if not self._is_current(signatures):
+                        signatures = self.build()
+                    self._signatures_checked = signatures
+                    self._generation += 1
+        conn, generation = getattr(self._local, 'conn', (None, None))
+        if generation != self._generation:
+            if conn is not None:
+                conn.close()
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            self._local.conn = (conn, self._generation)
+        return conn
+
+    @timed
+    def fetch_profiles(self, names):
+        conn = self._connection()
+        placeholders = ','.join('?' * len(names))
+        profiles = {name: empty_profile(name) for name in names}
+        rows = conn.execute(f"SELECT name, keywords FROM professors WHERE name IN ({placeholders})", names)
+        for name, keywords in rows:
+            profiles[name]["keywords"] = json.loads(keywords)
+        rows = conn.execute(f"SELECT name, publications, num_contributions FROM publications "
+                            f"WHERE name IN ({placeholders})", names)
+        for name, publications, num_contributions in rows:
+            profiles[name]["publications"] = json.loads(publications)
+            profiles[name]["num_contributions"] = json.loads(num_contributions)
+        return profiles
+
+    @timed
+    def fetch_all_publications(self):
+        records = []
+        for name, publications in self._connection().execute("SELECT name, publications FROM publications"):
+            publications = json.loads(publications)
+            if publications is not None:
+                records.append({"name": name, "publications": publications})
+        return records
+
+    def publications_version(self):
+        return self._source_version('DBLP_publications')
+
+    @timed
+    def fetch_keyword_entries(self):
+        entries = {}
+        for keyword, name in self._connection().execute("SELECT keyword, name FROM keywords ORDER BY rowid"):
+            entries.setdefault(keyword, []).append(name)
+        return [{"keyword": keyword, "names": names} for keyword, names in entries.items()]
+
+    def keywords_version(self):
+        return self._source_version('keywordsAndNames')
+
+    def _source_version(self, source):
+        # The file is rebuilt whenever an export changes
+        self._connection()
+        signature = self._signatures_checked[source]
+        return f'sqlite:{signature}' if signature else ''
@@ -0,0 +1,9 @@
+'''
+Benchmarks of the dashboard: timings of every utils function, of full script
+runs and of the cold import, the payload size of the main figures, a synthetic scaled dataset and a headless load
+generator of concurrent sessions. Run python -m benchmarks --help from the repository root.
+The script and load benchmarks need streamlit>=1.28 (streamlit.testing).
+'''
+from .synthetic import generate
+from .functions import benchmark_functions, benchmark_script, benchmark_imports, benchmark_figures
+from .load import run_load
@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import logging
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmark the SCSE dashboard")
+    parser.add_argument('--data-dir', default=None,
+                        help="data directory to benchmark against (default: ./data, or SCSEDASH_DATA_DIR)")
+    parser.add_argument('--output', default=None, help="write the results as JSON to this file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="write a synthetic scaled data directory")
+    generate.add_argument('output_dir')
+    generate.add_argument('--professors', type=int, default=1000)
+    generate.add_argument('--publications', type=int, default=100000)
+    generate.add_argument('--coauthors-per-paper', type=float, default=3.0)
+    generate.add_argument('--scse-share', type=float, default=0.3,
+                          help="share of coauthors that are SCSE professors (coauthor graph density)")
+    generate.add_argument('--seed', type=int, default=42)
+
+    functions = commands.add_parser('functions', help="time every utils function")
+    functions.add_argument('--repeats', type=int, default=5)
+    functions.add_argument('--skip', action='append', default=[], metavar='FUNCTION',
+                           help="do not run this case, e.g. display_overall_graph on very dense graphs")
+
+    script = commands.add_parser('script', help="time full runs of demo.py")
+    script.add_argument('--runs', type=int, default=5)
+
+    imports = commands.add_parser('imports', help="check the cold import time of the dashboard against its budget")
+    imports.add_argument('--module', default='utils')
+    imports.add_argument('--budget-ms', type=int, default=None)
+
+    commands.add_parser('figures', help="report the payload size of the main figures")
+
+    load = commands.add_parser('load', help="simulate concurrent sessions")
+    load.add_argument('--sessions', type=int, default=4)
+    load.add_argument('--reruns', type=int, default=20, help="reruns per session")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.data_dir:
+        # Before the dashboard modules are imported, so every data path resolves to it
+        os.environ['SCSEDASH_DATA_DIR'] = args.data_dir
+        import data_store
+        data_store.DATA_DIR = args.data_dir
+
+    if args.command == 'generate':
+        from .synthetic import generate as generate_data
+        generate_data(args.output_dir, professors=args.professors, publications=args.publications,
+                      coauthors_per_paper=args.coauthors_per_paper, scse_share=args.scse_share, seed=args.seed)
+        return 0
+    if args.command == 'functions':
+        from .functions import benchmark_functions
+        result = benchmark_functions(args.repeats, skip=args.skip)
+    elif args.command == 'script':
+        from .functions import benchmark_script
+        result = benchmark_script(runs=args.runs)
+    elif args.command == 'imports':
+        from .functions import benchmark_imports, import_budget_ms
+        result = benchmark_imports(args.module, budget_ms=args.budget_ms or import_budget_ms)
+    elif args.command == 'figures':
+        from .functions import benchmark_figures
+        result = benchmark_figures()
+    else:
+        from .load import run_load
+        result = run_load(args.sessions, args.reruns)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=4)
+    else:
+        json.dump(result, sys.stdout, indent=4)
+        print()
+    return 1 if result.get('errors') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
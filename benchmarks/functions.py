@@ -0,0 +1,188 @@
+import sys
+import time
+import logging
+import subprocess
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Cold import of the dashboard module, most of it Streamlit and pandas
+import_budget_ms = 1500
+# Renderers and clients that must only be imported by the functions using them
+deferred_modules = ('plotly.express', 'networkx', 'igviz', 'wordcloud', 'matplotlib', 'pymongo', 'sklearn')
+
+
+def percentiles(samples):
+    samples = np.asarray(samples, dtype=float) * 1000
+    return {'p50_ms': float(np.percentile(samples, 50)), 'p99_ms': float(np.percentile(samples, 99)),
+            'max_ms': float(samples.max())}
+
+
+def _cases(names, keywords):
+    '''
+    (label, function) pairs calling every utils function on the current data directory
+    '''
+    import utils
+    from search import get_search_index
+
+    name = names[0]
+    profile = {'name': name, 'num_contributions': utils.find_num_contributions_using_name(name)}
+    contributions = profile['num_contributions'][0] if profile['num_contributions'] else None
+    return [
+        ('get_list_of_keywords', lambda: utils.get_list_of_keywords()),
+        ('find_name_using_keyword', lambda: utils.find_name_using_keyword(keywords[:2])),
+        ('find_name_using_keyword (all)', lambda: utils.find_name_using_keyword(keywords[:2], match='all')),
+        ('count_professors_by_keyword', lambda: utils.count_professors_by_keyword(keywords[:2])),
+        ('get_keywords_given_name', lambda: utils.get_keywords_given_name(name)),
+        ('find_num_contributions_using_name', lambda: utils.find_num_contributions_using_name(name)),
+        ('plot_year_of_involvement', lambda: contributions and utils.plot_year_of_involvement(contributions)),
+        ('display_publications_by_year', lambda: utils.display_publications_by_year(name)),
+        ('display_publications_by_type', lambda: utils.display_publications_by_type(name)),
+        ('display_word_cloud', lambda: utils.display_word_cloud(name, key='benchmark')),
+        ('display_similar_professors', lambda: utils.display_similar_professors(name)),
+        ('display_top_coauthors', lambda: utils.display_top_coauthors(name)),
+        ('conference_count_plot', lambda: utils.conference_count_plot(name)),
+        ('display_individual_graph', lambda: utils.display_individual_graph(name)),
+        ('plot_scse_bar', lambda: utils.plot_scse_bar()),
+        ('display_top_n_keywords', lambda: utils.display_top_n_keywords()),
+        ('display_treemap', lambda: utils.display_treemap()),
+        ('display_trends', lambda: utils.display_trends()),
+        ('display_trends (selection)', lambda: utils.display_trends(keywords[:2])),
+        ('display_overall_graph', lambda: utils.display_overall_graph()),
+        ('display_comparison', lambda: utils.display_comparison(names[:5])),
+        ('search', lambda: get_search_index().search_professors('learning network')),
+    ]
+
+
+def benchmark_functions(repeats=5, skip=()):
+    '''
+    Time every utils function: the first (cold) call and the following warm calls.
+    Streamlit calls run in bare mode, so this measures the Python side of a rerun only.
+    Cases whose label is in skip are not run.
+    '''
+    import data_store
+    from repository import get_repository
+
+    # Bare mode Streamlit warns on every element
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    names = data_store.get_professors_table()['Full Name'].tolist()
+    keywords = [entry['keyword'] for entry in get_repository().get_keyword_entries()]
+
+    results = {}
+    for label, function in _cases(names, keywords):
+        if label in skip:
+            continue
+        samples = []
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            function()
+            samples.append(time.perf_counter() - start)
+        results[label] = {'first_ms': samples[0] * 1000, **percentiles(samples[1:])}
+        logger.info("%-36s first %9.2f ms  p50 %9.2f ms", label, results[label]['first_ms'],
+                    results[label]['p50_ms'])
+    return results
+
+
+def _figures(names):
+    '''
+    (label, function) pairs building the main figures of the dashboard
+    '''
+    import utils
+    import figures
+    from graph_figures import overall_graph_figure, individual_graph_figure
+
+    name = names[0]
+    contributions = utils.find_num_contributions_using_name(name)
+    return [
+        ('overall_graph', lambda: overall_graph_figure()),
+        ('individual_graph', lambda: individual_graph_figure(name)),
+        ('year_of_involvement', lambda: contributions and figures.year_of_involvement_figure(contributions[0])),
+        ('conference_count', lambda: figures.conference_count_figure(name)),
+        ('research_area', lambda: figures.research_area_figure()),
+        ('top_keywords', lambda: figures.top_keywords_figure(10)),
+        ('treemap', lambda: figures.treemap_figure()),
+        ('school_trend', lambda: figures.school_trend_figure()),
+        ('area_trend', lambda: figures.area_trend_figure()),
+    ]
+
+
+def benchmark_figures():
+    '''
+    Report the JSON payload of the main figures in the current figure mode
+    (SCSEDASH_FIGURES): as built, compacted and with base64 typed arrays
+    '''
+    import data_store
+    import figure_payload
+
+    names = data_store.get_professors_table()['Full Name'].tolist()
+    built = {}
+    for label, function in _figures(names):
+        start = time.perf_counter()
+        figure = function()
+        if figure:
+            built[label] = figure
+            logger.info("%-36s built in %9.2f ms", label, (time.perf_counter() - start) * 1000)
+    rows = figure_payload.size_report(built)
+    for row in rows:
+        logger.info("%-36s %9d bytes  compact %9d  typed %9d", row['figure'], row['bytes'], row['compact_bytes'],
+                    row['typed_bytes'])
+    return {'mode': figure_payload.mode, 'figures': rows,
+            'total': {key: sum(row[key] for row in rows) for key in ('bytes', 'compact_bytes', 'typed_bytes')}}
+
+
+def _importtime(module):
+    '''
+    {module name: (self ms, cumulative ms, depth)} of a cold import of module in a fresh interpreter
+    '''
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, check=True)
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(own) / 1000, int(cumulative) / 1000, depth)
+    return modules
+
+
+def benchmark_imports(module='utils', runs=3, budget_ms=import_budget_ms):
+    '''
+    Time cold imports of module (best of runs) against the import-time budget and check
+    that none of the deferred modules is imported with it
+    '''
+    samples = [_importtime(module) for _ in range(runs)]
+    modules = min(samples, key=lambda modules: modules[module][1])
+    import_ms = modules[module][1]
+    heaviest = sorted(((name, cumulative) for name, (_, cumulative, depth) in modules.items() if depth == 1),
+                      key=lambda item: -item[1])[:10]
+    errors = []
+    if import_ms > budget_ms:
+        errors.append(f"import {module} took {import_ms:.0f} ms, over the budget of {budget_ms} ms")
+    for name in deferred_modules:
+        if name in modules:
+            errors.append(f"import {module} imports {name}")
+    logger.info("import %-29s %9.2f ms  budget %6d ms", module, import_ms, budget_ms)
+    return {'module': module, 'import_ms': import_ms, 'budget_ms': budget_ms,
+            'heaviest_ms': dict(heaviest), 'errors': errors}
+
+
+def benchmark_script(script='demo.py', runs=5, timeout=300):
+    '''
+    Time full runs of the dashboard script in a headless AppTest session
+    '''
+    from streamlit.testing.v1 import AppTest
+
+    samples = []
+    app = AppTest.from_file(script, default_timeout=timeout)
+    for _ in range(runs):
+        start = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+    result = {'first_ms': samples[0] * 1000, **percentiles(samples[1:] or samples)}
+    logger.info("%-36s first %9.2f ms  p50 %9.2f ms", script, result['first_ms'], result['p50_ms'])
+    return result
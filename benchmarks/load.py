@@ -0,0 +1,98 @@
+import time
+import logging
+import threading
+
+from .functions import percentiles
+
+
+logger = logging.getLogger(__name__)
+
+professor_label = "Which professor's information would you like to view?"
+
+
+def _memory():
+    '''
+    Resident memory of the process in bytes
+    '''
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        # Peak rather than current on platforms without psutil
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def _select_professor(app, index):
+    selectbox = _widget(app.selectbox, professor_label)
+    selectbox.set_value(selectbox.options[index % len(selectbox.options)])
+
+
+def _scenario(app, session, step):
+    '''
+    The interaction of a session at a step: browse tabs, professors, publications, comparison and search
+    '''
+    actions = [
+        lambda: app.radio(key='main_tab').set_value('💻SCSE'),
+        lambda: app.radio(key='main_tab').set_value('✒️Professors'),
+        lambda: _select_professor(app, session + step),
+        lambda: app.radio(key='publication_view').set_value('By type'),
+        lambda: app.radio(key='main_tab').set_value('⭐View More'),
+        lambda: app.radio(key='main_tab').set_value('🔎Search'),
+        lambda: app.text_input(key='search_query').set_value(['learning', 'network security', 'vision'][step % 3]),
+    ]
+    try:
+        actions[step % len(actions)]()
+    except (KeyError, StopIteration):
+        # The widget is not on the current page
+        pass
+
+
+def run_load(sessions=4, reruns=20, script='demo.py', timeout=300):
+    '''
+    Drive concurrent headless sessions of the dashboard and report the rerun latency
+    percentiles and the memory added per session
+    '''
+    from streamlit.testing.v1 import AppTest
+
+    baseline = _memory()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    apps = [AppTest.from_file(script, default_timeout=timeout) for _ in range(sessions)]
+
+    def run_session(session):
+        app = apps[session]
+        for step in range(reruns):
+            if step:
+                _scenario(app, session, step)
+            start = time.perf_counter()
+            app.run()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors.extend(exception.message for exception in app.exception)
+
+    threads = [threading.Thread(target=run_session, args=(session,)) for session in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'reruns_per_second': len(latencies) / elapsed,
+        'memory_per_session_mb': (_memory() - baseline) / sessions / 2 ** 20,
+        'errors': sorted(set(errors)),
+        **percentiles(latencies),
+    }
+    logger.info("%d sessions, %d reruns: p50 %.1f ms, p99 %.1f ms, %.1f MB per session",
+                sessions, len(latencies), result['p50_ms'], result['p99_ms'], result['memory_per_session_mb'])
+    return result
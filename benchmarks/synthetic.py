@@ -0,0 +1,142 @@
+import os
+import csv
+import json
+import shutil
+import logging
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+publication_types = ['Journal Articles', 'Conference and Workshop Papers', 'Informal and Other Publications',
+                     'Editorship', 'Parts in Books or Collections']
+type_weights = [0.35, 0.45, 0.12, 0.04, 0.04]
+first_year, last_year = 1995, 2024
+words = '''
+learning deep neural network graph secure privacy federated efficient scalable distributed
+quantum vision language model robust adaptive streaming query database index blockchain
+hardware energy wireless edge cloud computing optimization reinforcement generative attention
+retrieval recommendation detection segmentation synthesis verification compiler memory cache
+'''.split()
+given_names = '''
+Wei Jun Li Ming Hui Kai Yan Lin Chen Xin Yu Tan Lee Ong Ng Lim Goh Chua Koh Teo Ang Seah Yeo
+'''.split()
+
+
+def _name_token(index):
+    '''
+    Spell index as an alphabetic name token of at least two syllables ("Baba", "Babe", ...),
+    so it survives name normalization, which drops digits
+    '''
+    syllables = [consonant + vowel for consonant in 'bdfghkmnprstvz' for vowel in 'aeiou']
+    token = ''
+    while index or len(token) < 4:
+        index, digit = divmod(index, len(syllables))
+        token = syllables[digit] + token
+    return token.capitalize()
+
+
+def _professor_names(count, rng):
+    '''
+    Names of two given names and a distinct surname, unique after name normalization
+    '''
+    return sorted(' '.join(rng.choice(given_names, 2)) + ' ' + _name_token(i) for i in range(count))
+
+
+def generate(output, professors=1000, publications=100000, coauthors_per_paper=3.0, scse_share=0.3,
+             seed=42, source_dir='./data'):
+    '''
+    Write a synthetic data directory with the layout of data/ and the given number of
+    professors and publications, then derive the remaining files with build.py.
+    scse_share is the probability that a coauthor is another SCSE professor, which
+    controls the density of the coauthor graph.
+    '''
+    import build
+    import data_store
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(output, exist_ok=True)
+    for filename in ('research_areas.json', 'CORE.csv'):
+        shutil.copy(os.path.join(source_dir, filename), os.path.join(output, filename))
+
+    names = _professor_names(professors, rng)
+    with open(os.path.join(source_dir, 'research_areas.json'), 'r') as f:
+        research_areas = json.load(f)
+    keywords = [keyword for area in research_areas.values() for keyword in area]
+    with open(os.path.join(source_dir, 'CORE.csv'), 'r', encoding='utf-8', errors='replace', newline='') as f:
+        venues = [row[2] for row in csv.reader(f)][1:]
+    venues += ['IEEE Access', 'CoRR', 'Sensors']
+
+    # Keywords: every professor has 3 to 8 keywords
+    professor_keywords = {name: list(rng.choice(keywords, rng.integers(3, 9), replace=False)) for name in names}
+    keyword_names = {}
+    for name, selected in professor_keywords.items():
+        for keyword in selected:
+            keyword_names.setdefault(keyword, []).append(name)
+    _write_json(output, 'namesAndKeywords.json',
+                [{'name': name, 'keywords': selected} for name, selected in professor_keywords.items()])
+    _write_json(output, 'keywordsAndNames.json',
+                [{'keyword': keyword, 'names': selected} for keyword, selected in keyword_names.items()])
+
+    # Publications: a skewed number of papers per professor
+    share = rng.pareto(1.5, professors) + 1
+    counts = rng.multinomial(publications, share / share.sum())
+    external = [f"External Author {_name_token(i)}" for i in range(max(publications // 10, 1))]
+    records = []
+    rows = []
+    for name, count in zip(names, counts):
+        years = rng.integers(first_year, last_year + 1, count)
+        types = rng.choice(len(publication_types), count, p=type_weights)
+        title_words = rng.choice(words, (count, 6))
+        paper_venues = rng.choice(venues, count)
+        coauthor_counts = rng.poisson(coauthors_per_paper, count)
+        by_year = {}
+        contributions = {}
+        for i in range(count):
+            coauthors = [name]
+            for _ in range(coauthor_counts[i]):
+                pool = names if rng.random() < scse_share else external
+                coauthors.append(pool[rng.integers(len(pool))])
+            year, category = str(years[i]), publication_types[types[i]]
+            by_year.setdefault(year, {}).setdefault(category, []).append({
+                'title': ' '.join(title_words[i]).capitalize() + '.',
+                'coauthors': coauthors,
+                'conference_name': paper_venues[i],
+                'url': f"https://dblp.org/rec/synthetic/{len(rows)}/{i}",
+            })
+            contributions.setdefault(year, {}).setdefault(category, 0)
+            contributions[year][category] += 1
+        records.append({'name': name, 'publications': by_year, 'num_contributions': contributions})
+        rows.append({
+            'Full Name': name,
+            'Email': f"{name.split()[-1]}@example.edu",
+            'DR-NTU URL': f"https://dr.ntu.edu.sg/cris/rp/{name.split()[-1]}",
+            'Website URL': 'NaN',
+            'DBLP URL': f"https://dblp.org/pid/{name.split()[-1]}",
+            'Citations (All)': int(rng.integers(0, 50000)),
+            'orcid_url': 'NaN',
+            'biography': f"{name} works on " + ', '.join(rng.choice(words, 12)) + '.',
+            'publications_count': int(count),
+            'top_conference_count': int(rng.integers(0, count + 1)),
+        })
+    _write_json(output, 'DBLP_publications.json', records)
+    for filename, columns in (('professors_new.csv', list(rows[0])), ('professors.csv', list(rows[0])[:6])):
+        with open(os.path.join(output, filename), 'w', newline='') as f:
+            writer = csv.DictWriter(f, columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    logger.info("Wrote %d professors and %d publications to %s", professors, publications, output)
+
+    # Derived files, built as for the real data
+    previous = data_store.DATA_DIR
+    data_store.DATA_DIR = output
+    try:
+        build.build(force=True)
+    finally:
+        data_store.DATA_DIR = previous
+
+
+def _write_json(output, filename, value):
+    with open(os.path.join(output, filename), 'w') as f:
+        json.dump(value, f)
@@ -0,0 +1,291 @@
+'''
+Incremental build of the derived datasets in data/.
+
+Every artifact declares the files it is built from. Per-professor artifacts
+only recompute the professors whose source record changed since the last build
+and merge them into the existing output; aggregate artifacts are rebuilt only
+when one of their inputs changed. Run python build.py after the exports in
+data/ were updated (e.g. by python -m ingest).
+'''
+import os
+import csv
+import json
+import hashlib
+import logging
+import argparse
+
+import similarity
+from data_store import data_path, cache_path, file_digest, get_professors_table
+from name_matching import NameResolver
+from publication_store import PublicationStore, flatten_publications
+from core_ranking import VenueRanker, core_editions, rank_matrix, conference_count_documents
+from graph_index import CoauthorGraph
+from graph_analytics import analyze
+
+
+logger = logging.getLogger('build')
+
+# Reviewed DBLP name -> SCSE professor name (or null) table, edited by hand;
+# coauthors_scse.json is rebuilt when it changes.
+# The names the build could not resolve, with similar professors, are written
+# to data/cache/name_alias_proposals.json for review.
+alias_table = 'name_aliases.json'
+alias_proposals = 'name_alias_proposals.json'
+
+
+def read_json(filename):
+    with open(data_path(filename), 'r') as f:
+        return json.load(f)
+
+
+def write_json(filename, value, path=None):
+    # The exports in data/ use Windows line endings
+    path = path or data_path(filename)
+    with open(path + '.tmp', 'w', newline='\r\n') as f:
+        json.dump(value, f, indent=4)
+    os.replace(path + '.tmp', path)
+
+
+def write_csv(filename, header, rows):
+    path = data_path(filename)
+    with open(path + '.tmp', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(path + '.tmp', path)
+
+
+def record_hash(record):
+    return hashlib.sha1(json.dumps(record, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class Context:
+    '''
+    Inputs shared by the builds of all professors, loaded at most once per run
+    '''
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, key, load):
+        if key not in self._values:
+            self._values[key] = load()
+        return self._values[key]
+
+    @property
+    def scse_names(self):
+        def load():
+            with open(data_path('professors.csv'), 'r', encoding='utf-8', errors='replace', newline='') as f:
+                return [row['Full Name'] for row in csv.DictReader(f)]
+        return self.get('scse_names', load)
+
+    @property
+    def name_resolver(self):
+        return self.get('name_resolver', lambda: NameResolver(self.scse_names, data_path(alias_table),
+                                                                cache_path(alias_proposals)))
+
+    def close(self):
+        if 'name_resolver' in self._values:
+            self._values['name_resolver'].save()
+
+
+# Per-professor builds ------------------------------------------------------------------
+
+def build_coauthors(record, context):
+    '''
+    Count the coauthors of a professor over all their publications
+    '''
+    times = {}
+    for categories in record['publications'].values():
+        for papers in categories.values():
+            for paper in papers:
+                for coauthor in paper['coauthors']:
+                    if coauthor != record['name']:
+                        times[coauthor] = times.get(coauthor, 0) + 1
+    coauthors = sorted(times.items(), key=lambda item: -item[1])
+    return {'name': record['name'],
+            'coauthors': [{'coauthor_name': name, 'times': count} for name, count in coauthors]}
+
+
+def build_coauthors_scse(record, context):
+    '''
+    Keep the coauthors of a professor that are SCSE professors, under their SCSE name
+    '''
+    matching_names = context.name_resolver.resolve_many([coauthor['coauthor_name'] for coauthor in record['coauthors']])
+    coauthors = [{'coauthor_name': matching_name, 'times': coauthor['times']}
+                 for coauthor, matching_name in zip(record['coauthors'], matching_names) if matching_name]
+    return {'name': record['name'], 'coauthors': coauthors}
+
+
+# Aggregate builds ----------------------------------------------------------------------
+
+def build_keywords_count(context):
+    keywords = read_json('keywordsAndNames.json')
+    broad_topics = {keyword: area for area, specific_areas in read_json('research_areas.json').items()
+                    for keyword in specific_areas}
+    keywords = sorted(keywords, key=lambda dic: -len(dic['names']))
+    write_csv('keywords_count.csv', ['Keywords', 'Number of Professors', 'broad_topic'],
+              [(dic['keyword'], len(dic['names']), broad_topics.get(dic['keyword'], '')) for dic in keywords])
+
+
+def build_conference_counts(context):
+    '''
+    Count the conference papers of every professor by year and CORE rank, in one pass
+    '''
+    publications = flatten_publications(read_json('DBLP_publications.json'))
+    ranker = VenueRanker.from_csv([data_path(filename) for filename in core_editions])
+    write_json('all_conference_count.json', conference_count_documents(rank_matrix(publications, ranker)))
+
+
+def build_graph_analytics(context):
+    '''
+    Centrality and communities of the SCSE co-authorship graph
+    '''
+    graph = CoauthorGraph.from_coauthors(read_json('coauthors_scse.json'), file_digest(data_path('coauthors_scse.json')))
+    documents, modularity = analyze(graph)
+    logger.info("graph_analytics.json: %d communities, modularity %.3f",
+                len({document['community'] for document in documents}), modularity)
+    # The dashboard only uses them for this version of the graph
+    write_json('graph_analytics.json', {'version': graph.version, 'professors': documents},
+               cache_path('graph_analytics.json'))
+
+
+def build_similarity_index(context):
+    '''
+    Most similar professors of every professor, by keywords, biography and paper titles
+    '''
+    store = None
+    if os.path.exists(data_path('DBLP_publications.json')):
+        store = PublicationStore.from_records(read_json('DBLP_publications.json'), None)
+    digests = [digest or '' for digest in _digests(['professors_new.csv', 'keywordsAndNames.json',
+                                                    'DBLP_publications.json']).values()]
+    index = similarity.build_similarity_index(get_professors_table(), read_json('keywordsAndNames.json'), store,
+                                              similarity.index_version(digests))
+    index.save(cache_path(similarity.index_file))
+
+
+def build_research_area_counts(context):
+    with open(data_path('keywords_count.csv'), 'r', newline='') as f:
+        counts = {row['Keywords']: int(row['Number of Professors']) for row in csv.DictReader(f)}
+    write_csv('research_area_with_counts.csv', ['Broader Area', 'Number of Professors'],
+              [(area, sum(counts.get(keyword, 0) for keyword in specific_areas))
+               for area, specific_areas in read_json('research_areas.json').items()])
+
+
+class PerProfessorArtifact:
+    def __init__(self, output, source, build, inputs=(), optional_inputs=()):
+        self.output = output
+        self.source = source
+        self.build = build
+        self.inputs = tuple(inputs)
+        # Inputs that may not exist; creating or deleting one is a change as well
+        self.optional_inputs = tuple(optional_inputs)
+
+
+class AggregateArtifact:
+    def __init__(self, output, build, inputs, optional_inputs=(), cached=False):
+        self.output = output
+        self.build = build
+        self.inputs = tuple(inputs)
+        self.optional_inputs = tuple(optional_inputs)
+        # Written to data/cache instead of data/: only read by the dashboard, not committed
+        self.cached = cached
+
+    @property
+    def path(self):
+        return cache_path(self.output) if self.cached else data_path(self.output)
+
+
+# In build order: an artifact may only depend on the ones declared before it
+artifacts = [
+    PerProfessorArtifact('coauthors.json', 'DBLP_publications.json', build_coauthors),
+    PerProfessorArtifact('coauthors_scse.json', 'coauthors.json', build_coauthors_scse,
+                         inputs=['professors.csv'], optional_inputs=[alias_table]),
+    AggregateArtifact('all_conference_count.json', build_conference_counts,
+                      inputs=['DBLP_publications.json', *core_editions]),
+    AggregateArtifact('keywords_count.csv', build_keywords_count,
+                      inputs=['keywordsAndNames.json', 'research_areas.json']),
+    AggregateArtifact('research_area_with_counts.csv', build_research_area_counts,
+                      inputs=['keywords_count.csv', 'research_areas.json']),
+    AggregateArtifact('graph_analytics.json', build_graph_analytics, inputs=['coauthors_scse.json'], cached=True),
+    AggregateArtifact(similarity.index_file, build_similarity_index,
+                      inputs=['professors_new.csv', 'keywordsAndNames.json'],
+                      optional_inputs=['DBLP_publications.json'], cached=True),
+]
+
+
+def _digests(filenames):
+    return {filename: file_digest(data_path(filename)) if os.path.exists(data_path(filename)) else None
+            for filename in filenames}
+
+
+def _build_per_professor(artifact, state, context, force):
+    records = [record for record in read_json(artifact.source)
+               if artifact.source != 'DBLP_publications.json' or record.get('publications') is not None]
+    hashes = {record['name']: record_hash(record) for record in records}
+    inputs = _digests(artifact.inputs + artifact.optional_inputs)
+    rebuild_all = force or state.get('inputs') != inputs or not os.path.exists(data_path(artifact.output))
+
+    previous = {} if rebuild_all else state.get('professors', {})
+    changed = [record for record in records if previous.get(record['name']) != hashes[record['name']]]
+    removed = set(previous) - set(hashes)
+    if not changed and not removed:
+        logger.info("%s is up to date", artifact.output)
+        return state
+
+    existing = {}
+    if not rebuild_all:
+        existing = {document['name']: document for document in read_json(artifact.output)}
+    for record in changed:
+        existing[record['name']] = artifact.build(record, context)
+    write_json(artifact.output, [existing[name] for name in hashes if name in existing])
+    logger.info("%s: rebuilt %d professors, removed %d", artifact.output, len(changed), len(removed))
+    return {'inputs': inputs, 'professors': hashes}
+
+
+def _build_aggregate(artifact, state, context, force):
+    inputs = _digests(artifact.inputs + artifact.optional_inputs)
+    if not force and state.get('inputs') == inputs and os.path.exists(artifact.path):
+        logger.info("%s is up to date", artifact.output)
+        return state
+    artifact.build(context)
+    logger.info("%s: rebuilt", artifact.output)
+    return {'inputs': inputs}
+
+
+def build(force=False):
+    '''
+    Bring every derived dataset up to date with its inputs
+    '''
+    manifest_path = cache_path('build_manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    context = Context()
+    for artifact in artifacts:
+        sources = artifact.inputs + ((artifact.source,) if isinstance(artifact, PerProfessorArtifact) else ())
+        missing = [filename for filename in sources if not os.path.exists(data_path(filename))]
+        if missing:
+            logger.warning("Skipping %s, missing %s", artifact.output, ', '.join(missing))
+            continue
+        state = manifest.get(artifact.output, {})
+        if isinstance(artifact, PerProfessorArtifact):
+            state = _build_per_professor(artifact, state, context, force)
+        else:
+            state = _build_aggregate(artifact, state, context, force)
+        manifest[artifact.output] = state
+        # Saved after every artifact so an interrupted build keeps its progress
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + '.tmp', manifest_path)
+    context.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Incrementally rebuild the derived datasets in data/")
+    parser.add_argument('--force', action='store_true', help="rebuild everything")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    build(force=args.force)
@@ -0,0 +1,142 @@
+'''
+CORE rank classification of publication venues.
+
+The CORE editions are indexed once by acronym and title; all publications are
+then classified in one pass by joining their distinct venues against the index,
+and counted into a (professor, year) x rank matrix.
+'''
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_store import data_path, cached_load, get_conference_counts as get_precomputed_counts
+from publication_store import get_publication_store
+
+
+core_ranks = ('A*', 'A', 'B', 'C')
+conference_category = 'Conference and Workshop Papers'
+# CORE editions to rank with. A venue listed in several editions gets its rank
+# from the first one.
+core_editions = ('CORE.csv', 'CORE2.csv')
+
+# Workshops and other satellite events of a conference are not ranked by CORE and
+# do not take the rank of their conference
+satellite_venues = r'\b(?:WORKSHOPS?|COMPANION|ADJUNCT|POSTERS?|DEMOS?|DEMONSTRATIONS?)\b'
+
+_lock = threading.Lock()
+# (editions, VenueRanker) and (publications, ranker, rank matrix); the source
+# objects identify the file versions the derived values were built from
+_ranker = None
+_matrix = None
+
+
+def normalize_venues(venues):
+    return venues.fillna('').astype(str).str.strip().str.upper().str.replace(r'\s+', ' ', regex=True)
+
+
+class VenueRanker:
+    '''
+    Index of the ranked venues of one or more CORE editions by acronym and title
+    '''
+
+    def __init__(self, editions):
+        table = pd.concat(editions, ignore_index=True)
+        table = table[table['Rank'].isin(core_ranks)]
+        # Acronyms take precedence over titles
+        keys = pd.concat([normalize_venues(table['Acronym']), normalize_venues(table['Title'])])
+        ranks = pd.Series(np.concatenate([table['Rank'].to_numpy()] * 2), index=keys.to_numpy())
+        ranks = ranks[ranks.index != '']
+        self.lookup = ranks[~ranks.index.duplicated()]
+
+    @classmethod
+    def from_csv(cls, paths):
+        return cls([read_edition(path) for path in paths])
+
+    def classify(self, venues):
+        '''
+        Get the CORE rank of every venue, NaN for unranked venues.
+        A venue is looked up as a whole, then by its first word ("ICML (2)" -> "ICML"),
+        unless it is a satellite event ("ICDE Workshops" is unranked).
+        '''
+        codes, distinct = pd.factorize(pd.Series(venues).fillna(''))
+        normalized = normalize_venues(pd.Series(distinct))
+        ranks = normalized.map(self.lookup)
+        missing = ranks.isna() & ~normalized.str.contains(satellite_venues)
+        ranks[missing] = normalized[missing].str.split(n=1).str[0].map(self.lookup)
+        ranks = np.append(ranks.to_numpy(dtype=object), np.nan)
+        return pd.Series(ranks[codes], index=venues.index if isinstance(venues, pd.Series) else None)
+
+
+def read_edition(path):
+    return pd.read_csv(path, encoding='utf-8', encoding_errors='replace',
+                       usecols=['Title', 'Acronym', 'Rank'], dtype=str)
+
+
+def rank_matrix(publications, ranker):
+    '''
+    Count the ranked conference papers of every professor by year.
+    Indexed by (name, year) for every year a professor published in, with one column per rank.
+    '''
+    keys = publications[['name', 'year']].astype({'name': str})
+    index = pd.MultiIndex.from_frame(keys.drop_duplicates())
+    conferences = (publications['type'] == conference_category).to_numpy()
+
+    rows = index.get_indexer(pd.MultiIndex.from_frame(keys[conferences]))
+    ranks = pd.Categorical(ranker.classify(publications['venue'][conferences]), categories=core_ranks).codes
+    ranked = ranks >= 0
+    counts = np.zeros((len(index), len(core_ranks)), dtype=np.int64)
+    np.add.at(counts, (rows[ranked], ranks[ranked]), 1)
+    return pd.DataFrame(counts, index=index, columns=list(core_ranks))
+
+
+def conference_count_documents(matrix):
+    '''
+    Convert a rank matrix to the documents of all_conference_count.json
+    '''
+    documents = {}
+    for (name, year), counts in zip(matrix.index, matrix.to_dict('records')):
+        documents.setdefault(name, {})[str(year)] = counts
+    return [{'name': name, 'counts': counts} for name, counts in documents.items()]
+
+
+def get_ranker():
+    global _ranker
+    editions = tuple(cached_load(data_path(filename), read_edition) for filename in core_editions)
+    with _lock:
+        if _ranker is None or any(a is not b for a, b in zip(_ranker[0], editions)):
+            _ranker = (editions, VenueRanker(editions))
+        return _ranker[1]
+
+
+def get_rank_matrix():
+    '''
+    Get the rank matrix of all professors, recomputed when the publications or CORE editions change
+    '''
+    global _matrix
+    publications = get_publication_store().frame
+    ranker = get_ranker()
+    with _lock:
+        if _matrix is None or _matrix[0] is not publications or _matrix[1] is not ranker:
+            _matrix = (publications, ranker, rank_matrix(publications, ranker))
+        return _matrix[2]
+
+
+def get_conference_counts(name):
+    '''
+    Get the CORE rank counts by year of a professor as a DataFrame indexed by year,
+    or None if there is no publication data for the professor
+    '''
+    if get_publication_store() is not None:
+        try:
+            return get_rank_matrix().xs(name, level='name').sort_index()
+        except KeyError:
+            return None
+
+    # Without the publication export, use the counts computed by build.py
+    counts = get_precomputed_counts(name)
+    if counts is None:
+        return None
+    df = pd.DataFrame(counts).T
+    df.index = df.index.map(int)
+    return df.sort_index()
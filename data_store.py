@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+import threading
+
+import pandas as pd
+
+from instrumentation import cache_access
+
+
+DATA_DIR = os.environ.get('SCSEDASH_DATA_DIR', './data')
+
+# path -> loader -> (signature, digest, value). Module state is shared by every
+# Streamlit session served from this process, so each file is parsed only once.
+_cache = {}
+_lock = threading.Lock()
+
+
+def data_path(filename):
+    return os.path.join(DATA_DIR, filename)
+
+
+def cache_path(filename):
+    '''
+    Path of a derived file (indexes, snapshots) under data/cache
+    '''
+    path = os.path.join(DATA_DIR, 'cache', filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def cached_load(path, loader):
+    '''
+    Load a data file once per process and reuse the parsed value until the file changes.
+    A changed mtime only triggers a reparse if the content hash changed as well.
+    The returned objects are shared between sessions and must be treated as read-only.
+    '''
+    key = (path, loader)
+    signature = _signature(path)
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == signature:
+        cache_access('data_store', True)
+        return entry[2]
+
+    cache_access('data_store', False)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[2]
+        digest = file_digest(path)
+        if entry is not None and entry[1] == digest:
+            # Touched but not modified, keep the parsed value
+            value = entry[2]
+        else:
+            value = loader(path)
+        _cache[key] = (signature, digest, value)
+    return value
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+def _read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _read_csv(path):
+    return pd.read_csv(path)
+
+
+def _read_professors_csv(path):
+    return pd.read_csv(path, encoding='unicode_escape')
+
+
+def _index_by_name(path):
+    return {entry['name']: entry for entry in _read_json(path)}
+
+
+def _index_professors_by_name(path):
+    df = _read_professors_csv(path)
+    return {row['Full Name']: row for row in df.to_dict('records')}
+
+
+def get_research_areas():
+    return cached_load(data_path('research_areas.json'), _read_json)
+
+
+def get_scse_coauthors():
+    '''
+    Get the coauthor lists restricted to SCSE professors
+    '''
+    return cached_load(data_path('coauthors_scse.json'), _read_json)
+
+
+def get_all_conference_counts():
+    '''
+    Get the CORE rank counts by year of every professor, by name
+    '''
+    return cached_load(data_path('all_conference_count.json'), _index_by_name)
+
+
+def get_conference_counts(name):
+    '''
+    Get the CORE rank counts by year of a professor
+    '''
+    entry = get_all_conference_counts().get(name)
+    return entry['counts'] if entry else None
+
+
+def get_keywords_count():
+    return cached_load(data_path('keywords_count.csv'), _read_csv)
+
+
+def get_research_area_counts():
+    return cached_load(data_path('research_area_with_counts.csv'), _read_csv)
+
+
+def get_professors_table():
+    return cached_load(data_path('professors_new.csv'), _read_professors_csv)
+
+
+def get_professor_record(name):
+    '''
+    Get the row of professors_new.csv for a professor as a dict
+    '''
+    return cached_load(data_path('professors_new.csv'), _index_professors_by_name).get(name)
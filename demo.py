@@ -1,10 +1,17 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from utils import get_list_of_keywords, find_name_using_keyword, get_keywords_given_name,find_num_contributions_using_name
+from utils import get_list_of_keywords, find_name_using_keyword, count_professors_by_keyword, get_keywords_given_name,find_num_contributions_using_name
 from utils import plot_year_of_involvement, plot_scse_bar, display_overall_graph, display_individual_graph
 from utils import display_publications_by_year, display_publications_by_type, display_top_n_keywords, faculty_intro
 from utils import get_research_areas, display_top_coauthors,display_word_cloud, display_treemap, conference_count_plot
+from utils import display_search, display_similar_professors, display_comparison, display_collaboration_metrics, display_trends
+from utils import prefetch_professor_page
+from data_store import get_professors_table
+from repository import get_repository
+from layout import render_tabs, kept, keep, kept_index
+import instrumentation
+import warmup
 
 # Config
 st.set_page_config(
@@ -12,9 +19,12 @@ st.set_page_config(
     page_icon="🚀",
     layout="wide",
 )
+instrumentation.start_run()
+instrumentation.start_metrics_server()
+warmup.start()
 
 # Load data from CSV
-data = pd.read_csv('./data/professors_new.csv',encoding='unicode_escape')
+data = get_professors_table()
 
 smiley = "😄"
 star = "⭐"  
@@ -34,20 +44,32 @@ st.title("SCSE Dashboard")
 st.markdown(intro_with_icons, unsafe_allow_html=True)
 
 # Create a topic selection dropdown
+match_modes = {'Any selected topic': 'any', 'All selected topics': 'all'}
 with st.sidebar:
+    areas = st.multiselect(
+                'Broad areas',
+                list(get_research_areas()),
+                [])
     options = st.multiselect(
                 'Selected topics',
                 get_list_of_keywords(),
                 [])
+    match = st.radio('Match', list(match_modes), horizontal=True)
+    excluded = st.multiselect(
+                'Excluded topics',
+                get_list_of_keywords(),
+                [])
+    with st.expander('Topics of the matching professors'):
+        keyword_counts = count_professors_by_keyword(options, areas, match_modes[match], excluded)
+        st.dataframe(pd.Series(keyword_counts, name='Professors').sort_values(ascending=False),
+                     use_container_width=True)
     st.subheader('List of professors')
-    list_of_professors = find_name_using_keyword(options)
+    list_of_professors = find_name_using_keyword(options, areas, match_modes[match], excluded)
     for item in list_of_professors:
         st.write(item)
 
 
-tab1, tab2, tab3 = st.tabs(["💻SCSE", "✒️Professors", "⭐View More"])
-
-with tab1:
+def scse_tab():
     display_treemap()
     col1, col2 = st.columns(2,gap='large')
     with col1:
@@ -74,19 +96,23 @@ with tab1:
         plot_scse_bar()   
         display_top_n_keywords()
 
+    display_trends(options, areas, match_modes[match], excluded)
+
 
 #==================================================================================================================  
 # Professor page
-with tab2:
+def professor_tab():
     col1, col2 = st.columns(2,gap='large')
     with col1:
-        if list_of_professors:
-            selected_professor = st.selectbox("Which professor's information would you like to view?", list_of_professors)
-        else:
-            selected_professor = st.selectbox("Which professor's information would you like to view?", data['Full Name'])
+        professors = list_of_professors if list_of_professors else data['Full Name'].tolist()
+        selected_professor = keep('selected_professor', st.selectbox(
+            "Which professor's information would you like to view?", professors,
+            index=kept_index('selected_professor', professors), key='selected_professor'))
 
         # Filter data based on selected professor or keyword
         if selected_professor:
+            # The loads of the page run in parallel, the adjacent professors are warmed up next
+            prefetch_professor_page(selected_professor, list_of_professors or data['Full Name'].tolist())
             professor_data = data[data['Full Name'] == selected_professor]
             
             email = professor_data['Email'].iloc[0]
@@ -131,6 +157,8 @@ with tab2:
                     st.markdown(f"- **{item}**")
             with st.expander("Biography"):
                 st.write(biography)
+            with st.expander("Similar Professors"):
+                display_similar_professors(selected_professor)
             
             # Publications
             if selected_professor in ['Sourav Saha Bhowmick','Tay Kian Boon','Ke Yiping, Kelly']:
@@ -138,11 +166,9 @@ with tab2:
             else:
                 st.subheader("Publications",divider='rainbow')
                 
-                subtab1, subtab2 = st.tabs(["By year","By type"])
-                with subtab1:
-                    display_publications_by_year(selected_professor)
-                with subtab2:
-                    display_publications_by_type(selected_professor)
+                render_tabs({"By year": lambda: display_publications_by_year(selected_professor),
+                             "By type": lambda: display_publications_by_type(selected_professor)},
+                            key='publication_view')
                     
     with col2:
         # Display bar chart   
@@ -157,101 +183,40 @@ with tab2:
             with subcol3:
                 st.metric("Top Conferences",top_conference_count)
             count_publications = find_num_contributions_using_name(selected_professor)    
-            plot_year_of_involvement(count_publications[0]) 
+            if count_publications:
+                plot_year_of_involvement(count_publications[0])
             conference_count_plot(selected_professor)
             display_word_cloud(selected_professor,key='individual')
             display_top_coauthors(selected_professor)
+            display_collaboration_metrics(selected_professor)
             display_individual_graph(selected_professor)
 
-#======================================================================================
-    with tab3:
-        subcol7, subcol8 = st.columns(2,gap="large")
-        with subcol7:
-            if list_of_professors:
-                selected_professor_a = st.selectbox("Please select a professor:", list_of_professors, key='select_a')
-            else:
-                selected_professor_a = st.selectbox("Please select a professor:", data['Full Name'], key='select_a')
-            if selected_professor_a:
-                professor_data_a = data[data['Full Name'] == selected_professor_a]         
-                biography_a = professor_data_a['biography'].iloc[0]
-
-                citation = professor_data_a['Citations (All)'].iloc[0] 
-                no_citation = int(citation) if not pd.isna(citation) else None
-
-                publications_count = professor_data_a['publications_count'].iloc[0]
-                publications_count = int(publications_count) if not pd.isna(publications_count) else None
-                
-                top_conference_count = professor_data_a['top_conference_count'].iloc[0]
-                top_conference_count = int(top_conference_count) if not pd.isna(top_conference_count) else None
-            else:
-                professor_data_a = data
-            if professor_data_a.empty:
-                st.warning("No professor found with the given selection.")
-
-            with st.expander("Research Interest"):
-                research_interest_a = get_keywords_given_name(selected_professor_a)
-                for item in research_interest_a:
-                    st.markdown(f"- **{item}**")
-            with st.expander("Biography"):
-                st.write(biography_a)
-              # Display bar chart   
-            if selected_professor_a in ['Sourav Saha Bhowmick','Tay Kian Boon','Ke Yiping, Kelly']:
-                print("Sorry, currently no publication data is found.")
-            else:
-                subcol1,subcol2,subcol3 = st.columns(3)
-                with subcol1:
-                    st.metric("Citations",no_citation)
-                with subcol2:
-                    st.metric("Publications",publications_count)
-                with subcol3:
-                    st.metric("Top Conferences",top_conference_count)
-                count_publications = find_num_contributions_using_name(selected_professor_a)    
-                plot_year_of_involvement(count_publications[0]) 
-                conference_count_plot(selected_professor_a)
-                display_word_cloud(selected_professor_a,key='wordcloud_a')
-     
-        with subcol8:
-            if list_of_professors:
-                selected_professor_b = st.selectbox("Please select a professor:", list_of_professors, key='select_b')
-            else:
-                selected_professor_b = st.selectbox("Please select a professor:", data['Full Name'], key='select_b')
-            if selected_professor_b:
-                professor_data_b = data[data['Full Name'] == selected_professor_b]         
-                biography_b = professor_data_b['biography'].iloc[0]
-
-                citation = professor_data_b['Citations (All)'].iloc[0] 
-                no_citation = int(citation) if not pd.isna(citation) else None
-
-                publications_count = professor_data_b['publications_count'].iloc[0]
-                publications_count = int(publications_count) if not pd.isna(publications_count) else None
-                
-                top_conference_count = professor_data_b['top_conference_count'].iloc[0]
-                top_conference_count = int(top_conference_count) if not pd.isna(top_conference_count) else None
-            else:
-                professor_data_b = data
-            if professor_data_b.empty:
-                st.warning("No professor found with the given selection.")
 
-            with st.expander("Research Interest"):
-                research_interest_b = get_keywords_given_name(selected_professor_b)
-                for item in research_interest_b:
-                    st.markdown(f"- **{item}**")
-            with st.expander("Biography"):
-                st.write(biography_b)
-              # Display bar chart   
-            if selected_professor_b in ['Sourav Saha Bhowmick','Tay Kian Boon','Ke Yiping, Kelly']:
-                print("Sorry, currently no publication data is found.")
-            else:
-                subcol1,subcol2,subcol3 = st.columns(3)
-                with subcol1:
-                    st.metric("Citations",no_citation)
-                with subcol2:
-                    st.metric("Publications",publications_count)
-                with subcol3:
-                    st.metric("Top Conferences",top_conference_count)
-                count_publications = find_num_contributions_using_name(selected_professor_b)    
-                plot_year_of_involvement(count_publications[0]) 
-                conference_count_plot(selected_professor_b)
-                display_word_cloud(selected_professor_b,key='wordcloud_b')
-            
-            
\ No newline at end of file
+#======================================================================================
+# Comparison page
+def compare_tab():
+    options_to_compare = list(list_of_professors if list_of_professors else data['Full Name'])
+    default = [name for name in kept('compare_selection', options_to_compare[:2]) if name in options_to_compare]
+    selected_professors = keep('compare_selection', st.multiselect("Please select the professors to compare:",
+                                                                   options_to_compare, default,
+                                                                   key='compare_selection'))
+    if not selected_professors:
+        st.warning("No professor found with the given selection.")
+        return
+
+    display_comparison(selected_professors)
+    profiles = get_repository().get_profiles(selected_professors)
+    for selected_professor in selected_professors:
+        with st.expander(selected_professor):
+            st.markdown("**Research Interest**")
+            for item in profiles[selected_professor]['keywords']:
+                st.markdown(f"- **{item}**")
+            st.markdown("**Biography**")
+            st.write(data.loc[data['Full Name'] == selected_professor, 'biography'].iloc[0])
+
+
+render_tabs({"💻SCSE": scse_tab, "✒️Professors": professor_tab, "⭐View More": compare_tab, "🔎Search": display_search},
+            key='main_tab')
+
+if instrumentation.debug:
+    instrumentation.render_debug_panel()
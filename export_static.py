@@ -0,0 +1,173 @@
+'''
+Static snapshot of the dashboard.
+
+Pre-renders the SCSE overview and every professor page into standalone HTML
+pages and JSON figure bundles that can be served from disk or a CDN; the
+Streamlit app is then only needed for the interactive views. Professor pages
+are rendered in parallel by a process pool.
+
+Figures are written compacted, with their numeric arrays as base64 typed arrays,
+which is why the pages load a plotly.js of version 2.28 or later.
+
+Run python export_static.py [--output site] [--workers N] from the repository root.
+'''
+import os
+import re
+import json
+import html
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import plotly.io as pio
+
+import figure_payload
+
+
+logger = logging.getLogger('export_static')
+
+plotly_js = 'https://cdn.plot.ly/plotly-2.35.2.min.js'
+top_keywords = 10
+top_coauthors = 5
+
+_page = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+<style>body {{font-family: sans-serif; max-width: 1200px; margin: auto; padding: 1em;}}</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+'''
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def write_page(path, title, sections, figures):
+    '''
+    Write an HTML page of html sections followed by the figures, and the JSON bundle of the figures
+    '''
+    figures = {key: json.loads(figure_payload.to_json(figure_payload.compact(figure), typed_arrays=True))
+               for key, figure in figures.items()}
+    body = list(sections)
+    for figure in figures.values():
+        body.append(pio.to_html(figure, full_html=False, include_plotlyjs=False, validate=False))
+    with open(path + '.html', 'w', encoding='utf-8') as f:
+        f.write(_page.format(title=html.escape(title), plotly_js=plotly_js, body='\n'.join(body)))
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump(figures, f)
+
+
+def export_overview(output, layout, names):
+    import figures
+    from graph_figures import overall_graph_figure
+
+    bundle = {
+        'treemap': figures.treemap_figure(),
+        'research_areas': figures.research_area_figure(),
+        'top_keywords': figures.top_keywords_figure(top_keywords),
+        'network': overall_graph_figure(layout),
+        'trends': figures.school_trend_figure(),
+        'area_trends': figures.area_trend_figure(),
+    }
+    links = ''.join(f'<li><a href="professors/{slug(name)}.html">{html.escape(name)}</a></li>' for name in names)
+    write_page(os.path.join(output, 'index'), 'SCSE Dashboard',
+               ['<h1>SCSE Dashboard</h1>', f'<h2>Professors</h2><ul>{links}</ul>'], bundle)
+
+
+def export_professor(name, output, layout):
+    '''
+    Render the page of one professor, run in a worker process
+    '''
+    import figures
+    from data_store import get_professor_record
+    from repository import get_repository
+    from graph_figures import individual_graph_figure
+    from wordcloud_cache import get_term_table, word_cloud_png
+
+    profile = get_repository().get_profile(name)
+    record = get_professor_record(name) or {}
+    path = os.path.join(output, 'professors', slug(name))
+
+    bundle = {}
+    if profile['num_contributions']:
+        bundle['year_of_involvement'] = figures.year_of_involvement_figure(
+            {'name': name, 'num_contributions': profile['num_contributions']})
+    conference_counts = figures.conference_count_figure(name)
+    if conference_counts is not None:
+        bundle['conference_counts'] = conference_counts
+    bundle['top_coauthors'] = figures.top_coauthors_figure(name, top_coauthors)
+    bundle['network'] = individual_graph_figure(name, layout)
+
+    sections = [f'<p><a href="../index.html">SCSE Dashboard</a></p>', f'<h1>{html.escape(name)}</h1>']
+    details = [(label, record.get(column)) for label, column in
+               [('Email', 'Email'), ('DR-NTU', 'DR-NTU URL'), ('DBLP', 'DBLP URL'), ('Website', 'Website URL'),
+                ('Citations', 'Citations (All)'), ('Publications', 'publications_count'),
+                ('Top Conferences', 'top_conference_count')]]
+    sections.append('<ul>' + ''.join(f'<li><b>{label}:</b> {html.escape(str(value))}</li>'
+                                     for label, value in details if not pd.isna(value)) + '</ul>')
+    if profile['keywords']:
+        sections.append('<h2>Research Interest</h2><ul>' +
+                        ''.join(f'<li>{html.escape(keyword)}</li>' for keyword in profile['keywords']) + '</ul>')
+    if isinstance(record.get('biography'), str):
+        sections.append(f'<h2>Biography</h2><p>{html.escape(record["biography"])}</p>')
+
+    if profile['publications']:
+        table = get_term_table(name)
+        png = word_cloud_png(name, table.first_year, table.last_year)
+        if png:
+            with open(path + '_wordcloud.png', 'wb') as f:
+                f.write(png)
+            sections.append(f'<h2>Publication Keywords</h2><img src="{slug(name)}_wordcloud.png" width="800">')
+
+    write_page(path, name, sections, bundle)
+    return name
+
+
+def export(output, workers=None, layout='circular'):
+    '''
+    Export the overview and all professor pages, and get the names of the professors that failed
+    '''
+    from data_store import get_professors_table
+
+    names = get_professors_table()['Full Name'].tolist()
+    os.makedirs(os.path.join(output, 'professors'), exist_ok=True)
+    export_overview(output, layout, names)
+    logger.info("Exported the overview")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(export_professor, name, output, layout): name for name in names}
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                future.result()
+            except Exception as error:
+                logger.warning("Failed to export %s: %s", name, error)
+                failed.append(name)
+            if done % 10 == 0 or done == len(names):
+                logger.info("Exported %d/%d professors", done, len(names))
+
+    with open(os.path.join(output, 'manifest.json'), 'w') as f:
+        json.dump({'layout': layout, 'pages': ['index.html'] +
+                   [f'professors/{slug(name)}.html' for name in names if name not in failed],
+                   'failed': failed}, f, indent=4)
+    return failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export the dashboard as static HTML pages and JSON figure bundles")
+    parser.add_argument('--output', default='./site')
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument('--layout', choices=['circular', 'spring'], default='circular', help="network graph layout")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    failed = export(args.output, args.workers, args.layout)
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,164 @@
+'''
+Compact figure payloads.
+
+Every chart of the dashboard is serialized to JSON and sent to the browser on
+each rerun, so the size of its arrays is the size of the page. In the default
+'webgl' figure mode (SCSEDASH_FIGURES=webgl), numeric arrays are shortened
+(integral floats as integers, other floats rounded to a few significant digits)
+and scatter traces with many points are drawn with WebGL (scattergl) instead of
+SVG; SCSEDASH_FIGURES=svg sends the figures as built. Numeric arrays can also be
+encoded as base64 typed arrays, which plotly.js reads from version 2.28 on: the
+static export uses them, the Plotly bundled with Streamlit 1.28 (2.26) does not.
+'''
+import os
+import json
+import base64
+
+import numpy as np
+
+import instrumentation
+
+
+mode = os.environ.get('SCSEDASH_FIGURES', 'webgl')
+# Scatter traces with more points than this are drawn with WebGL
+webgl_threshold = 1000
+significant_digits = 6
+# Numeric arrays shorter than this stay plain JSON lists
+typed_array_threshold = 32
+numeric_attributes = ('x', 'y', 'z', 'marker.size', 'marker.color', 'values')
+# Scatter properties that scattergl does not have
+_svg_only = ('cliponaxis', 'hoveron')
+
+
+def compact_array(values, digits=significant_digits):
+    '''
+    Get a numeric array with a shorter JSON form, or None if values is not numeric
+    '''
+    try:
+        array = np.asarray(values)
+        if array.dtype.kind == 'O':
+            # Serialized NaN gaps are None
+            array = array.astype(np.float64)
+    except (ValueError, TypeError):
+        return None
+    if array.dtype.kind not in 'fiu' or array.ndim != 1 or array.size == 0:
+        return None
+    if array.dtype.kind in 'iu':
+        return array
+    finite = array[np.isfinite(array)]
+    if finite.size and np.all(finite == np.round(finite)) and np.abs(finite).max() < 2 ** 31:
+        # Integral values; NaN stays a float
+        return array.astype(np.int64) if finite.size == array.size else array.round()
+    largest = np.abs(finite).max() if finite.size else 0
+    decimals = digits - int(np.ceil(np.log10(largest))) if largest > 0 else digits
+    return array.round(max(decimals, 0))
+
+
+def compact(fig):
+    '''
+    Shorten the numeric arrays of a figure in place and draw large scatter traces
+    with WebGL. Returns the figure.
+    '''
+    import plotly.graph_objs as go
+
+    data = []
+    converted = False
+    for trace in fig.data:
+        for attribute in numeric_attributes:
+            try:
+                values = trace[attribute]
+            except (KeyError, ValueError):
+                continue
+            if values is None or isinstance(values, (str, int, float)):
+                continue
+            array = compact_array(values)
+            if array is not None:
+                trace[attribute] = array
+        if (trace.type == 'scatter' and trace.stackgroup is None and trace.x is not None
+                and len(trace.x) > webgl_threshold):
+            properties = trace.to_plotly_json()
+            properties.pop('type')
+            for attribute in _svg_only:
+                properties.pop(attribute, None)
+            trace = go.Scattergl(properties)
+            converted = True
+        data.append(trace)
+    if converted:
+        fig.data = []
+        fig.add_traces(data)
+    return fig
+
+
+_typed_dtypes = {'f': 'f4', 'i': 'i4', 'u': 'u4'}
+
+
+def encode_typed_arrays(figure):
+    '''
+    Replace the numeric arrays of the traces of a figure dict by base64 typed arrays
+    ({"dtype", "bdata"}, plotly.js 2.28 or later) where that is shorter. Floats are
+    sent as float32.
+    '''
+    def encode(value):
+        array = compact_array(value) if not isinstance(value, (str, dict)) else None
+        if array is None or array.size < typed_array_threshold:
+            return value
+        dtype = _typed_dtypes[array.dtype.kind]
+        if dtype == 'i4' and (array.min() < -2 ** 31 or array.max() >= 2 ** 31):
+            dtype = 'f4'
+        data = base64.b64encode(array.astype(dtype).tobytes()).decode('ascii')
+        # Small integers are shorter as JSON
+        if len(data) >= len(json.dumps(array.tolist())):
+            return value
+        return {'dtype': dtype, 'bdata': data}
+
+    for trace in figure.get('data', []):
+        for attribute in numeric_attributes:
+            parent, _, key = attribute.rpartition('.')
+            container = trace.get(parent, {}) if parent else trace
+            if isinstance(container, dict) and key in container:
+                container[key] = encode(container[key])
+    return figure
+
+
+def to_json(figure, typed_arrays=False):
+    '''
+    Serialize a figure as sent to the browser
+    '''
+    from plotly.utils import PlotlyJSONEncoder
+
+    figure = figure.to_plotly_json() if hasattr(figure, 'to_plotly_json') else figure
+    if typed_arrays:
+        figure = encode_typed_arrays(json.loads(json.dumps(figure, cls=PlotlyJSONEncoder)))
+    return json.dumps(figure, cls=PlotlyJSONEncoder)
+
+
+def size_report(figures):
+    '''
+    Get the payload of every figure as built, compacted and with typed arrays, as
+    rows of {"figure", "traces", "points", "bytes", "compact_bytes", "typed_bytes"}
+    '''
+    import plotly.graph_objs as go
+
+    rows = []
+    for name, fig in figures.items():
+        original = to_json(fig)
+        compacted = compact(go.Figure(fig))
+        rows.append({
+            'figure': name,
+            'traces': len(fig.data),
+            'points': sum(len(trace.x) for trace in fig.data if getattr(trace, 'x', None) is not None),
+            'bytes': len(original),
+            'compact_bytes': len(to_json(compacted)),
+            'typed_bytes': len(to_json(compacted, typed_arrays=True)),
+        })
+    return rows
+
+
+def plotly_chart(fig, **kwargs):
+    '''
+    Render a figure in the current figure mode
+    '''
+    if mode == 'webgl':
+        with instrumentation.span('figure_payload.compact'):
+            fig = compact(fig)
+    return instrumentation.plotly_chart(fig, **kwargs)
@@ -0,0 +1,167 @@
+'''
+Builders of the dashboard figures.
+
+They only build plotly figures from the data layer and never call Streamlit, so
+the same figures are rendered by the app (utils.py) and by the static export
+(export_static.py).
+'''
+import plotly.express as px
+import plotly.graph_objs as go
+import pandas as pd
+
+import data_store
+import core_ranking
+from graph_index import get_coauthor_graph
+from trend_cube import get_trend_cube, measures
+
+
+# Define a custom color scale for contribution types
+contribution_colors = {
+    'Journal Articles': '#aec7e8',  # Light blue
+    'Conference and Workshop Papers': '#ff7f0e',  # Orange
+    'Informal and Other Publications': '#1f77b4',  # Dark blue
+    'Editorship': '#ffbb78',  # Light orange
+    'Books and Theses': '#98df8a',  # Light green
+    'Parts in Books or Collections': '#d62728',  # Red
+    'Reference Works': '#c5b0d5'  # Lavender
+}
+
+
+def year_of_involvement_figure(data):
+    contribution_types = set()
+    for year_data in data['num_contributions'].values():
+        contribution_types.update(year_data.keys())
+
+    data_list = []
+    for year, year_data in data['num_contributions'].items():
+        row = {'Year': int(year)}
+        row.update(year_data)
+        data_list.append(row)
+
+    df = pd.DataFrame(data_list)
+
+    # Create the stacked bar chart
+    fig = px.bar(df, x='Year', y=list(contribution_types), title=f'{data["name"]}',
+                 labels={'value': 'Number of Contributions', 'variable': 'Contribution Type'},
+                 barmode='relative',color='variable', color_discrete_map=contribution_colors)
+
+    fig.update_layout(xaxis_title='Year', yaxis_title='Number of Contributions',
+                     plot_bgcolor='white',paper_bgcolor='#ebd2b9')
+    return fig
+
+
+def top_coauthors_figure(name, count):
+    coauthor_data = get_coauthor_graph().top_neighbours(name, count)
+    df_coauthors = pd.DataFrame(coauthor_data, columns=["name (DBLP)", "number of collaborations"])
+
+    fig = px.bar(df_coauthors,
+                 x="name (DBLP)",
+                 y="number of collaborations",
+                 title=f"Top {count} Coauthors for {name}",
+                 labels={"name (DBLP)": "Coauthor Name", "number of collaborations": "Number of Collaborations"},
+                 color="number of collaborations",
+                 color_continuous_scale=px.colors.sequential.Plasma)
+
+    fig.update_layout(xaxis={'categoryorder':'total descending'})
+    return fig
+
+
+def research_area_figure():
+    df = data_store.get_research_area_counts()
+    df = df.sort_values(by='Number of Professors', ascending=False)
+
+    fig = px.pie(df,
+                 values='Number of Professors',
+                 names='Broader Area',
+                 title="Research Area Distribution by Number of Professors")
+
+    fig.update_traces(textinfo='percent+label')
+    fig.update_layout(
+        title="Research Area Distribution by Number of Professors",
+    )
+    return fig
+
+
+def keyword_counts():
+    df = data_store.get_keywords_count()
+    return df[1:]  # Assuming the first row is not relevant
+
+
+def top_keywords_figure(count):
+    df = keyword_counts()
+    df_sorted = df.sort_values(by='Number of Professors', ascending=False)
+    df_top_n = df_sorted.head(count).copy()
+
+    # Find the max value for highlighting
+    max_professors = df_top_n['Number of Professors'].max()
+    df_top_n['Color'] = 'LightSkyBlue'
+    df_top_n.loc[df_top_n['Number of Professors'] == max_professors, 'Color'] = 'Crimson'
+
+    fig = px.bar(df_top_n, x='Keywords', y='Number of Professors',
+                 color='Color', color_discrete_map="identity",
+                 title="Top Keywords by Number of Professors")
+
+    fig.update_layout(showlegend=False)
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+def treemap_figure():
+    df = keyword_counts()
+    return px.treemap(df, path=[px.Constant("SCSE"),'broad_topic', 'Keywords'], values='Number of Professors',
+                      color_continuous_scale='RdBu',color='Number of Professors',
+                      title='Research Areas and Keywords by Number of Professors')
+
+
+def conference_count_figure(name):
+    '''
+    Get the figure of the CORE rank counts of a professor by year, or None if there is no data
+    '''
+    df = core_ranking.get_conference_counts(name)
+    if df is None:
+        return None
+
+    fig = go.Figure()
+    for rank in reversed(core_ranking.core_ranks):
+        fig.add_trace(go.Scatter(
+            x=df.index, y=df[rank], mode='lines', name=rank, stackgroup='one'
+        ))
+
+    # Customize the layout
+    fig.update_layout(
+        title='Number of Conferences by Year',
+        xaxis_title='Year',
+        yaxis_title='Conference Count',
+        xaxis=dict(tickmode='linear'),
+        yaxis=dict(type='linear')
+    )
+    return fig
+
+
+def school_trend_figure(measure='type', years=None, title="SCSE Publications by Year", **selection):
+    '''
+    Get the stacked counts by year of the selected professors (all by default) by
+    contribution type or CORE rank
+    '''
+    df = get_trend_cube().slice(measure, years, **selection)
+    # One trace per category, built directly from the cube slice (plotly express is
+    # several times slower than the query)
+    fig = go.Figure([go.Bar(x=df.index, y=df[category], name=category,
+                            marker_color=contribution_colors.get(category) if measure == 'type' else None)
+                     for category in df.columns])
+    fig.update_layout(barmode='stack', title=title, legend_title_text=measures[measure],
+                      xaxis=dict(title='Year', tickmode='linear'),
+                      yaxis=dict(title='Publications' if measure == 'type' else 'Conferences'))
+    return fig
+
+
+def area_trend_figure(measure='type', categories=None, years=None):
+    '''
+    Get the counts by year of the professors of every broad research area
+    '''
+    df = get_trend_cube().area_trends(measure, categories, years)
+    fig = go.Figure([go.Scatter(x=df.index, y=df[area], name=area, mode='lines+markers') for area in df.columns])
+    fig.update_layout(title="Publications by Research Area" if measure == 'type' else "Ranked Conferences by Research Area",
+                      legend_title_text='Broad area', xaxis=dict(title='Year', tickmode='linear'),
+                      yaxis=dict(title='Publications' if measure == 'type' else 'Conferences'))
+    return fig
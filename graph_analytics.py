@@ -0,0 +1,292 @@
+'''
+Analytics of the co-authorship graph between SCSE professors.
+
+Weighted degree, PageRank, betweenness centrality and research communities are
+computed with sparse matrix operations on the CSR graph index: PageRank by power
+iteration, betweenness by breadth-first searches from a batch of sources at once
+(the frontiers are sparse matrix products), and communities by Louvain modularity
+optimization, where every level aggregates the graph as P.T @ A @ P.
+build.py computes them once per version of coauthors_scse.json and stores them in
+data/cache/graph_analytics.json, so the dashboard only looks them up.
+'''
+import os
+import json
+import threading
+
+import numpy as np
+
+import data_store
+from graph_index import get_scse_graph
+
+
+damping = 0.85
+# Betweenness is estimated from this many sampled sources on larger graphs
+betweenness_samples = 512
+resolution = 1.0
+seed = 42
+
+_lock = threading.Lock()
+# (graph, GraphAnalytics) computed in memory when graph_analytics.json is missing or stale
+_computed = None
+
+
+def adjacency(graph):
+    '''
+    Get the weighted adjacency matrix of a CoauthorGraph as a scipy CSR matrix
+    '''
+    from scipy import sparse
+
+    n = len(graph)
+    return sparse.csr_matrix((graph.weights.astype(np.float64), graph.indices, graph.indptr), shape=(n, n))
+
+
+def pagerank(A, alpha=damping, tol=1e-10, max_iter=200):
+    '''
+    Weighted PageRank of an adjacency matrix by power iteration.
+    Nodes without edges spread their rank uniformly.
+    '''
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out = np.asarray(A.sum(axis=1)).ravel()
+    dangling = out == 0
+    inverse = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+    transition = A.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = rank
+        rank = alpha * (transition @ (previous * inverse)) + (alpha * previous[dangling].sum() + 1 - alpha) / n
+        if np.abs(rank - previous).sum() < n * tol:
+            break
+    return rank / rank.sum()
+
+
+def betweenness(A, samples=betweenness_samples, batch=64, seed=seed):
+    '''
+    Normalized betweenness centrality of an undirected graph over shortest paths in hops
+    (Brandes' algorithm, with the searches of a batch of sources run as matrix products).
+    With more nodes than samples, it is estimated from that many random sources.
+    '''
+    n = A.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    pattern = A.copy()
+    pattern.data = np.ones_like(pattern.data)
+    sources = np.arange(n)
+    if samples and n > samples:
+        sources = np.sort(np.random.default_rng(seed).choice(n, samples, replace=False))
+
+    centrality = np.zeros(n)
+    for start in range(0, len(sources), batch):
+        chunk = sources[start:start + batch]
+        columns = np.arange(len(chunk))
+        # Number of shortest paths from every source (column) and hop distance, -1 if unreached
+        paths = np.zeros((n, len(chunk)))
+        paths[chunk, columns] = 1
+        distance = np.full((n, len(chunk)), -1)
+        distance[chunk, columns] = 0
+        frontier = paths.copy()
+        depth = 0
+        while True:
+            reached = pattern @ frontier
+            reached[distance >= 0] = 0
+            if not reached.any():
+                break
+            depth += 1
+            distance[reached > 0] = depth
+            paths += reached
+            frontier = reached
+
+        # Dependencies accumulated from the deepest level back to the sources
+        dependency = np.zeros((n, len(chunk)))
+        safe_paths = np.where(paths > 0, paths, 1)
+        for level in range(depth, 0, -1):
+            share = np.where(distance == level, (1 + dependency) / safe_paths, 0)
+            dependency += np.where(distance == level - 1, paths * (pattern @ share), 0)
+        dependency[chunk, columns] = 0
+        centrality += dependency.sum(axis=1)
+
+    centrality *= n / len(sources)
+    # Every pair is counted from both ends in an undirected graph
+    return centrality / ((n - 1) * (n - 2))
+
+
+def _move_nodes(A, resolution, rng):
+    '''
+    Louvain local moving: every node joins the neighbouring community with the
+    largest modularity gain until no node moves. Returns contiguous community ids.
+    '''
+    n = A.shape[0]
+    degrees = np.asarray(A.sum(axis=1)).ravel()
+    total = degrees.sum()
+    community = np.arange(n)
+    if total == 0:
+        return community
+    totals = degrees.copy()
+    for _ in range(100):
+        moved = False
+        for node in rng.permutation(n):
+            start, end = A.indptr[node], A.indptr[node + 1]
+            neighbours, weights = A.indices[start:end], A.data[start:end]
+            keep = neighbours != node
+            current = community[node]
+            totals[current] -= degrees[node]
+            labels, inverse = np.unique(community[neighbours[keep]], return_inverse=True)
+            links = np.bincount(inverse, weights=weights[keep], minlength=len(labels))
+            gains = links - resolution * totals[labels] * degrees[node] / total
+            own = np.flatnonzero(labels == current)
+            stay = (links[own[0]] if len(own) else 0) - resolution * totals[current] * degrees[node] / total
+            best = current
+            if len(labels) and gains.max() > stay + 1e-12:
+                best = labels[np.argmax(gains)]
+                moved = True
+            community[node] = best
+            totals[best] += degrees[node]
+        if not moved:
+            break
+    return np.unique(community, return_inverse=True)[1]
+
+
+def louvain(A, resolution=resolution, seed=seed):
+    '''
+    Communities of an undirected weighted graph by Louvain modularity optimization.
+    Community ids are ordered by decreasing size.
+    '''
+    from scipy import sparse
+
+    n = A.shape[0]
+    rng = np.random.default_rng(seed)
+    membership = np.arange(n)
+    level = A.tocsr()
+    while level.shape[0]:
+        community = _move_nodes(level, resolution, rng)
+        count = community.max() + 1
+        membership = community[membership]
+        if count == level.shape[0]:
+            break
+        # One node per community, its internal weight on the diagonal
+        P = sparse.csr_matrix((np.ones(level.shape[0]), (np.arange(level.shape[0]), community)),
+                              shape=(level.shape[0], count))
+        level = (P.T @ level @ P).tocsr()
+
+    sizes = np.bincount(membership, minlength=membership.max() + 1 if n else 0)
+    order = np.argsort(-sizes, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[membership]
+
+
+def modularity(A, communities, resolution=resolution):
+    from scipy import sparse
+
+    total = A.sum()
+    if total == 0:
+        return 0.0
+    P = sparse.csr_matrix((np.ones(len(communities)), (np.arange(len(communities)), communities)))
+    internal = (P.T @ A @ P).diagonal()
+    degrees = P.T @ np.asarray(A.sum(axis=1)).ravel()
+    return float((internal.sum() - resolution * (degrees ** 2).sum() / total) / total)
+
+
+def analyze(graph):
+    '''
+    Get the analytics documents ({"name", "degree", "weighted_degree", "pagerank",
+    "betweenness", "community"}) of every node of a CoauthorGraph, and the modularity
+    of its communities
+    '''
+    A = adjacency(graph)
+    degree = np.diff(graph.indptr)
+    weighted_degree = np.asarray(A.sum(axis=1)).ravel()
+    ranks = pagerank(A)
+    between = betweenness(A)
+    communities = louvain(A)
+    documents = [{'name': name, 'degree': int(degree[i]), 'weighted_degree': int(weighted_degree[i]),
+                  'pagerank': float(ranks[i]), 'betweenness': float(between[i]), 'community': int(communities[i])}
+                 for i, name in enumerate(graph.names)]
+    return documents, modularity(A, communities)
+
+
+class GraphAnalytics:
+    '''
+    Per-professor graph metrics, with the PageRank positions and community sizes,
+    of the version of the SCSE graph they were computed from
+    '''
+
+    def __init__(self, documents, version=None):
+        self.version = version
+        self.names = [document['name'] for document in documents]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.degree = np.array([document['degree'] for document in documents], dtype=np.int32)
+        self.weighted_degree = np.array([document['weighted_degree'] for document in documents], dtype=np.int32)
+        self.pagerank = np.array([document['pagerank'] for document in documents], dtype=np.float64)
+        self.betweenness = np.array([document['betweenness'] for document in documents], dtype=np.float64)
+        self.community = np.array([document['community'] for document in documents], dtype=np.int32)
+        order = np.argsort(-self.pagerank, kind='stable')
+        self.pagerank_position = np.empty(len(order), dtype=np.int32)
+        self.pagerank_position[order] = np.arange(1, len(order) + 1)
+        self.community_sizes = np.bincount(self.community) if len(self.community) else np.zeros(0, dtype=np.int64)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def metrics(self, name):
+        '''
+        Get the metrics of a professor as a dict, or None if they have no SCSE collaborations
+        '''
+        if name not in self.ids:
+            return None
+        i = self.ids[name]
+        return {
+            'degree': int(self.degree[i]),
+            'weighted_degree': int(self.weighted_degree[i]),
+            'pagerank': float(self.pagerank[i]),
+            'pagerank_position': int(self.pagerank_position[i]),
+            'betweenness': float(self.betweenness[i]),
+            'community': int(self.community[i]),
+            'community_size': int(self.community_sizes[self.community[i]]),
+        }
+
+    def members(self, community):
+        '''
+        Get the professors of a community by decreasing PageRank
+        '''
+        ids = np.flatnonzero(self.community == community)
+        return [self.names[i] for i in ids[np.argsort(-self.pagerank[ids], kind='stable')]]
+
+    def key_collaborators(self, name, graph, k=5):
+        '''
+        Get the k most frequent SCSE collaborators of a professor as
+        (name, joint papers, same community) triples
+        '''
+        if name not in self.ids:
+            return []
+        community = self.community[self.ids[name]]
+        return [(collaborator, weight, collaborator in self.ids and self.community[self.ids[collaborator]] == community)
+                for collaborator, weight in graph.top_neighbours(name, k)]
+
+
+def _load_analytics(path):
+    with open(path, "r") as f:
+        value = json.load(f)
+    return GraphAnalytics(value['professors'], value['version'])
+
+
+def get_graph_analytics():
+    '''
+    Get the analytics stored by build.py, or computed from the graph index when
+    graph_analytics.json has not been built for the current coauthors_scse.json
+    '''
+    global _computed
+    graph = get_scse_graph()
+    path = data_store.cache_path('graph_analytics.json')
+    if os.path.exists(path):
+        analytics = data_store.cached_load(path, _load_analytics)
+        if analytics.version == graph.version:
+            return analytics
+    with _lock:
+        if _computed is None or _computed[0] is not graph:
+            _computed = (graph, GraphAnalytics(analyze(graph)[0], graph.version))
+        return _computed[1]
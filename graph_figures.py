@@ -0,0 +1,222 @@
+import os
+import threading
+
+import numpy as np
+import networkx as nx
+import plotly.graph_objs as go
+import igviz as ig
+from cachetools import LRUCache
+
+import data_store
+import figure_payload
+from instrumentation import span, cache_access
+from graph_index import get_scse_graph
+from graph_analytics import get_graph_analytics
+
+
+layouts = {'circular': 'Circular', 'spring': 'Force-directed'}
+
+# (professor or None for the overall graph, layout, graph version) -> figure JSON
+_figures = LRUCache(maxsize=256)
+# Node colours of the research communities of the overall graph
+community_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880',
+                    '#FF97FF', '#FECB52']
+# Level of detail of the WebGL overall graph: the heaviest edges and the nodes with
+# the most joint papers are drawn, the other nodes are merged into one marker per
+# research community
+max_edges = 5000
+max_nodes = 1000
+# (graph version, layout) -> node positions of the whole graph
+_positions = {}
+_lock = threading.Lock()
+
+
+def _compute_layout(G, layout):
+    if layout == 'circular':
+        return nx.circular_layout(G)
+    if layout == 'spring':
+        return nx.spring_layout(G, seed=42)
+    raise ValueError(f"Unknown graph layout: {layout}")
+
+
+def graph_layout(graph, layout='circular'):
+    '''
+    Get the (n, 2) node positions of the whole graph, in node id order.
+    Positions are computed once per graph version and persisted next to the graph index.
+    '''
+    key = (graph.version, layout)
+    positions = _positions.get(key)
+    if positions is not None:
+        return positions
+
+    path = data_store.cache_path(f"coauthors_scse_layout_{layout}_{graph.version}.npy")
+    if os.path.exists(path):
+        positions = np.load(path)
+    else:
+        G = _to_networkx(graph, range(len(graph)))
+        pos = _compute_layout(G, layout)
+        positions = np.array([pos[name] for name in graph.names])
+        np.save(path, positions)
+    with _lock:
+        _positions[key] = positions
+    return positions
+
+
+def _to_networkx(graph, nodes):
+    G = nx.Graph()
+    G.add_nodes_from(graph.names[node] for node in nodes)
+    for professor_1, professor_2, weight in graph.induced_subgraph(np.asarray(list(nodes), dtype=np.int64)):
+        G.add_edge(professor_1, professor_2, weight=weight)
+    return G
+
+
+def _cached_json(key, build):
+    with _lock:
+        figure = _figures.get(key)
+    cache_access('graph_figures', figure is not None)
+    if figure is None:
+        with span('igviz.plot'):
+            figure = build().to_plotly_json()
+        with _lock:
+            _figures[key] = figure
+    return figure
+
+
+def _community_color(community):
+    return community_colors[community % len(community_colors)] if community >= 0 else '#BBBBBB'
+
+
+def network_figure(graph, positions, analytics, title, max_edges=max_edges, max_nodes=max_nodes):
+    '''
+    Draw a CoauthorGraph with WebGL traces: all edges in one NaN-separated line trace
+    and the nodes, sized by joint papers and coloured by research community, in one
+    marker trace. Above max_edges only the heaviest edges are drawn; above max_nodes
+    the nodes with the fewest joint papers are merged per community.
+    '''
+    n = len(graph)
+    # Layouts span about [-1, 1]: four decimals are below a pixel
+    positions = np.round(positions, 4)
+    ids = np.array([analytics.ids.get(name, -1) for name in graph.names], dtype=np.int64)
+    known = ids >= 0
+    weighted_degree = np.zeros(n, dtype=np.int64)
+    weighted_degree[known] = analytics.weighted_degree[ids[known]]
+    community = np.full(n, -1, dtype=np.int64)
+    community[known] = analytics.community[ids[known]]
+
+    shown = np.ones(n, dtype=bool)
+    if n > max_nodes:
+        shown[:] = False
+        shown[np.argsort(-weighted_degree, kind='stable')[:max_nodes]] = True
+
+    # Every undirected edge once, between shown nodes
+    sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+    keep = (sources < graph.indices) & shown[sources] & shown[graph.indices]
+    sources, targets, weights = sources[keep], graph.indices[keep], graph.weights[keep]
+    if len(weights) > max_edges:
+        heaviest = np.argpartition(-weights, max_edges - 1)[:max_edges]
+        sources, targets, weights = sources[heaviest], targets[heaviest], weights[heaviest]
+    edges = np.full((len(sources), 3), np.nan)
+    edges[:, 0], edges[:, 1] = positions[sources, 0], positions[targets, 0]
+    xs = edges.ravel()
+    edges[:, 0], edges[:, 1] = positions[sources, 1], positions[targets, 1]
+    ys = edges.ravel()
+
+    largest = max(weighted_degree.max() if n else 0, 1)
+    nodes = np.flatnonzero(shown)
+    x, y = positions[nodes, 0], positions[nodes, 1]
+    sizes = 8 + 27 * np.sqrt(weighted_degree[nodes] / largest)
+    colors = [_community_color(community[node]) for node in nodes]
+    hover = [f"{graph.names[node]}<br>Joint papers: {weighted_degree[node]}<br>Research cluster: "
+             f"{'#%d' % (community[node] + 1) if community[node] >= 0 else '-'}" for node in nodes]
+
+    hidden = np.flatnonzero(~shown)
+    if len(hidden):
+        for group in np.unique(community[hidden]):
+            members = hidden[community[hidden] == group]
+            x = np.append(x, positions[members, 0].mean())
+            y = np.append(y, positions[members, 1].mean())
+            sizes = np.append(sizes, 8 + 4 * np.log2(len(members)))
+            colors.append(_community_color(group))
+            hover.append(f"{len(members)} more professors<br>Research cluster: "
+                         f"{'#%d' % (group + 1) if group >= 0 else '-'}")
+
+    fig = go.Figure([
+        go.Scattergl(x=xs, y=ys, mode='lines', line=dict(width=0.5, color='#888'), hoverinfo='skip'),
+        go.Scattergl(x=x, y=y, mode='markers', hovertext=hover, hoverinfo='text',
+                     marker=dict(size=sizes, color=colors, opacity=0.8, line_width=0)),
+    ])
+    fig.update_layout(title=title, showlegend=False, hovermode='closest', margin=dict(b=20, l=5, r=5, t=40),
+                      xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                      yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                      plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    return figure_payload.compact(fig)
+
+
+def overall_graph_figure(layout='circular'):
+    '''
+    Get the figure of the network of all SCSE professors
+    '''
+    graph = get_scse_graph()
+
+    if figure_payload.mode == 'webgl':
+        def build():
+            return network_figure(graph, graph_layout(graph, layout), get_graph_analytics(), "SCSE Network Graph")
+
+        return go.Figure(_cached_json((None, layout, graph.version, 'webgl'), build))
+
+    def build():
+        G = _to_networkx(graph, range(len(graph)))
+        positions = graph_layout(graph, layout)
+        nx.set_node_attributes(G, {name: tuple(positions[i]) for i, name in enumerate(graph.names)}, "pos")
+        nx.set_edge_attributes(G, 5, "edge_prop")
+
+        # Nodes sized by their number of joint papers and coloured by research community
+        analytics = get_graph_analytics()
+        metrics = {name: analytics.metrics(name) for name in G.nodes}
+        largest = max([m['weighted_degree'] for m in metrics.values() if m] + [1])
+        nx.set_node_attributes(G, {name: 8 + 27 * np.sqrt(m['weighted_degree'] / largest) if m else 8
+                                   for name, m in metrics.items()}, "size")
+        nx.set_node_attributes(G, {name: m['weighted_degree'] if m else 0 for name, m in metrics.items()},
+                               "Joint papers")
+        nx.set_node_attributes(G, {name: f"#{m['community'] + 1}" if m else '-' for name, m in metrics.items()},
+                               "Research cluster")
+        colors = [_community_color(m['community'] if m else -1) for m in metrics.values()]
+        fig = ig.plot(G, title="SCSE Network Graph", size_method="size", color_method=colors,
+                      node_text=["Joint papers", "Research cluster"])
+        fig.update_traces(marker_showscale=False, selector=dict(mode='markers'))
+        return fig
+
+    return go.Figure(_cached_json((None, layout, graph.version), build))
+
+
+def individual_graph_figure(professor_name, layout='circular'):
+    '''
+    Get the figure of the network around one professor
+    '''
+    return go.Figure(individual_graph_json(professor_name, layout))
+
+
+def individual_graph_json(professor_name, layout='circular'):
+    '''
+    Get the cached figure JSON of the network around one professor, without
+    building a Figure (which costs more than a cache hit), e.g. to warm the cache
+    '''
+    graph = get_scse_graph()
+
+    def build():
+        # The professor, the SCSE professors they collaborated with and all the
+        # collaborations of those professors
+        G = nx.Graph()
+        G.add_node(professor_name)
+        for professor_1, professor_2, weight in graph.collaborator_edges(professor_name):
+            G.add_edge(professor_1, professor_2, weight=weight)
+        nx.set_node_attributes(G, _compute_layout(G, layout), "pos")
+        nx.set_node_attributes(G, 3, "prop")
+        nx.set_edge_attributes(G, 5, "edge_prop")
+        return ig.plot(G, title=f"{professor_name}'s graph",
+                       node_label_position="top center",
+                       edge_label="weight",
+                       edge_label_position="bottom center",
+                       colorscale='YlOrRd')
+
+    return _cached_json((professor_name, layout, graph.version), build)
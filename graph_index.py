@@ -0,0 +1,183 @@
+import os
+import json
+
+import numpy as np
+
+import data_store
+
+
+class CoauthorGraph:
+    '''
+    Co-authorship graph stored as CSR arrays over integer node ids.
+    The neighbours of every node are sorted by decreasing weight, so the top-k
+    collaborators of a professor are the first k entries of its row.
+    '''
+
+    def __init__(self, names, indptr, indices, weights, version):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.version = version
+
+    @classmethod
+    def from_coauthors(cls, entries, version, directed=False):
+        '''
+        Build the graph from coauthor entries ({"name", "coauthors": [{"coauthor_name", "times"}]}).
+        Undirected graphs keep the larger weight when both professors list each other.
+        '''
+        names = {}
+        src, dst, weights = [], [], []
+        for entry in entries:
+            professor = names.setdefault(entry['name'], len(names))
+            for coauthor in entry['coauthors']:
+                src.append(professor)
+                dst.append(names.setdefault(coauthor['coauthor_name'], len(names)))
+                weights.append(coauthor['times'])
+
+        src = np.array(src, dtype=np.int32)
+        dst = np.array(dst, dtype=np.int32)
+        weights = np.array(weights, dtype=np.int32)
+        if not directed:
+            keep = src != dst
+            src, dst, weights = (np.concatenate([src[keep], dst[keep]]),
+                                 np.concatenate([dst[keep], src[keep]]),
+                                 np.concatenate([weights[keep], weights[keep]]))
+
+        # Drop duplicate edges keeping the largest weight, then order each row by weight
+        # (ties keep the order of the source file)
+        position = np.arange(len(src))
+        order = np.lexsort((-weights, dst, src))
+        src, dst, weights, position = src[order], dst[order], weights[order], position[order]
+        first = np.ones(len(src), dtype=bool)
+        first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, weights, position = src[first], dst[first], weights[first], position[first]
+        order = np.lexsort((position, -weights, src))
+        src, dst, weights = src[order], dst[order], weights[order]
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(names)), out=indptr[1:])
+        return cls(list(names), indptr, dst, weights, version)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            return cls(f['names'].tolist(), f['indptr'], f['indices'], f['weights'], str(f['version']))
+
+    def save(self, path):
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, names=np.array(self.names, dtype=str), indptr=self.indptr,
+                 indices=self.indices, weights=self.weights, version=np.array(self.version))
+        os.replace(tmp_path, path)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def _row(self, node):
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def top_neighbours(self, name, k=None):
+        '''
+        Get the k most frequent collaborators of a professor as (name, weight) pairs
+        '''
+        if name not in self.ids:
+            return []
+        indices, weights = self._row(self.ids[name])
+        return [(self.names[i], int(w)) for i, w in zip(indices[:k], weights[:k])]
+
+    def ego_network(self, name, radius=1):
+        '''
+        Get the ids of all nodes within radius hops of a professor, the professor first
+        '''
+        if name not in self.ids:
+            return np.array([], dtype=np.int32)
+        start = self.ids[name]
+        visited = np.zeros(len(self.names), dtype=bool)
+        visited[start] = True
+        nodes = [np.array([start], dtype=np.int32)]
+        frontier = nodes[0]
+        for _ in range(radius):
+            if len(frontier) == 0:
+                break
+            neighbours = np.concatenate([self._row(node)[0] for node in frontier])
+            frontier = np.unique(neighbours[~visited[neighbours]])
+            visited[frontier] = True
+            nodes.append(frontier)
+        return np.concatenate(nodes)
+
+    def induced_subgraph(self, nodes):
+        '''
+        Get the edges between the given node ids as (name, name, weight) triples
+        '''
+        member = np.zeros(len(self.names), dtype=bool)
+        member[nodes] = True
+        edges = []
+        for node in nodes:
+            indices, weights = self._row(node)
+            keep = member[indices] & (indices > node)
+            edges.extend((self.names[node], self.names[i], int(w))
+                         for i, w in zip(indices[keep], weights[keep]))
+        return edges
+
+    def collaborator_edges(self, name):
+        '''
+        Get the collaborations of a professor and of each of their coauthors, as
+        (name, name, weight) triples: the network two hops out, without the edges
+        between the professors two hops away
+        '''
+        nodes = self.ego_network(name)
+        member = np.zeros(len(self.names), dtype=bool)
+        member[nodes] = True
+        edges = []
+        for node in nodes:
+            indices, weights = self._row(node)
+            # An edge between two coauthors is listed by both of them
+            keep = ~member[indices] | (indices > node)
+            edges.extend((self.names[node], self.names[i], int(w))
+                         for i, w in zip(indices[keep], weights[keep]))
+        return edges
+
+
+def _load_graph(path, directed):
+    '''
+    Load the persisted index of a coauthor file, rebuilding it if the file changed
+    '''
+    version = data_store.file_digest(path)
+    kind = 'directed' if directed else 'undirected'
+    index_path = data_store.cache_path(f"{os.path.splitext(os.path.basename(path))[0]}_{kind}.npz")
+    if os.path.exists(index_path):
+        graph = CoauthorGraph.load(index_path)
+        if graph.version == version:
+            return graph
+    with open(path, "r") as f:
+        entries = json.load(f)
+    graph = CoauthorGraph.from_coauthors(entries, version, directed=directed)
+    graph.save(index_path)
+    return graph
+
+
+def _load_scse_graph(path):
+    return _load_graph(path, directed=False)
+
+
+def _load_coauthor_graph(path):
+    return _load_graph(path, directed=True)
+
+
+def get_scse_graph():
+    '''
+    Get the undirected co-authorship graph between SCSE professors
+    '''
+    return data_store.cached_load(data_store.data_path('coauthors_scse.json'), _load_scse_graph)
+
+
+def get_coauthor_graph():
+    '''
+    Get the directed graph of professors to all their DBLP coauthors
+    '''
+    return data_store.cached_load(data_store.data_path('coauthors.json'), _load_coauthor_graph)
@@ -0,0 +1,8 @@
+'''
+Collection of DR-NTU profiles and DBLP publications into MongoDB or the JSON exports in data/.
+Run with python -m ingest from the repository root.
+'''
+from .fetcher import Fetcher, HttpCache, FetchError
+from .checkpoint import Checkpoint
+from .pipeline import read_professors, collect, collect_professor
+from .sinks import MongoSink, JsonSink
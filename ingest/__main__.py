@@ -0,0 +1,48 @@
+import sys
+import logging
+import argparse
+
+from .fetcher import Fetcher
+from .checkpoint import Checkpoint
+from .pipeline import read_professors, collect
+from .sinks import JsonSink, MongoSink
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ingest',
+                                     description="Collect DR-NTU profiles and DBLP publications of the SCSE professors")
+    parser.add_argument('--professors', default='./data/professors.csv')
+    parser.add_argument('--data-dir', default='./data')
+    parser.add_argument('--cache-dir', default='./data/cache/http')
+    parser.add_argument('--checkpoint', default='./data/cache/ingest_checkpoint.jsonl')
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint of a previous run")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--dblp-delay', type=float, default=1.0, help="seconds between two requests to dblp.org")
+    parser.add_argument('--drntu-delay', type=float, default=0.5, help="seconds between two requests to dr.ntu.edu.sg")
+    parser.add_argument('--sink', choices=['json', 'mongo'], default='json')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    fetcher = Fetcher(args.cache_dir, max_workers=args.workers, retries=args.retries,
+                      host_delays={'dblp.org': args.dblp_delay, 'dr.ntu.edu.sg': args.drntu_delay})
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.restart:
+        checkpoint.clear()
+
+    records, failed = collect(read_professors(args.professors), fetcher, checkpoint)
+    if args.sink == 'mongo':
+        from repository import get_client, database_name
+        sink = MongoSink(get_client()[database_name])
+    else:
+        sink = JsonSink(args.data_dir)
+    sink.write(records)
+    # Only resumes a crashed run: the next run collects everything again
+    checkpoint.clear()
+    logging.info("Wrote %d professors, %d failed%s", len(records), len(failed),
+                 f": {', '.join(failed)}" if failed else "")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
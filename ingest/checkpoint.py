@@ -0,0 +1,45 @@
+import os
+import json
+import threading
+
+
+class Checkpoint:
+    '''
+    Append-only JSON lines file of finished records, so that a crashed
+    collection run resumes with the professors it has not finished yet.
+    It is cleared once the records were written to the sink.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partially written last line of an interrupted run
+                        continue
+                    self.records[record['name']] = record
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def __contains__(self, name):
+        return name in self.records
+
+    def add(self, record):
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records[record['name']] = record
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.records = {}
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+
+class HttpCache:
+    '''
+    On-disk cache of HTTP responses, revalidated with ETag / Last-Modified
+    '''
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.body', base + '.json'
+
+    def get(self, url):
+        '''
+        Get the cached (body, validators) of a url, or (None, {}) if it was never fetched
+        '''
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, {}
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return f.read(), meta
+
+    def put(self, url, body, headers):
+        body_path, meta_path = self._paths(url)
+        meta = {'url': url}
+        if headers.get('ETag'):
+            meta['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            meta['last_modified'] = headers['Last-Modified']
+        with open(body_path + '.tmp', 'wb') as f:
+            f.write(body)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(body_path + '.tmp', body_path)
+        os.replace(meta_path + '.tmp', meta_path)
+
+
+class RateLimiter:
+    '''
+    Enforces a minimum delay between two requests to the same host
+    '''
+
+    def __init__(self, delays, default_delay=0.0):
+        self.delays = delays
+        self.default_delay = default_delay
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        delay = self.delays.get(host, self.default_delay)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+
+class FetchError(Exception):
+    pass
+
+
+class Fetcher:
+    '''
+    Fetches urls concurrently with bounded workers, per-host rate limits,
+    retries with exponential backoff and an ETag-aware on-disk cache.
+    '''
+
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(self, cache_dir, max_workers=8, host_delays=None, default_delay=0.0,
+                 retries=3, backoff=1.0, timeout=30):
+        self.cache = HttpCache(cache_dir)
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(host_delays or {}, default_delay)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def fetch(self, url):
+        '''
+        Get the body of a url, served from the cache when the server answers 304
+        '''
+        cached_body, meta = self.cache.get(url)
+        headers = {}
+        if cached_body is not None:
+            if 'etag' in meta:
+                headers['If-None-Match'] = meta['etag']
+            if 'last_modified' in meta:
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        host = urlparse(url).netloc
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(host)
+            try:
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = e
+            else:
+                if response.status_code == 304 and cached_body is not None:
+                    return cached_body
+                if response.status_code == 200:
+                    self.cache.put(url, response.content, response.headers)
+                    return response.content
+                error = FetchError(f"{url} returned HTTP {response.status_code}")
+                if response.status_code not in self.retry_statuses:
+                    break
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise FetchError(f"Failed to fetch {url}") from error
+
+    def map(self, function, items):
+        '''
+        Run function(fetcher, item) for every item on the worker pool.
+        Yields (item, result, error) in completion order.
+        '''
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(function, self, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
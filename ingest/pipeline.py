@@ -0,0 +1,56 @@
+import csv
+import logging
+
+from .sources import dblp_xml_url, parse_dblp_person, parse_drntu_profile
+
+
+logger = logging.getLogger(__name__)
+
+
+def read_professors(path):
+    '''
+    Read the professors to collect from professors.csv
+    '''
+    professors = []
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        for row in csv.DictReader(f):
+            dblp_url = row.get('DBLP URL') or None
+            if dblp_url in ('NaN', 'nan'):
+                dblp_url = None
+            professors.append({
+                'name': row['Full Name'],
+                'drntu_url': row['DR-NTU URL'],
+                'dblp_url': dblp_url,
+            })
+    return professors
+
+
+def collect_professor(fetcher, professor):
+    '''
+    Fetch and parse the DR-NTU profile and the DBLP publications of one professor
+    '''
+    record = {'name': professor['name']}
+    record.update(parse_drntu_profile(fetcher.fetch(professor['drntu_url'])))
+    if professor['dblp_url']:
+        record.update(parse_dblp_person(fetcher.fetch(dblp_xml_url(professor['dblp_url']))))
+    else:
+        record.update({'orcid_url': None, 'publications': None, 'num_contributions': None})
+    return record
+
+
+def collect(professors, fetcher, checkpoint):
+    '''
+    Collect every professor not in the checkpoint yet and return all records.
+    Failed professors are logged and left out of the checkpoint so the next run retries them.
+    '''
+    pending = [professor for professor in professors if professor['name'] not in checkpoint]
+    logger.info("%d professors to collect, %d already done", len(pending), len(professors) - len(pending))
+    failed = []
+    for professor, record, error in fetcher.map(collect_professor, pending):
+        if error is not None:
+            logger.warning("Failed to collect %s: %s", professor['name'], error)
+            failed.append(professor['name'])
+            continue
+        checkpoint.add(record)
+    names = [professor['name'] for professor in professors]
+    return [checkpoint.records[name] for name in names if name in checkpoint], failed
@@ -0,0 +1,133 @@
+import os
+import csv
+import json
+
+
+# professors_new.csv columns of the fields collected from DR-NTU and DBLP
+profile_columns = ('biography', 'orcid_url')
+
+
+def _escape(value):
+    '''
+    Encode a new professors_new.csv value for the dashboard, which reads the file
+    with the unicode_escape codec: backslashes are doubled, and the characters
+    outside Latin-1 are written as escapes when the file is encoded
+    '''
+    return value.replace('\\', '\\\\')
+
+
+def professor_document(record):
+    return {'name': record['name'], 'keywords': record.get('keywords', [])}
+
+
+def profile_document(record):
+    return {'name': record['name'], **{column: record.get(column) for column in profile_columns}}
+
+
+def publications_document(record):
+    return {'name': record['name'], 'publications': record.get('publications', {}),
+            'num_contributions': record.get('num_contributions', {})}
+
+
+def keyword_documents(professors):
+    '''
+    Invert professor keyword lists into keywordsAndNames documents
+    '''
+    names_by_keyword = {}
+    for professor in professors:
+        for keyword in professor['keywords']:
+            names = names_by_keyword.setdefault(keyword, [])
+            if professor['name'] not in names:
+                names.append(professor['name'])
+    return [{'keyword': keyword, 'names': names} for keyword, names in names_by_keyword.items()]
+
+
+class MongoSink:
+    '''
+    Writes collected records to MongoDB with unordered bulk upserts
+    '''
+
+    def __init__(self, db, batch_size=500):
+        self.db = db
+        self.batch_size = batch_size
+
+    def _upsert(self, collection, key, documents):
+        from pymongo import UpdateOne
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            requests = [UpdateOne({key: document[key]}, {'$set': document}, upsert=True) for document in batch]
+            if requests:
+                collection.bulk_write(requests, ordered=False)
+
+    def write(self, records):
+        self._upsert(self.db.professors, 'name',
+                     [{**professor_document(r), **profile_document(r)} for r in records])
+        self._upsert(self.db.DBLP_publications, 'name',
+                     [publications_document(r) for r in records if r.get('publications') is not None])
+        # Keyword documents depend on every professor, so they are rebuilt from the collection
+        # and the keywords no professor has any more are removed
+        professors = list(self.db.professors.find({}, {'_id': 0, 'name': 1, 'keywords': 1}))
+        documents = keyword_documents(professors)
+        self._upsert(self.db.keywordsAndNames, 'keyword', documents)
+        self.db.keywordsAndNames.delete_many({'keyword': {'$nin': [document['keyword'] for document in documents]}})
+
+
+class JsonSink:
+    '''
+    Writes collected records to the JSON exports in data/, merging by name
+    '''
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+
+    def _merge(self, filename, key, documents):
+        path = os.path.join(self.data_dir, filename)
+        existing = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                existing = json.load(f)
+        merged = {document[key]: document for document in existing}
+        merged.update((document[key], document) for document in documents)
+        self._write(filename, list(merged.values()))
+        return list(merged.values())
+
+    def _write(self, filename, documents):
+        path = os.path.join(self.data_dir, filename)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(documents, f, indent=4)
+        os.replace(path + '.tmp', path)
+
+    def _update_profiles(self, documents):
+        '''
+        Set the biography and orcid_url columns of professors_new.csv, adding rows for new professors.
+        The file is not UTF-8: it is read and written as Latin-1 so the rows left
+        untouched keep their bytes.
+        '''
+        path = os.path.join(self.data_dir, 'professors_new.csv')
+        header, rows = ['Full Name', *profile_columns], []
+        if os.path.exists(path):
+            with open(path, 'r', encoding='latin-1', newline='') as f:
+                reader = csv.DictReader(f)
+                header = list(reader.fieldnames) + [column for column in profile_columns
+                                                    if column not in reader.fieldnames]
+                rows = list(reader)
+        by_name = {row['Full Name']: row for row in rows}
+        for document in documents:
+            row = by_name.get(document['name'])
+            if row is None:
+                row = by_name[document['name']] = {'Full Name': document['name']}
+                rows.append(row)
+            row.update((column, _escape(document[column] or '')) for column in profile_columns)
+        with open(path + '.tmp', 'w', encoding='latin-1', errors='backslashreplace', newline='') as f:
+            writer = csv.DictWriter(f, header, restval='', lineterminator='\r\n')
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(path + '.tmp', path)
+
+    def write(self, records):
+        professors = self._merge('namesAndKeywords.json', 'name', [professor_document(r) for r in records])
+        self._update_profiles([profile_document(r) for r in records])
+        self._merge('DBLP_publications.json', 'name',
+                    [publications_document(r) for r in records if r.get('publications') is not None])
+        # Rebuilt from every professor rather than merged, so removed keywords disappear
+        self._write('keywordsAndNames.json', keyword_documents(professors))
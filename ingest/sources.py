@@ -0,0 +1,82 @@
+import xml.etree.ElementTree as ET
+
+from bs4 import BeautifulSoup
+
+
+# DBLP record element (and publtype) -> category used by the dashboard
+dblp_categories = {
+    'article': 'Journal Articles',
+    'inproceedings': 'Conference and Workshop Papers',
+    'proceedings': 'Editorship',
+    'book': 'Books and Theses',
+    'phdthesis': 'Books and Theses',
+    'mastersthesis': 'Books and Theses',
+    'incollection': 'Parts in Books or Collections',
+}
+informal_category = 'Informal and Other Publications'
+reference_category = 'Reference Works'
+
+
+def dblp_xml_url(dblp_url):
+    return dblp_url.rstrip('/') + '.xml'
+
+
+def _category(record):
+    publtype = record.get('publtype', '')
+    if publtype == 'informal' or record.tag == 'www':
+        return informal_category
+    if publtype == 'encyclopedia':
+        return reference_category
+    return dblp_categories.get(record.tag, informal_category)
+
+
+def parse_dblp_person(content):
+    '''
+    Parse a DBLP person XML page into the orcid url, the publications grouped by
+    year and category, and the number of contributions per year and category
+    '''
+    root = ET.fromstring(content)
+    orcid_url = None
+    person = root.find('person')
+    if person is not None:
+        for url in person.findall('url'):
+            if url.text and 'https://orcid.org/' in url.text:
+                orcid_url = url.text
+                break
+
+    name = root.get('name')
+    publications = {}
+    num_contributions = {}
+    for r in root.findall('r'):
+        for record in r:
+            year = record.findtext('year')
+            if year is None:
+                continue
+            category = _category(record)
+            authors = [author.text for author in record.findall('author') + record.findall('editor')]
+            paper = {
+                'title': record.findtext('title'),
+                'coauthors': [author for author in authors if author != name],
+                'conference_name': record.findtext('booktitle') or record.findtext('journal'),
+                'url': record.findtext('ee') or record.findtext('url'),
+            }
+            publications.setdefault(year, {}).setdefault(category, []).append(paper)
+            counts = num_contributions.setdefault(year, {})
+            counts[category] = counts.get(category, 0) + 1
+    return {'orcid_url': orcid_url, 'publications': publications, 'num_contributions': num_contributions}
+
+
+def parse_drntu_profile(content):
+    '''
+    Parse a DR-NTU researcher profile into its keywords and biography
+    '''
+    soup = BeautifulSoup(content, 'html.parser')
+    keywords = [keyword.get_text().strip() for keyword in soup.find_all('span', class_='rkeyword')]
+    authortags = soup.find('div', class_='dynaFieldValue', id='authortagsDiv')
+    if authortags is not None:
+        keywords.extend(tag.get_text().strip() for tag in authortags.find_all('a'))
+    biography = soup.find('div', class_='panel-collapse collapse in', id='collapseOnebiography')
+    return {
+        'keywords': keywords,
+        'biography': biography.get_text().strip() if biography is not None else None,
+    }
@@ -0,0 +1,222 @@
+'''
+Timing spans, counters and payload sizes of the dashboard.
+
+Functions decorated with @timed and blocks wrapped in span() are recorded in a
+process-wide registry (count, total and max duration) and in the trace of the
+current script run. Metrics are exported in the Prometheus text format, over
+HTTP when SCSEDASH_METRICS_PORT is set, and shown in a sidebar panel when
+SCSEDASH_DEBUG=1. Set SCSEDASH_METRICS=0 to disable recording.
+'''
+import os
+import time
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+
+
+enabled = os.environ.get('SCSEDASH_METRICS', '1') != '0'
+# The debug panel also measures the payload of every chart, which serializes it twice
+debug = os.environ.get('SCSEDASH_DEBUG', '0') == '1'
+metrics_port = int(os.environ.get('SCSEDASH_METRICS_PORT', '0'))
+
+logger = logging.getLogger('scsedash.metrics')
+
+_lock = threading.Lock()
+# span name -> [count, total seconds, max seconds]
+_spans = {}
+# (counter name, sorted label items) -> value
+_counters = {}
+# Spans of the script run of the current thread as (name, seconds, depth)
+_local = threading.local()
+_server = None
+
+
+def _trace():
+    if not hasattr(_local, 'trace'):
+        _local.trace = []
+        _local.depth = 0
+    return _local
+
+
+def start_run():
+    '''
+    Start the trace of a new script run in this thread
+    '''
+    local = _trace()
+    local.trace = []
+    local.depth = 0
+
+
+def run_trace():
+    return list(_trace().trace)
+
+
+@contextmanager
+def span(name):
+    if not enabled:
+        yield
+        return
+    local = _trace()
+    entry = [name, 0.0, local.depth]
+    local.trace.append(entry)
+    local.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        local.depth -= 1
+        entry[1] = elapsed
+        with _lock:
+            stats = _spans.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+
+def timed(function=None, name=None):
+    '''
+    Decorator recording every call of a function as a span named module.function
+    '''
+    def decorate(function):
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    return decorate(function) if function is not None else decorate
+
+
+def count(name, value=1, **labels):
+    if not enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def cache_access(cache, hit):
+    count('cache_requests', cache=cache, result='hit' if hit else 'miss')
+
+
+def payload(element, size):
+    count('payload_bytes', size, element=element)
+    count('payload_elements', element=element)
+
+
+def plotly_chart(fig, **kwargs):
+    '''
+    st.plotly_chart, timed, with the size of the figure counted in debug mode
+    '''
+    import streamlit as st
+
+    if enabled and debug:
+        payload('plotly_chart', len(fig.to_json()))
+    with span('st.plotly_chart'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def snapshot():
+    with _lock:
+        return {name: tuple(stats) for name, stats in _spans.items()}, dict(_counters)
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def _labels(items):
+    return ','.join(f'{key}="{value}"' for key, value in items)
+
+
+def prometheus_text():
+    '''
+    Get all metrics in the Prometheus text exposition format
+    '''
+    spans, counters = snapshot()
+    lines = ['# TYPE scsedash_span_seconds summary']
+    for name, (calls, total, _) in sorted(spans.items()):
+        lines.append(f'scsedash_span_seconds_count{{span="{name}"}} {calls}')
+        lines.append(f'scsedash_span_seconds_sum{{span="{name}"}} {total:.6f}')
+    lines.append('# TYPE scsedash_span_seconds_max gauge')
+    for name, (_, _, longest) in sorted(spans.items()):
+        lines.append(f'scsedash_span_seconds_max{{span="{name}"}} {longest:.6f}')
+    names = sorted({name for name, _ in counters})
+    for counter in names:
+        lines.append(f'# TYPE scsedash_{counter}_total counter')
+        for (name, labels), value in sorted(counters.items()):
+            if name == counter:
+                lines.append(f'scsedash_{name}_total{{{_labels(labels)}}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def log_metrics(level=logging.INFO):
+    logger.log(level, "Metrics:\n%s", prometheus_text())
+
+
+def start_metrics_server(port=None):
+    '''
+    Serve prometheus_text() on http://0.0.0.0:port/metrics from a daemon thread, once per process
+    '''
+    global _server
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    port = port or metrics_port
+    with _lock:
+        if _server is not None or not port:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+        except OSError as error:
+            # Already served by another process, e.g. a second Streamlit worker
+            logger.warning("Metrics server not started on port %d: %s", port, error)
+            return None
+        threading.Thread(target=_server.serve_forever, name='scsedash-metrics', daemon=True).start()
+        return _server
+
+
+def render_debug_panel():
+    '''
+    Show the spans of the current run and the process totals in the sidebar
+    '''
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Debug: performance", expanded=False):
+        trace = run_trace()
+        st.markdown("**This run**")
+        st.dataframe(pd.DataFrame([(' ' * 2 * depth + name, round(seconds * 1000, 2)) for name, seconds, depth in trace],
+                                  columns=['span', 'ms']), use_container_width=True, hide_index=True)
+        spans, counters = snapshot()
+        st.markdown("**Since start**")
+        st.dataframe(pd.DataFrame([(name, calls, round(total * 1000, 2), round(longest * 1000, 2))
+                                   for name, (calls, total, longest) in spans.items()],
+                                  columns=['span', 'calls', 'total ms', 'max ms']).sort_values('total ms', ascending=False),
+                     use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame([(name, _labels(labels), value) for (name, labels), value in sorted(counters.items())],
+                                  columns=['counter', 'labels', 'value']), use_container_width=True, hide_index=True)
+        st.download_button("Download metrics", prometheus_text(), file_name='metrics.txt')
@@ -0,0 +1,113 @@
+'''
+In-memory inverted index of the research keywords of the professors.
+
+Every keyword maps to a bitset (a Python int) of professor ids, so AND/OR/NOT
+queries and per-keyword result counts are a few integer operations.
+'''
+import threading
+
+import data_store
+from repository import get_repository
+
+
+_lock = threading.Lock()
+# (keywords entries, research areas, KeywordIndex); the source objects identify
+# the versions the index was built from
+_index = None
+
+
+class KeywordIndex:
+    def __init__(self, entries, research_areas=None):
+        self.names = []
+        self.ids = {}
+        self.postings = {}
+        for entry in entries:
+            bits = 0
+            for name in entry['names']:
+                if name not in self.ids:
+                    self.ids[name] = len(self.names)
+                    self.names.append(name)
+                bits |= 1 << self.ids[name]
+            self.postings[entry['keyword']] = self.postings.get(entry['keyword'], 0) | bits
+        self.all = (1 << len(self.names)) - 1
+
+        # A broad area matches the professors of any of its keywords
+        self.areas = {}
+        for area, keywords in (research_areas or {}).items():
+            bits = 0
+            for keyword in keywords:
+                bits |= self.postings.get(keyword, 0)
+            self.areas[area] = bits
+
+    def keywords(self):
+        return list(self.postings)
+
+    def query(self, keywords=(), areas=(), match='any', exclude=()):
+        '''
+        Get the bitset of the professors matching any (match='any') or all (match='all')
+        of the keywords and broad areas, without the excluded keywords.
+        Without keywords or areas every professor matches.
+        '''
+        terms = [self.postings.get(keyword, 0) for keyword in keywords] + [self.areas.get(area, 0) for area in areas]
+        if not terms:
+            bits = self.all
+        elif match == 'all':
+            bits = self.all
+            for term in terms:
+                bits &= term
+        else:
+            bits = 0
+            for term in terms:
+                bits |= term
+        for keyword in exclude:
+            bits &= ~self.postings.get(keyword, 0)
+        return bits
+
+    def names_of(self, bits):
+        '''
+        Get the names of the professors in a bitset, in id order
+        '''
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def bits_of(self, names):
+        '''
+        Get the bitset of the given professors, ignoring unknown names
+        '''
+        bits = 0
+        for name in names:
+            if name in self.ids:
+                bits |= 1 << self.ids[name]
+        return bits
+
+    def count(self, bits):
+        return bin(bits).count('1')
+
+    def facet_counts(self, bits):
+        '''
+        Get the number of professors of a bitset having each keyword, for the keywords with any
+        '''
+        counts = {}
+        for keyword, posting in self.postings.items():
+            count = self.count(posting & bits)
+            if count:
+                counts[keyword] = count
+        return counts
+
+
+def get_keyword_index():
+    '''
+    Get the index of the keywords served by the storage backend, rebuilt when they or
+    research_areas.json change
+    '''
+    global _index
+    entries = get_repository().get_keyword_entries()
+    areas = data_store.get_research_areas()
+    with _lock:
+        if _index is None or _index[0] is not entries or _index[1] is not areas:
+            _index = (entries, areas, KeywordIndex(entries, areas))
+        return _index[2]
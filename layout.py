@@ -0,0 +1,98 @@
+import os
+
+import streamlit as st
+
+
+# In lazy mode only the active tab runs its data loads and figure construction.
+# Set SCSEDASH_LAZY=0 to render every tab with st.tabs as before.
+lazy_rendering = os.environ.get('SCSEDASH_LAZY', '1') != '0'
+# Number of items rendered per page of a paginated list; 0 renders whole lists on one page
+page_size = int(os.environ.get('SCSEDASH_PAGE_SIZE', '20'))
+
+# Session state keys keeping the last value of a widget, and the default it was last
+# created with, are these prefixes and the widget key
+_kept_prefix = '_kept_'
+_default_prefix = '_kept_default_'
+
+
+def kept(key, default):
+    '''
+    Get the default of the widget key: its last value, or default if it was never rendered.
+    Streamlit drops the state of the widgets left out of a run, which in lazy mode are
+    the widgets of the inactive tabs. Widgets under a tab therefore record their value
+    under a non-widget key with keep and get it back as their default when they are
+    created again. While a widget stays rendered its default does not change, as the
+    default is part of the widget identity.
+    '''
+    if key not in st.session_state:
+        st.session_state[_default_prefix + key] = st.session_state.get(_kept_prefix + key, default)
+    return st.session_state.get(_default_prefix + key, default)
+
+
+def keep(key, value):
+    '''
+    Record the value of the widget key for kept, and return it
+    '''
+    st.session_state[_kept_prefix + key] = value
+    return value
+
+
+def kept_index(key, options):
+    '''
+    Get the index default of the selectbox or radio key: the position of its last value in options, or 0
+    '''
+    options = list(options)
+    value = kept(key, None)
+    return options.index(value) if value in options else 0
+
+
+def kept_range(key, low, high):
+    '''
+    Get the default of the range slider key: its last range within [low, high], or the whole range
+    '''
+    start, end = kept(key, (low, high))
+    start, end = max(low, min(start, high)), min(high, max(end, low))
+    return (start, end) if start <= end else (low, high)
+
+
+def render_tabs(tabs, key):
+    '''
+    Render a dict of tab label -> render function.
+    st.tabs executes the body of every tab on each rerun, so in lazy mode the tab
+    bar is a horizontal radio and only the selected tab's function is called.
+    '''
+    labels = list(tabs)
+    if not lazy_rendering:
+        for container, label in zip(st.tabs(labels), labels):
+            with container:
+                tabs[label]()
+        return
+
+    active = keep(key, st.radio(key, labels, index=kept_index(key, labels), horizontal=True, key=key,
+                                label_visibility='collapsed'))
+    tabs[active]()
+
+
+def paginate(count, key, size=None):
+    '''
+    Render the page selector of a list of count items and get the (start, end)
+    range of the items on the current page (all of them if pagination is off)
+    '''
+    size = size if size is not None else page_size
+    if size <= 0:
+        st.caption(f"Showing all {count}")
+        return 0, count
+    pages = max(1, -(-count // size))
+    # A narrower search may leave the last page out of range. The page count is part
+    # of the widget identity, so the widget also starts over from this default then.
+    page = kept(key, 1)
+    page = page if page <= pages else 1
+    left, right = st.columns([1, 3])
+    with left:
+        page = keep(key, st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=page,
+                                         step=1, key=key))
+    start = (page - 1) * size
+    end = min(start + size, count)
+    with right:
+        st.caption(f"Showing {start + 1 if count else 0}-{end} of {count}")
+    return start, end
@@ -0,0 +1,192 @@
+import os
+import re
+import json
+
+import numpy as np
+from scipy import sparse
+
+
+# Unresolved names with an indexed name at least this trigram-similar are proposed
+# as aliases for review; proposals are never accepted automatically
+proposal_similarity = 0.6
+max_candidates = 3
+
+_dblp_suffix = re.compile(r'\s+\d{4}$')
+_non_letters = re.compile(r'[^a-z\s]+')
+
+
+def name_tokens(name):
+    '''
+    Get the tokens of a name in order, without the DBLP disambiguation suffix
+    ("Lei Wei 0002"), punctuation and case
+    '''
+    name = _dblp_suffix.sub('', name.strip()).lower()
+    return _non_letters.sub(' ', name).split()
+
+
+def normalize_name(name):
+    '''
+    Normalize a name for matching: its tokens, sorted
+    '''
+    return ' '.join(sorted(name_tokens(name)))
+
+
+def _trigrams(name):
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _orientations(tokens):
+    '''
+    The name tokens given name first: as written, and with a leading surname moved to the end
+    '''
+    yield tokens
+    if len(tokens) > 2:
+        yield tokens[1:] + tokens[:1]
+
+
+def _middle_names_match(query, name):
+    '''
+    Whether every middle token of the query is, in order, a middle name of name or its initial
+    '''
+    names = iter(name)
+    return all(any(token == candidate or (len(token) == 1 and candidate.startswith(token)) for candidate in names)
+               for token in query)
+
+
+class NameIndex:
+    '''
+    Index over a fixed list of names.
+    Names are looked up exactly by their token set, or by given name and surname
+    when the middle names are initials or left out ("Douglas L. Maskell") or the
+    given name is written as one word.
+    For the other names, the trigrams of the names give similar names in one
+    sparse matrix product (trigram overlap of every query with every indexed name).
+    '''
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.normalized = [normalize_name(name) for name in self.names]
+        self.exact = {}
+        for i, normalized in enumerate(self.normalized):
+            self.exact.setdefault(normalized, []).append(i)
+        # (given name, surname) -> [(index, middle names)]; a given name of several
+        # tokens is also indexed as one word ("Chunyan Miao" for "Miao Chun Yan")
+        self.given_and_surname = {}
+        for i, name in enumerate(self.names):
+            for tokens in _orientations(name_tokens(name)):
+                if len(tokens) >= 2:
+                    self.given_and_surname.setdefault((tokens[0], tokens[-1]), []).append((i, tokens[1:-1]))
+                if len(tokens) >= 3:
+                    self.given_and_surname.setdefault((''.join(tokens[:-1]), tokens[-1]), []).append((i, []))
+        self.vocabulary = {}
+        self.matrix = self._encode(self.normalized, grow=True)
+        self.sizes = np.asarray(self.matrix.sum(axis=1)).ravel()
+
+    def match(self, name):
+        '''
+        Get the indexed name that name unambiguously refers to, or None
+        '''
+        exact = self.exact.get(normalize_name(name), [])
+        if len(exact) == 1:
+            return self.names[exact[0]]
+        if exact:
+            return None
+        tokens = name_tokens(name)
+        if len(tokens) < 2 or len(tokens[0]) == 1 or len(tokens[-1]) == 1:
+            return None
+        matches = {i for i, middle in self.given_and_surname.get((tokens[0], tokens[-1]), ())
+                   if _middle_names_match(tokens[1:-1], middle)}
+        return self.names[matches.pop()] if len(matches) == 1 else None
+
+    def _encode(self, normalized_names, grow=False):
+        rows, cols = [], []
+        for row, name in enumerate(normalized_names):
+            for trigram in _trigrams(name):
+                col = self.vocabulary.get(trigram)
+                if col is None:
+                    if not grow:
+                        continue
+                    col = self.vocabulary[trigram] = len(self.vocabulary)
+                rows.append(row)
+                cols.append(col)
+        data = np.ones(len(rows), dtype=np.float32)
+        return sparse.csr_matrix((data, (rows, cols)),
+                                 shape=(len(normalized_names), max(len(self.vocabulary), 1)))
+
+    def similar(self, queries, min_similarity=proposal_similarity):
+        '''
+        Get, for every query, up to max_candidates (index, similarity) pairs ordered
+        by trigram Dice similarity, scored for all queries at once
+        '''
+        normalized = [normalize_name(query) for query in queries]
+        encoded = self._encode(normalized)
+        query_sizes = np.array([len(_trigrams(name)) for name in normalized], dtype=np.float32)
+        overlap = (encoded @ self.matrix.T).tocoo()
+        similarity = 2 * overlap.data / (query_sizes[overlap.row] + self.sizes[overlap.col])
+        keep = similarity >= min_similarity
+        rows, cols, similarity = overlap.row[keep], overlap.col[keep], similarity[keep]
+        # By query, then by decreasing similarity
+        order = np.lexsort((-similarity, rows))
+        rows, cols, similarity = rows[order], cols[order], similarity[order]
+        starts = np.searchsorted(rows, np.arange(len(queries) + 1))
+        return [list(zip(cols[start:min(end, start + max_candidates)].tolist(),
+                         similarity[start:min(end, start + max_candidates)].tolist()))
+                for start, end in zip(starts[:-1], starts[1:])]
+
+
+class NameResolver:
+    '''
+    Resolves DBLP coauthor names to SCSE professor names.
+    Only unambiguous matches of the NameIndex are accepted. The reviewed alias
+    table (edited by hand, never written by the build) maps further names to a
+    professor, or to null to reject a match. Similar professors of the names
+    left unresolved are collected as proposals to review in the alias table.
+    '''
+
+    def __init__(self, professors, alias_path=None, proposals_path=None):
+        self.index = NameIndex(professors)
+        self.alias_path = alias_path
+        self.proposals_path = proposals_path
+        self.aliases = {}
+        if alias_path and os.path.exists(alias_path):
+            with open(alias_path, 'r') as f:
+                self.aliases = json.load(f).get('aliases', {})
+        self.proposals = {}
+        self._resolved = {}
+
+    def resolve_many(self, names):
+        '''
+        Get the SCSE professor name of every name, or None if there is no match
+        '''
+        pending = []
+        for name in dict.fromkeys(names):
+            if name in self._resolved:
+                continue
+            if name in self.aliases:
+                self._resolved[name] = self.aliases[name]
+                continue
+            match = self.index.match(name)
+            self._resolved[name] = match
+            if match is None:
+                pending.append(name)
+
+        if pending:
+            for name, candidates in zip(pending, self.index.similar(pending)):
+                if candidates:
+                    self.proposals[name] = [[self.index.names[i], round(similarity, 3)]
+                                            for i, similarity in candidates]
+        return [self._resolved[name] for name in names]
+
+    def resolve(self, name):
+        return self.resolve_many([name])[0]
+
+    def save(self):
+        '''
+        Write the alias proposals for review
+        '''
+        if not self.proposals_path:
+            return
+        with open(self.proposals_path + '.tmp', 'w') as f:
+            json.dump(dict(sorted(self.proposals.items())), f, indent=4)
+        os.replace(self.proposals_path + '.tmp', self.proposals_path)
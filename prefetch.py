@@ -0,0 +1,202 @@
+'''
+Concurrent and speculative prefetch of professor pages.
+
+When a professor is selected, every load of their page (profile, publication
+table, CORE rank counts, word cloud, network figure, similar professors) is
+started at once on a thread pool, so the page waits for the slowest load rather
+than for their sum, and then renders from the warm caches. The likely next
+selections (the neighbours in the professor list and the top SCSE coauthors) are
+then warmed on a single low-priority worker. Set SCSEDASH_PREFETCH=0 to disable.
+'''
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+from cachetools import TTLCache
+
+from instrumentation import span, count
+
+
+enabled = os.environ.get('SCSEDASH_PREFETCH', '1') != '0'
+workers = int(os.environ.get('SCSEDASH_PREFETCH_WORKERS', '4'))
+# Neighbours in the professor list on each side and top coauthors warmed speculatively
+speculative_neighbours = 1
+speculative_coauthors = 2
+# Speculative loads queued beyond this are dropped
+speculative_limit = 8
+# Seconds during which a warmed page is not warmed again
+speculative_ttl = 60
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+_speculative = None
+# name -> futures of the loads of the page of the professor
+_pending = {}
+# names queued on the speculative worker
+_queued = set()
+# (name, layout) of the pages warmed recently
+_warmed = TTLCache(maxsize=256, ttl=speculative_ttl)
+
+
+def _executors():
+    global _executor, _speculative
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scsedash-prefetch')
+            _speculative = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scsedash-speculative')
+        return _executor, _speculative
+
+
+def _run(label, function):
+    try:
+        with span(f'prefetch.{label}'):
+            function()
+    except Exception as error:
+        # The page loads it again and reports the error
+        logger.warning("Prefetch of %s failed: %s", label, error)
+
+
+def _word_cloud(name, profile):
+    from wordcloud_cache import word_cloud_png
+
+    # The default year range of the word cloud slider
+    years = [int(year) for year in (profile['publications'] or {})]
+    if years:
+        word_cloud_png(name, min(years), max(years))
+
+
+def _independent_loads(name, layout):
+    '''
+    (label, function) pairs of the loads that do not need the profile
+    '''
+    from core_ranking import get_conference_counts
+    from similarity import get_similarity_index
+    from graph_figures import individual_graph_json
+
+    return [
+        ('conference_counts', lambda: get_conference_counts(name)),
+        ('similar_professors', lambda: get_similarity_index().similar(name)),
+        ('individual_graph', lambda: individual_graph_json(name, layout)),
+    ]
+
+
+def _profile_loads(name, profile):
+    '''
+    (label, function) pairs of the loads built from the profile
+    '''
+    from publication_store import get_publications
+
+    return [
+        ('publications', lambda: get_publications(name)),
+        ('word_cloud', lambda: _word_cloud(name, profile)),
+    ]
+
+
+def _load_profile(name, executor):
+    from repository import get_repository
+
+    with span('prefetch.profile'):
+        profile = get_repository().get_profile(name)
+    futures = [executor.submit(_run, label, function) for label, function in _profile_loads(name, profile)]
+    with _lock:
+        _pending.setdefault(name, []).extend(futures)
+
+
+def prefetch(name, layout='circular'):
+    '''
+    Start every load of the page of a professor, unless they are already running
+    '''
+    if not enabled:
+        return
+    executor, _ = _executors()
+    with _lock:
+        for pending_name in [pending_name for pending_name, futures in _pending.items()
+                             if all(future.done() for future in futures)]:
+            del _pending[pending_name]
+        if name in _pending:
+            return
+        _pending[name] = []
+    count('prefetch', kind='page')
+    futures = [executor.submit(_run, label, function) for label, function in _independent_loads(name, layout)]
+    futures.append(executor.submit(_run, 'profile_loads', lambda: _load_profile(name, executor)))
+    with _lock:
+        _pending[name].extend(futures)
+
+
+def wait(name, timeout=None):
+    '''
+    Wait for the loads of the page of a professor, including the ones started by
+    the profile load
+    '''
+    while True:
+        with _lock:
+            futures = list(_pending.get(name, ()))
+        if not futures:
+            return
+        done, not_done = wait_futures(futures, timeout=timeout)
+        with _lock:
+            grown = len(_pending.get(name, ())) > len(futures)
+        if not_done or not grown:
+            return
+
+
+def _warm(name, layout, word_cloud):
+    from repository import get_repository
+    from publication_store import get_publications
+    from core_ranking import get_conference_counts
+    from graph_figures import individual_graph_json
+
+    try:
+        with span('prefetch.speculative'):
+            profile = get_repository().get_profile(name)
+            for label, function in [('publications', lambda: get_publications(name)),
+                                    ('conference_counts', lambda: get_conference_counts(name)),
+                                    ('individual_graph', lambda: individual_graph_json(name, layout))]:
+                _run(f'speculative.{label}', function)
+            if word_cloud:
+                _run('speculative.word_cloud', lambda: _word_cloud(name, profile))
+    finally:
+        with _lock:
+            _queued.discard(name)
+
+
+def speculate(names, layout='circular'):
+    '''
+    Warm the caches of the pages of the given professors, most likely first, on the
+    low-priority worker. Only the most likely page gets its word cloud rendered,
+    the most expensive load of a page.
+    '''
+    if not enabled:
+        return
+    _, speculative = _executors()
+    for position, name in enumerate(names):
+        with _lock:
+            if (name in _queued or name in _pending or (name, layout) in _warmed
+                    or len(_queued) >= speculative_limit):
+                continue
+            _queued.add(name)
+            _warmed[(name, layout)] = True
+        count('prefetch', kind='speculative')
+        speculative.submit(_warm, name, layout, position == 0)
+
+
+def likely_next(name, options):
+    '''
+    Get the professors likely to be selected after name: its neighbours in the list of
+    options and its most frequent SCSE coauthors among them
+    '''
+    from graph_index import get_scse_graph
+
+    options = list(options)
+    candidates = []
+    if name in options:
+        position = options.index(name)
+        candidates += options[position + 1:position + 1 + speculative_neighbours]
+        candidates += options[max(position - speculative_neighbours, 0):position][::-1]
+    allowed = set(options)
+    candidates += [coauthor for coauthor, _ in get_scse_graph().top_neighbours(name)
+                   if coauthor in allowed][:speculative_coauthors]
+    return [candidate for candidate in dict.fromkeys(candidates) if candidate != name]
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+import data_store
+from repository import get_repository
+
+
+columns = ['name', 'year', 'type', 'title', 'venue', 'url', 'coauthors']
+# Local export, used when the storage backend has no publications
+source = 'DBLP_publications.json'
+# Seconds before the publications of a backend that cannot report their version
+# (MongoDB) are fetched again
+refresh_interval = 600
+
+_lock = threading.Lock()
+# (backend, version, time read, PublicationStore or None) of the last backend read
+_backend_store = None
+# name -> (publications, PublicationStore) for professors missing from the store;
+# the publications object identifies the profile version
+_profile_stores = LRUCache(maxsize=256)
+
+
+def flatten_publications(records):
+    '''
+    Flatten the nested {year: {type: [paper]}} publications of professor records
+    into one row per paper
+    '''
+    rows = []
+    for record in records:
+        publications = record.get('publications')
+        if not publications:
+            continue
+        name = record['name']
+        for year, categories in publications.items():
+            year = int(year)
+            for category, papers in categories.items():
+                for paper in papers:
+                    rows.append((name, year, category, paper.get('title'), paper.get('conference_name'),
+                                 paper.get('url'), paper.get('coauthors') or []))
+    frame = pd.DataFrame(rows, columns=columns)
+    frame['year'] = frame['year'].astype('int32')
+    for column in ('name', 'type'):
+        frame[column] = frame[column].astype('category')
+    return frame
+
+
+class PublicationStore:
+    '''
+    Publications of all professors as one columnar table.
+    Rows are grouped by professor, most recent year first and in source order
+    within a year, so the publications of a professor are the row range
+    offsets[name]. Coauthors are stored as ids into coauthor_names.
+    '''
+
+    def __init__(self, frame, coauthor_names, offsets, version):
+        self.frame = frame
+        self.coauthor_names = np.asarray(coauthor_names, dtype=object)
+        self.offsets = offsets
+        self.version = version
+        self._slices = LRUCache(maxsize=256)
+
+    @classmethod
+    def from_records(cls, records, version):
+        frame = flatten_publications(records)
+        # Professors in source order, then most recent year first (lexsort is stable)
+        professors = pd.factorize(frame['name'].astype(str))[0]
+        order = np.lexsort((-frame['year'].to_numpy(), professors))
+        frame = frame.iloc[order].reset_index(drop=True)
+
+        coauthor_ids = {}
+        frame['coauthor_ids'] = [np.array([coauthor_ids.setdefault(coauthor, len(coauthor_ids))
+                                           for coauthor in coauthors], dtype=np.int32)
+                                 for coauthors in frame.pop('coauthors')]
+
+        names = frame['name'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]]) if len(names) else np.array([], int)
+        ends = np.r_[starts[1:], len(names)]
+        offsets = {names[start]: (int(start), int(end)) for start, end in zip(starts, ends)}
+        return cls(frame, list(coauthor_ids), offsets, version)
+
+    @classmethod
+    def load(cls, path):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b'scsedash'])
+        frame = table.to_pandas()
+        return cls(frame, meta['coauthor_names'], {name: tuple(rows) for name, rows in meta['offsets'].items()},
+                   meta['version'])
+
+    def save(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(self.frame, preserve_index=False)
+        meta = {'version': self.version, 'offsets': self.offsets, 'coauthor_names': self.coauthor_names.tolist()}
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b'scsedash': json.dumps(meta).encode('utf-8')})
+        pq.write_table(table, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def __contains__(self, name):
+        return name in self.offsets
+
+    def publications(self, name):
+        '''
+        Get the publications of a professor with their coauthor names, or None if there are none
+        '''
+        if name not in self.offsets:
+            return None
+        with _lock:
+            frame = self._slices.get(name)
+        if frame is None:
+            start, end = self.offsets[name]
+            frame = self.frame.iloc[start:end].copy()
+            frame['coauthors'] = [', '.join(self.coauthor_names[ids]) for ids in frame['coauthor_ids']]
+            with _lock:
+                self._slices[name] = frame
+        return frame
+
+
+def filter_publications(frame, years=None, types=None, venue=None):
+    '''
+    Select the publications in an inclusive (first, last) year range, of the given
+    types and whose venue contains a string
+    '''
+    mask = np.ones(len(frame), dtype=bool)
+    if years is not None:
+        mask &= frame['year'].between(*years).to_numpy()
+    if types is not None:
+        mask &= frame['type'].isin(types).to_numpy()
+    if venue:
+        mask &= frame['venue'].fillna('').str.contains(venue, case=False, regex=False).to_numpy()
+    return frame[mask]
+
+
+# Sort orders of a publication list: label -> (columns, ascending)
+sort_orders = {
+    'Newest first': (['year'], [False]),
+    'Oldest first': (['year'], [True]),
+    'Title': (['title', 'year'], [True, False]),
+    'Venue': (['venue', 'year'], [True, False]),
+}
+
+
+def search_publications(frame, query):
+    '''
+    Select the publications whose title, venue or coauthors contain every word of the query
+    '''
+    mask = np.ones(len(frame), dtype=bool)
+    for word in query.split():
+        word_mask = np.zeros(len(frame), dtype=bool)
+        for column in ('title', 'venue', 'coauthors'):
+            word_mask |= frame[column].fillna('').str.contains(word, case=False, regex=False).to_numpy()
+        mask &= word_mask
+    return frame[mask]
+
+
+def sort_publications(frame, order):
+    columns, ascending = sort_orders[order]
+    return frame.sort_values(columns, ascending=ascending, kind='stable', key=_sort_key)
+
+
+def _sort_key(column):
+    if column.dtype == object:
+        return column.fillna('').str.lower()
+    return column
+
+
+def _load_store(path):
+    '''
+    Load the persisted store of the publication export, rebuilding it if the export changed
+    '''
+    def records():
+        with open(path, "r") as f:
+            return json.load(f)
+
+    return _persisted_store(data_store.file_digest(path), records)
+
+
+def _persisted_store(version, load_records):
+    '''
+    Load the persisted store if it has this version, or build it from load_records() and persist it
+    '''
+    store_path = data_store.cache_path('publications.parquet')
+    if os.path.exists(store_path):
+        store = PublicationStore.load(store_path)
+        if store.version == version:
+            return store
+    store = PublicationStore.from_records(load_records(), version)
+    store.save(store_path)
+    return store
+
+
+def _load_backend_store(backend):
+    '''
+    Get the store of the publications served by the storage backend, or None if it has none.
+    The same store is returned until the publications change.
+    '''
+    global _backend_store
+    version = backend.publications_version()
+    with _lock:
+        cached = _backend_store
+    if cached is not None and cached[0] is backend:
+        if version == cached[1] or (version is None and time.monotonic() - cached[2] < refresh_interval):
+            return cached[3]
+
+    records = None
+    if version is None:
+        records = backend.fetch_all_publications()
+        version = hashlib.sha1(json.dumps(records, sort_keys=True).encode('utf-8')).hexdigest()
+    if cached is not None and cached[0] is backend and cached[1] == version:
+        store = cached[3]
+    elif version == '' or records == []:
+        store = None
+    else:
+        store = _persisted_store(version, lambda: backend.fetch_all_publications() if records is None else records)
+        if not store.offsets:
+            store = None
+    with _lock:
+        _backend_store = (backend, version, time.monotonic(), store)
+    return store
+
+
+def get_publication_store():
+    '''
+    Get the store of all publications of the storage backend, falling back to the
+    local export when the backend has none, or None if there are no publications
+    '''
+    store = _load_backend_store(get_repository().backend)
+    if store is not None:
+        return store
+    path = data_store.data_path(source)
+    if not os.path.exists(path):
+        return None
+    return data_store.cached_load(path, _load_store)
+
+
+def get_publications(name):
+    '''
+    Get the publications of a professor as a table, or None if there are none
+    '''
+    store = get_publication_store()
+    if store is not None and name in store:
+        return store.publications(name)
+
+    # Not in the store, flatten the profile served by the repository
+    publications = get_repository().get_profile(name)["publications"]
+    if not publications:
+        return None
+    with _lock:
+        entry = _profile_stores.get(name)
+    if entry is None or entry[0] is not publications:
+        entry = (publications, PublicationStore.from_records([{'name': name, 'publications': publications}], None))
+        with _lock:
+            _profile_stores[name] = entry
+    return entry[1].publications(name)
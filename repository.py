@@ -0,0 +1,142 @@
+import os
+import threading
+
+from cachetools import TTLCache
+
+from backends import MongoBackend, SQLiteBackend
+from instrumentation import cache_access
+
+
+conn_str = os.environ.get('SCSEDASH_MONGO_URI', "") #mongoDB connection string
+database_name = 'scsedash'
+
+# 'mongo' queries the MongoDB database, 'local' serves the exports in data/ from
+# an embedded SQLite file. Without a connection string the local backend is used.
+backend_name = os.environ.get('SCSEDASH_BACKEND') or ('mongo' if conn_str else 'local')
+
+# One pooled client is shared by every session served from this process
+client_settings = {
+    'serverSelectionTimeoutMS': 5000,
+    'maxPoolSize': 20,
+    'minPoolSize': 2,
+    'maxIdleTimeMS': 60000,
+}
+
+# Memoized query results, bounded both in size (LRU) and in age (TTL)
+cache_size = 256
+cache_ttl = 600  # seconds
+
+_client = None
+_repository = None
+_lock = threading.Lock()
+
+
+def get_client():
+    '''
+    Get the process-wide pooled MongoClient
+    '''
+    global _client
+    if _client is None:
+        import pymongo
+        with _lock:
+            if _client is None:
+                _client = pymongo.MongoClient(conn_str, **client_settings)
+    return _client
+
+
+def get_backend(name=None):
+    '''
+    Create the storage backend selected by name (defaults to backend_name)
+    '''
+    name = name or backend_name
+    if name == 'mongo':
+        return MongoBackend(get_client()[database_name])
+    if name == 'local':
+        return SQLiteBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_repository():
+    '''
+    Get the process-wide ProfessorRepository
+    '''
+    global _repository
+    if _repository is None:
+        repository = ProfessorRepository(get_backend())
+        with _lock:
+            if _repository is None:
+                _repository = repository
+    return _repository
+
+
+class ProfessorRepository:
+    '''
+    Batched and memoized access to the professor data of a StorageBackend.
+    Everything shown on a professor page is fetched with a single backend call,
+    and several professors can be fetched together.
+    '''
+
+    def __init__(self, backend, maxsize=cache_size, ttl=cache_ttl):
+        self.backend = backend
+        self._profiles = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._queries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Last keyword documents fetched, returned again when a new fetch finds them unchanged
+        self._keyword_entries = None
+        self._lock = threading.Lock()
+
+    def _cache_get(self, cache, key):
+        with self._lock:
+            return cache.get(key)
+
+    def _cache_set(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+
+    def get_profiles(self, names):
+        '''
+        Get the profiles of several professors, querying only the ones not cached yet
+        '''
+        result = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            profile = self._cache_get(self._profiles, name)
+            cache_access('profiles', profile is not None)
+            if profile is None:
+                missing.append(name)
+            else:
+                result[name] = profile
+        if missing:
+            fetched = self.backend.fetch_profiles(missing)
+            for name, profile in fetched.items():
+                self._cache_set(self._profiles, name, profile)
+            result.update(fetched)
+        return result
+
+    def get_profile(self, name):
+        '''
+        Get keywords, publications and number of contributions of a professor
+        '''
+        return self.get_profiles([name])[name]
+
+    def get_keyword_entries(self):
+        '''
+        Get the {"keyword", "names"} documents of every research keyword.
+        The same list is returned while they are unchanged, so the indexes built
+        from it can be kept by identity.
+        '''
+        key = ("keywords", self.backend.keywords_version())
+        result = self._cache_get(self._queries, key)
+        cache_access('queries', result is not None)
+        if result is None:
+            result = self.backend.fetch_keyword_entries()
+            with self._lock:
+                if result == self._keyword_entries:
+                    result = self._keyword_entries
+                self._keyword_entries = result
+            self._cache_set(self._queries, key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+            self._queries.clear()
@@ -0,0 +1,241 @@
+'''
+Full-text search over the professors (biography and keywords) and their paper titles.
+
+Documents are tokenized into a BM25 inverted index persisted under data/cache.
+When the sources change only the added, changed and removed documents are
+reindexed.
+'''
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+
+import data_store
+from repository import get_repository
+from publication_store import get_publication_store
+
+
+k1 = 1.2
+b = 0.75
+snippet_length = 240
+
+stopwords = frozenset('''
+a an and are as at be by for from has have he her his in is it its of on or our
+she that the their this to was were which with
+'''.split())
+
+_token = re.compile(r'[a-z0-9]+')
+
+_lock = threading.Lock()
+# (sources, SearchIndex); the source objects identify the file versions the
+# index was last updated from
+_index = None
+
+
+def tokenize(text):
+    return [token for token in _token.findall(text.lower()) if token not in stopwords]
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class BM25Index:
+    '''
+    Inverted index of term -> {document key: term frequency} scored with Okapi BM25.
+    Documents can be added and removed one by one; the collection statistics are
+    kept up to date so no rebuild is needed.
+    '''
+
+    def __init__(self):
+        self.postings = {}
+        # key -> (length, content digest, distinct terms)
+        self.documents = {}
+        self.total_length = 0
+
+    def add(self, key, text):
+        if key in self.documents:
+            self.remove(key)
+        tokens = tokenize(text)
+        frequencies = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for token, count in frequencies.items():
+            self.postings.setdefault(token, {})[key] = count
+        self.documents[key] = (len(tokens), _digest(text), list(frequencies))
+        self.total_length += len(tokens)
+
+    def remove(self, key):
+        length, _, terms = self.documents.pop(key)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= length
+
+    def update(self, documents):
+        '''
+        Bring the index up to date with a dict of key -> text and get the number of documents reindexed
+        '''
+        removed = [key for key in self.documents if key not in documents]
+        for key in removed:
+            self.remove(key)
+        changed = 0
+        for key, text in documents.items():
+            document = self.documents.get(key)
+            if document is None or document[1] != _digest(text):
+                self.add(key, text)
+                changed += 1
+        return changed + len(removed)
+
+    def search(self, query, limit=10):
+        '''
+        Get the best (key, score) pairs for a query
+        '''
+        if not self.documents:
+            return []
+        count = len(self.documents)
+        average_length = self.total_length / count or 1
+        scores = {}
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                norm = k1 * (1 - b + b * self.documents[key][0] / average_length)
+                scores[key] = scores.get(key, 0) + idf * frequency * (k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+
+    def to_json(self):
+        return {'postings': self.postings, 'documents': self.documents}
+
+    @classmethod
+    def from_json(cls, value):
+        index = cls()
+        index.postings = value['postings']
+        index.documents = {key: tuple(document) for key, document in value['documents'].items()}
+        index.total_length = sum(document[0] for document in index.documents.values())
+        return index
+
+
+def highlight(text, query, length=None):
+    '''
+    Bold the query terms in a text for st.markdown, optionally cutting it to a
+    snippet of about length characters around the first match
+    '''
+    terms = [re.escape(term) for term in dict.fromkeys(tokenize(query))]
+    if not terms:
+        return text[:length] if length else text
+    pattern = re.compile(r'\b(' + '|'.join(terms) + r')\b', re.IGNORECASE)
+    if length and len(text) > length:
+        match = pattern.search(text)
+        start = max(0, (match.start() if match else 0) - length // 4)
+        end = start + length
+        text = ('...' if start else '') + text[start:end] + ('...' if end < len(text) else '')
+    return pattern.sub(lambda match: f"**{match.group(0)}**", text)
+
+
+class SearchIndex:
+    '''
+    Professor and paper indexes with the fields needed to display the results
+    '''
+
+    def __init__(self, professors=None, papers=None, paper_fields=None):
+        self.professors = professors or BM25Index()
+        self.papers = papers or BM25Index()
+        # paper key (publication store row) -> (name, year, title, venue, url)
+        self.paper_fields = paper_fields or {}
+        self.biographies = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            value = json.load(f)
+        return cls(BM25Index.from_json(value['professors']), BM25Index.from_json(value['papers']),
+                   value['paper_fields'])
+
+    def save(self, path):
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'professors': self.professors.to_json(), 'papers': self.papers.to_json(),
+                       'paper_fields': self.paper_fields}, f)
+        os.replace(path + '.tmp', path)
+
+    def update(self, professors, papers):
+        '''
+        Update the index from name -> (biography, keywords) and paper key -> fields,
+        and get the number of documents reindexed
+        '''
+        self.biographies = {name: biography for name, (biography, _) in professors.items()}
+        self.paper_fields = papers
+        return (self.professors.update({name: f"{biography}\n{' '.join(keywords)}"
+                                        for name, (biography, keywords) in professors.items()})
+                + self.papers.update({key: fields[2] for key, fields in papers.items()}))
+
+    def search_professors(self, query, limit=10):
+        '''
+        Get the best matching professors as (name, score, highlighted biography snippet)
+        '''
+        return [(name, score, highlight(self.biographies.get(name, ''), query, snippet_length))
+                for name, score in self.professors.search(query, limit)]
+
+    def search_papers(self, query, limit=10):
+        '''
+        Get the best matching papers as dicts with a highlighted title
+        '''
+        results = []
+        for key, score in self.papers.search(query, limit):
+            name, year, title, venue, url = self.paper_fields[key]
+            results.append({'name': name, 'year': year, 'title': highlight(title, query), 'venue': venue,
+                            'url': url, 'score': score})
+        return results
+
+
+def _professor_documents():
+    keywords = {}
+    for entry in get_repository().get_keyword_entries():
+        for name in entry['names']:
+            keywords.setdefault(name, []).append(entry['keyword'])
+    documents = {}
+    for record in data_store.get_professors_table().to_dict('records'):
+        biography = record.get('biography')
+        biography = biography if isinstance(biography, str) else ''
+        documents[record['Full Name']] = (biography, keywords.get(record['Full Name'], []))
+    return documents
+
+
+def _paper_documents(store):
+    if store is None:
+        return {}
+    frame = store.frame
+    documents = {}
+    # Keyed by row of the publication store: distinct papers may share a title
+    # and have no URL. Rows shifted by a new store version are reindexed.
+    for row, (name, year, title, venue, url) in enumerate(zip(frame['name'].astype(str), frame['year'].tolist(),
+                                                              frame['title'], frame['venue'], frame['url'])):
+        if title:
+            documents[str(row)] = (name, year, title, venue, url)
+    return documents
+
+
+def get_search_index():
+    '''
+    Get the search index, updated and saved when the professors, keywords or publications changed
+    '''
+    global _index
+    sources = (data_store.get_professors_table(), get_repository().get_keyword_entries(), get_publication_store())
+    with _lock:
+        if _index is not None and all(a is b for a, b in zip(_index[0], sources)):
+            return _index[1]
+        path = data_store.cache_path('search_index.json')
+        index = _index[1] if _index is not None else None
+        if index is None and os.path.exists(path):
+            index = SearchIndex.load(path)
+        index = index or SearchIndex()
+        if index.update(_professor_documents(), _paper_documents(sources[2])):
+            index.save(path)
+        _index = (sources, index)
+        return index
@@ -0,0 +1,153 @@
+'''
+Similar professor recommendations.
+
+Every professor is a TF-IDF vector over their research keywords, biography and
+paper titles. The cosine similarities of all pairs are one sparse matrix
+product, of which only the top neighbours of every professor are kept.
+The index is a build artifact in data/cache, rebuilt by python build.py when
+the professors, keywords or publications change.
+'''
+import os
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+import data_store
+from repository import get_repository
+from publication_store import get_publication_store
+
+
+neighbour_count = 10
+# Relative weight of every field in the professor vectors
+field_weights = {'keywords': 1.0, 'biography': 0.7, 'titles': 1.0}
+
+# Built by build.py; see get_similarity_index
+index_file = 'similar_professors.npz'
+
+_lock = threading.Lock()
+
+
+class SimilarityIndex:
+    '''
+    Top neighbours of every professor by decreasing cosine similarity
+    '''
+
+    def __init__(self, names, neighbours, scores, version):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.neighbours = neighbours
+        self.scores = scores
+        self.version = version
+
+    @classmethod
+    def from_documents(cls, documents, version, k=neighbour_count):
+        '''
+        Build the index from name -> {field: text} documents
+        '''
+        from scipy import sparse
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+
+        names = list(documents)
+        blocks = []
+        for field, weight in field_weights.items():
+            texts = [documents[name].get(field, '') for name in names]
+            if not any(texts):
+                continue
+            vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, min_df=1)
+            try:
+                blocks.append(vectorizer.fit_transform(texts) * weight)
+            except ValueError:
+                # Only stop words in this field
+                continue
+        matrix = normalize(sparse.hstack(blocks).tocsr()) if blocks else sparse.csr_matrix((len(names), 1))
+
+        # All pairwise cosine similarities in one product
+        similarities = (matrix @ matrix.T).tocsr()
+        similarities.setdiag(0)
+        similarities.eliminate_zeros()
+
+        k = min(k, max(len(names) - 1, 0))
+        neighbours = np.full((len(names), k), -1, dtype=np.int32)
+        scores = np.zeros((len(names), k), dtype=np.float32)
+        for row in range(len(names)):
+            start, end = similarities.indptr[row], similarities.indptr[row + 1]
+            indices, values = similarities.indices[start:end], similarities.data[start:end]
+            best = np.argsort(-values, kind='stable')[:k]
+            neighbours[row, :len(best)] = indices[best]
+            scores[row, :len(best)] = values[best]
+        return cls(names, neighbours, scores, version)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            return cls(f['names'].tolist(), f['neighbours'], f['scores'], str(f['version']))
+
+    def save(self, path):
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, names=np.array(self.names, dtype=str), neighbours=self.neighbours,
+                 scores=self.scores, version=np.array(self.version))
+        os.replace(tmp_path, path)
+
+    def similar(self, name, k=5):
+        '''
+        Get the k most similar professors of a professor as (name, similarity) pairs
+        '''
+        if name not in self.ids:
+            return []
+        row = self.ids[name]
+        return [(self.names[i], float(score))
+                for i, score in zip(self.neighbours[row, :k], self.scores[row, :k]) if i >= 0 and score > 0]
+
+
+def _documents(professors, keywords_and_names, store):
+    documents = {name: {'keywords': [], 'biography': '', 'titles': []} for name in professors['Full Name']}
+    for name, biography in zip(professors['Full Name'], professors['biography']):
+        documents[name]['biography'] = biography if isinstance(biography, str) else ''
+    for entry in keywords_and_names:
+        for name in entry['names']:
+            if name in documents:
+                documents[name]['keywords'].append(entry['keyword'])
+    if store is not None:
+        titles = store.frame['title']
+        for name, (start, end) in store.offsets.items():
+            if name in documents:
+                documents[name]['titles'] = titles.iloc[start:end].dropna().tolist()
+    return {name: {'keywords': ' '.join(document['keywords']), 'biography': document['biography'],
+                   'titles': ' '.join(document['titles'])}
+            for name, document in documents.items()}
+
+
+def build_similarity_index(professors, keywords_and_names, store, version):
+    '''
+    Build the index of the professors table, the keyword documents and the publication store
+    '''
+    return SimilarityIndex.from_documents(_documents(professors, keywords_and_names, store), version)
+
+
+def get_similarity_index():
+    '''
+    Get the similarity index built by build.py, reloaded whenever it is rebuilt.
+    Before the first build it is computed from the served data and saved in its place.
+    '''
+    path = data_store.cache_path(index_file)
+    if not os.path.exists(path):
+        with _lock:
+            if not os.path.exists(path):
+                sources = (data_store.get_professors_table(), get_repository().get_keyword_entries(),
+                           get_publication_store())
+                digests = [data_store.file_digest(data_store.data_path('professors_new.csv')),
+                           hashlib.sha1(json.dumps(sources[1], sort_keys=True).encode('utf-8')).hexdigest(),
+                           sources[2].version if sources[2] is not None else '']
+                build_similarity_index(*sources, index_version(digests)).save(path)
+    return data_store.cached_load(path, SimilarityIndex.load)
+
+
+def index_version(digests):
+    '''
+    Version of an index built from sources with these digests and the current settings
+    '''
+    digests = [*digests, repr(field_weights), str(neighbour_count)]
+    return hashlib.sha1(' '.join(digests).encode('utf-8')).hexdigest()
@@ -0,0 +1,26 @@
+import os
+import sys
+import shutil
+
+import pytest
+
+# The dashboard modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+@pytest.fixture
+def committed_data(tmp_path, monkeypatch):
+    '''
+    A copy of the committed data, without the local DBLP export and the derived caches
+    '''
+    import data_store
+
+    for filename in os.listdir(data_dir):
+        path = os.path.join(data_dir, filename)
+        if filename != 'DBLP_publications.json' and os.path.isfile(path):
+            shutil.copy(path, tmp_path / filename)
+    monkeypatch.setattr(data_store, 'DATA_DIR', str(tmp_path))
+    return tmp_path
@@ -0,0 +1,102 @@
+import json
+import logging
+
+
+def _coauthors(path, name):
+    with open(path / 'coauthors_scse.json', 'r') as f:
+        return {coauthor['coauthor_name'] for document in json.load(f) if document['name'] == name
+                for coauthor in document['coauthors']}
+
+
+def test_alias_table_change_rebuilds_coauthors_scse(committed_data):
+    import build
+
+    build.build()
+    assert 'Liu Yang' not in _coauthors(committed_data, 'Chen Change Loy')
+
+    # A coauthor of Chen Change Loy that only an alias resolves, without --force
+    (committed_data / build.alias_table).write_text('{"aliases": {"Lei Yang 0045": "Liu Yang"}}')
+    build.build()
+    assert 'Liu Yang' in _coauthors(committed_data, 'Chen Change Loy')
+
+    (committed_data / build.alias_table).unlink()
+    build.build()
+    assert 'Liu Yang' not in _coauthors(committed_data, 'Chen Change Loy')
+
+
+def test_similarity_index_follows_its_inputs(committed_data):
+    import build
+    import similarity
+
+    build.build()
+    path = committed_data / 'cache' / similarity.index_file
+    built = path.stat().st_mtime_ns
+    version = similarity.get_similarity_index().version
+    build.build()
+    assert path.stat().st_mtime_ns == built
+
+    with open(committed_data / 'keywordsAndNames.json', 'r') as f:
+        keywords = json.load(f)
+    keywords.append({'keyword': 'Origami Robotics', 'names': ['Chen Change Loy', 'Lam Kwok Yan']})
+    with open(committed_data / 'keywordsAndNames.json', 'w') as f:
+        json.dump(keywords, f)
+    build.build()
+    assert similarity.get_similarity_index().version != version
+
+
+def test_graph_analytics_are_built_into_the_cache(committed_data):
+    import build
+    from graph_analytics import get_graph_analytics
+    from graph_index import get_scse_graph
+
+    build.build()
+    assert not (committed_data / 'graph_analytics.json').exists()
+    with open(committed_data / 'cache' / 'graph_analytics.json', 'r') as f:
+        built = {document['name'] for document in json.load(f)['professors']}
+    analytics = get_graph_analytics()
+    assert built and set(analytics.ids) == built
+
+    # A changed graph is analyzed in memory until the next build
+    with open(committed_data / 'coauthors_scse.json', 'r') as f:
+        coauthors = json.load(f)
+    coauthors.append({'name': 'New Professor', 'coauthors': [{'coauthor_name': 'Chen Change Loy', 'times': 1}]})
+    with open(committed_data / 'coauthors_scse.json', 'w') as f:
+        json.dump(coauthors, f)
+    assert 'New Professor' in get_graph_analytics()
+    build.build()
+    with open(committed_data / 'cache' / 'graph_analytics.json', 'r') as f:
+        assert json.load(f)['version'] == get_scse_graph().version
+    assert 'New Professor' in get_graph_analytics()
+
+
+def _paper(title, coauthors):
+    return {'title': title, 'coauthors': coauthors, 'conference_name': 'CVPR', 'url': None}
+
+
+def test_changed_record_rebuilds_only_its_professor(committed_data, caplog):
+    import build
+
+    records = [
+        {'name': 'Chen Change Loy', 'publications': {'2021': {'Journal Articles': [
+            _paper('Seeing Faces.', ['Chen Change Loy', 'Lam Kwok Yan'])]}}},
+        {'name': 'Lam Kwok Yan', 'publications': {'2021': {'Journal Articles': [
+            _paper('Seeing Faces.', ['Chen Change Loy', 'Lam Kwok Yan']),
+            _paper('Secure Streams.', ['Lam Kwok Yan', 'Ziwei Liu 0001'])]}}},
+    ]
+    (committed_data / 'DBLP_publications.json').write_text(json.dumps(records))
+    build.build()
+
+    records[0]['publications']['2021']['Journal Articles'].append(
+        _paper('Learning Faces.', ['Chen Change Loy', 'Ziwei Liu 0001']))
+    (committed_data / 'DBLP_publications.json').write_text(json.dumps(records))
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger='build'):
+        build.build()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert 'coauthors.json: rebuilt 1 professors, removed 0' in messages
+    assert 'coauthors_scse.json: rebuilt 1 professors, removed 0' in messages
+    assert 'keywords_count.csv is up to date' in messages
+    assert 'research_area_with_counts.csv is up to date' in messages
+    assert _coauthors(committed_data, 'Chen Change Loy') == {'Lam Kwok Yan', 'Liu Ziwei'}
+    assert _coauthors(committed_data, 'Lam Kwok Yan') == {'Chen Change Loy', 'Liu Ziwei'}
@@ -0,0 +1,55 @@
+import os
+import json
+import shutil
+
+import pytest
+import pandas as pd
+
+import data_store
+import core_ranking
+from publication_store import PublicationStore
+
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'core_ranking')
+data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    '''
+    A data directory with the committed CORE.csv, a second edition and a small publication export
+    '''
+    shutil.copy(os.path.join(data_dir, 'CORE.csv'), tmp_path / 'CORE.csv')
+    for filename in ('CORE2.csv', 'DBLP_publications.json'):
+        shutil.copy(os.path.join(fixtures, filename), tmp_path / filename)
+    monkeypatch.setattr(data_store, 'DATA_DIR', str(tmp_path))
+    with open(tmp_path / 'DBLP_publications.json', 'r') as f:
+        store = PublicationStore.from_records(json.load(f), None)
+    monkeypatch.setattr(core_ranking, 'get_publication_store', lambda: store)
+    return tmp_path
+
+
+def test_ranks_with_every_edition(export):
+    ranker = core_ranking.get_ranker()
+    ranks = ranker.classify(['CVPR', 'ICDE (1)', 'SGWS', 'AAMAS', 'Nowhere Symposium', 'ICDE Workshops',
+                             'WWW (Companion Volume)', 'UbiComp Adjunct', 'CVPR Posters', 'SIGMOD Demos']).tolist()
+    # SGWS is only in the second edition, AAMAS takes its rank from the first
+    assert ranks[:4] == ['A*', 'A*', 'C', 'A*']
+    # Satellite events do not take the rank of their conference
+    assert pd.isna(ranks[4:]).all()
+
+
+def test_live_counts_match_build(export):
+    import build
+
+    build.build_conference_counts(build.Context())
+    with open(export / 'all_conference_count.json', 'r') as f:
+        built = {document['name']: document['counts'] for document in json.load(f)}
+    # ICDE Workshops is unranked
+    assert built['Alice Tan'] == {'2021': {'A*': 1, 'A': 0, 'B': 0, 'C': 1}, '2022': {'A*': 1, 'A': 0, 'B': 0, 'C': 0}}
+    assert set(built) == {'Alice Tan', 'Bob Lim'}
+
+    for name, counts in built.items():
+        live = core_ranking.get_conference_counts(name)
+        assert {str(year): row for year, row in live.to_dict('index').items()} == counts
+    assert core_ranking.get_conference_counts('Carol Ng') is None
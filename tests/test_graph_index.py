@@ -0,0 +1,26 @@
+from graph_index import CoauthorGraph
+
+
+def _entry(name, *coauthors):
+    return {'name': name, 'coauthors': [{'coauthor_name': coauthor, 'times': times} for coauthor, times in coauthors]}
+
+
+# A - B - D - E, A - C, B - C
+graph = CoauthorGraph.from_coauthors([
+    _entry('A', ('B', 3), ('C', 1)),
+    _entry('B', ('A', 3), ('C', 2), ('D', 4)),
+    _entry('D', ('B', 4), ('E', 1)),
+], None)
+
+
+def test_collaborator_edges_reach_two_hops():
+    edges = {tuple(sorted(edge[:2])): edge[2] for edge in graph.collaborator_edges('A')}
+    # The coauthors of A, their collaborations and those of B with D, but not D - E
+    assert edges == {('A', 'B'): 3, ('A', 'C'): 1, ('B', 'C'): 2, ('B', 'D'): 4}
+    assert len(graph.collaborator_edges('A')) == len(edges)
+    assert graph.collaborator_edges('F') == []
+
+
+def test_ego_network():
+    assert sorted(graph.ego_network('A').tolist()) == sorted(graph.ids[name] for name in 'ABC')
+    assert sorted(graph.ego_network('A', radius=2).tolist()) == sorted(graph.ids[name] for name in 'ABCD')
@@ -0,0 +1,266 @@
+import os
+import csv
+import json
+import time
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import data_store
+from ingest.__main__ import main
+from ingest import Fetcher, FetchError, Checkpoint, JsonSink, MongoSink, read_professors, collect
+
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'ingest')
+etag = '"dblp-11-1-v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    '''
+    DR-NTU and DBLP pages served from the fixture files. /flaky fails with 503 the
+    first server.failures times, /missing is a 404.
+    '''
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/flaky':
+            with server.lock:
+                server.failures -= 1
+                failing = server.failures >= 0
+            if failing:
+                return self._send(503, b'')
+            return self._send(200, b'recovered')
+        if self.path.startswith('/cris/rp/'):
+            return self._send_file(self.path.rsplit('/', 1)[-1] + '.html', 'text/html')
+        if self.path == '/pid/11/1.xml':
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'')
+            return self._send_file('1.xml', 'application/xml', {'ETag': etag})
+        if self.path.startswith('/page/'):
+            return self._send(200, self.path.encode('utf-8'))
+        self._send(404, b'')
+
+    def _send_file(self, filename, content_type, headers=None):
+        with open(os.path.join(fixtures, filename), 'rb') as f:
+            self._send(200, f.read(), {'Content-Type': content_type, **(headers or {})})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.failures = 0
+    server.base = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def professors(server, tmp_path):
+    with open(os.path.join(fixtures, 'professors.csv'), 'r') as f:
+        content = f.read().replace('{base}', server.base)
+    path = tmp_path / 'professors.csv'
+    path.write_text(content)
+    return read_professors(str(path))
+
+
+def fetcher(tmp_path, **kwargs):
+    return Fetcher(str(tmp_path / 'http'), **{'max_workers': 4, 'backoff': 0, **kwargs})
+
+
+def test_fetch_revalidates_with_etag(server, tmp_path):
+    url = server.base + '/pid/11/1.xml'
+    first = fetcher(tmp_path).fetch(url)
+    # A new fetcher over the same cache directory
+    second = fetcher(tmp_path).fetch(url)
+    assert first == second
+    assert b'Learning to Grasp.' in first
+    assert server.requests == [('/pid/11/1.xml', None), ('/pid/11/1.xml', etag)]
+
+
+def test_fetch_retries_server_errors(server, tmp_path):
+    server.failures = 2
+    assert fetcher(tmp_path, retries=3).fetch(server.base + '/flaky') == b'recovered'
+    assert len(server.requests) == 3
+
+
+def test_fetch_gives_up(server, tmp_path):
+    server.failures = 5
+    with pytest.raises(FetchError):
+        fetcher(tmp_path, retries=2).fetch(server.base + '/flaky')
+    assert len(server.requests) == 3
+
+    # Client errors are not retried
+    with pytest.raises(FetchError):
+        fetcher(tmp_path, retries=2).fetch(server.base + '/missing')
+    assert len(server.requests) == 4
+
+
+def test_fetch_rate_limits_per_host(server, tmp_path):
+    host = server.base[len('http://'):]
+    limited = fetcher(tmp_path, host_delays={host: 0.1})
+    urls = [f'{server.base}/page/{i}' for i in range(4)]
+    start = time.monotonic()
+    results = list(limited.map(lambda fetcher, url: fetcher.fetch(url), urls))
+    elapsed = time.monotonic() - start
+    assert sorted(result for _, result, _ in results) == [url[len(server.base):].encode('utf-8') for url in urls]
+    # Four workers, but requests to the host are at least 0.1s apart
+    assert elapsed >= 0.3
+
+
+def test_collect_resumes_from_checkpoint(server, tmp_path, professors):
+    path = tmp_path / 'checkpoint.jsonl'
+    shutil.copy(os.path.join(fixtures, 'checkpoint.jsonl'), path)
+    checkpoint = Checkpoint(str(path))
+    # The interrupted write of the last line is ignored
+    assert 'Bob Lim' in checkpoint and 'Alice Tan' not in checkpoint
+
+    records, failed = collect(professors, fetcher(tmp_path), checkpoint)
+    assert failed == []
+    assert sorted(path for path, _ in server.requests) == ['/cris/rp/rp00001', '/pid/11/1.xml']
+    alice, bob = records
+    assert alice['keywords'] == ['Machine Learning', 'Computer Vision', 'Robotics']
+    assert alice['biography'] == 'Alice Tan works on learning for robots.'
+    assert alice['orcid_url'] == 'https://orcid.org/0000-0000-0000-0001'
+    assert alice['num_contributions'] == {'2022': {'Journal Articles': 1, 'Conference and Workshop Papers': 1},
+                                          '2021': {'Informal and Other Publications': 1}}
+    assert alice['publications']['2022']['Journal Articles'][0]['coauthors'] == ['Bob Lim']
+    assert bob['publications'] is None
+
+    # A second run finds every professor in the checkpoint
+    server.requests.clear()
+    records, _ = collect(professors, fetcher(tmp_path), Checkpoint(str(path)))
+    assert server.requests == []
+    assert [record['name'] for record in records] == ['Alice Tan', 'Bob Lim']
+
+
+def test_ingest_runs_collect_again_after_writing(server, tmp_path, professors):
+    argv = ['--professors', str(tmp_path / 'professors.csv'), '--data-dir', str(tmp_path),
+            '--cache-dir', str(tmp_path / 'http'), '--checkpoint', str(tmp_path / 'checkpoint.jsonl')]
+    assert main(argv) == 0
+    assert not (tmp_path / 'checkpoint.jsonl').exists()
+
+    # A later run fetches every professor again instead of rewriting the records of the first
+    server.requests.clear()
+    assert main(argv) == 0
+    assert sorted(path for path, _ in server.requests) == ['/cris/rp/rp00001', '/cris/rp/rp00002', '/pid/11/1.xml']
+    with open(tmp_path / 'namesAndKeywords.json', 'r') as f:
+        assert [document['name'] for document in json.load(f)] == ['Alice Tan', 'Bob Lim']
+
+
+def _records():
+    with open(os.path.join(fixtures, 'checkpoint.jsonl'), 'r') as f:
+        bob = json.loads(f.readline())
+    alice = {'name': 'Alice Tan', 'keywords': ['Machine Learning', 'Robotics'],
+             'biography': 'Alice Tan works on learning for robots.',
+             'orcid_url': 'https://orcid.org/0000-0000-0000-0001',
+             'publications': {'2022': {'Journal Articles': [{'title': 'Learning to Grasp.'}]}},
+             'num_contributions': {'2022': {'Journal Articles': 1}}}
+    return [alice, bob]
+
+
+def _keywords(documents):
+    return {document['keyword']: sorted(document['names']) for document in documents}
+
+
+expected_keywords = {
+    'Machine Learning': ['Alice Tan'],
+    'Robotics': ['Alice Tan'],
+    # Alice Tan no longer has Data Mining, and nobody has Networks
+    'Data Mining': ['Carol Ng'],
+    'Databases': ['Bob Lim'],
+}
+
+
+def test_json_sink(tmp_path):
+    for filename in ('namesAndKeywords.json', 'keywordsAndNames.json', 'professors_new.csv'):
+        shutil.copy(os.path.join(fixtures, filename), tmp_path / filename)
+
+    with open(tmp_path / 'professors_new.csv', 'rb') as f:
+        carol = next(line for line in f if line.startswith(b'Carol Ng'))
+    records = _records()
+    records[0]['biography'] = 'Alice Tan\u2019s robots learn in Zürich (C:\\data).'
+    JsonSink(str(tmp_path)).write(records)
+
+    with open(tmp_path / 'namesAndKeywords.json', 'r') as f:
+        assert {document['name']: document['keywords'] for document in json.load(f)} == {
+            'Alice Tan': ['Machine Learning', 'Robotics'], 'Carol Ng': ['Data Mining'], 'Bob Lim': ['Databases']}
+    with open(tmp_path / 'keywordsAndNames.json', 'r') as f:
+        assert _keywords(json.load(f)) == expected_keywords
+    with open(tmp_path / 'DBLP_publications.json', 'r') as f:
+        assert [document['name'] for document in json.load(f)] == ['Alice Tan']
+    # The file is not UTF-8: untouched rows keep their bytes and the dashboard reads the new values
+    with open(tmp_path / 'professors_new.csv', 'rb') as f:
+        assert carol in f.read()
+    rows = {row['Full Name']: row for row in data_store._read_professors_csv(str(tmp_path / 'professors_new.csv'))
+            .fillna('').to_dict('records')}
+    assert rows['Alice Tan']['orcid_url'] == 'https://orcid.org/0000-0000-0000-0001'
+    assert rows['Alice Tan']['biography'] == records[0]['biography']
+    assert rows['Alice Tan']['Citations (All)'] == 120
+    assert rows['Carol Ng']['biography'] == 'Carol Ng, data miner \x80 Café Analytics.'
+    assert rows['Bob Lim']['biography'] == 'Bob Lim works on query processing.'
+    assert rows['Bob Lim']['orcid_url'] == ''
+
+
+class FakeCollection:
+    '''
+    In-memory collection with the operations MongoSink uses
+    '''
+
+    def __init__(self, key, documents=()):
+        self.documents = {document[key]: dict(document) for document in documents}
+
+    def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            (key, value), = request._filter.items()
+            self.documents.setdefault(value, {key: value}).update(request._doc['$set'])
+
+    def find(self, query, projection):
+        return [{key: value for key, value in document.items() if projection.get(key)}
+                for document in self.documents.values()]
+
+    def delete_many(self, query):
+        (key, condition), = query.items()
+        for value in [value for value in self.documents if value not in condition['$nin']]:
+            del self.documents[value]
+
+
+class FakeDatabase:
+    def __init__(self):
+        with open(os.path.join(fixtures, 'namesAndKeywords.json'), 'r') as f:
+            self.professors = FakeCollection('name', json.load(f))
+        with open(os.path.join(fixtures, 'keywordsAndNames.json'), 'r') as f:
+            self.keywordsAndNames = FakeCollection('keyword', json.load(f))
+        self.DBLP_publications = FakeCollection('name')
+
+
+def test_mongo_sink():
+    db = FakeDatabase()
+    MongoSink(db, batch_size=1).write(_records())
+
+    alice = db.professors.documents['Alice Tan']
+    assert alice['keywords'] == ['Machine Learning', 'Robotics']
+    assert alice['biography'] == 'Alice Tan works on learning for robots.'
+    assert alice['orcid_url'] == 'https://orcid.org/0000-0000-0000-0001'
+    assert db.professors.documents['Bob Lim']['orcid_url'] is None
+    assert _keywords(db.keywordsAndNames.documents.values()) == expected_keywords
+    assert list(db.DBLP_publications.documents) == ['Alice Tan']
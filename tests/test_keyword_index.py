@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import data_store
+import keyword_index
+from backends import StorageBackend, SQLiteBackend
+from repository import ProfessorRepository
+
+
+entries = [
+    {'keyword': 'Machine Learning', 'names': ['Alice Tan', 'Bob Lim']},
+    {'keyword': 'Robotics', 'names': ['Alice Tan']},
+    {'keyword': 'Databases', 'names': ['Bob Lim', 'Carol Ng']},
+]
+
+
+class KeywordsBackend(StorageBackend):
+    '''
+    Backend serving fixed keyword documents, without a version (like MongoDB)
+    '''
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def fetch_keyword_entries(self):
+        return [dict(entry) for entry in self.entries]
+
+
+@pytest.fixture
+def use_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(keyword_index, '_index', None)
+    (tmp_path / 'research_areas.json').write_text('{"Artificial Intelligence": ["Machine Learning", "Robotics"]}')
+
+    def use(backend):
+        repository = ProfessorRepository(backend)
+        monkeypatch.setattr(keyword_index, 'get_repository', lambda: repository)
+        return repository
+    return use
+
+
+def test_index_from_sqlite_backend(tmp_path, use_backend):
+    (tmp_path / 'keywordsAndNames.json').write_text(json.dumps(entries))
+    use_backend(SQLiteBackend())
+
+    index = keyword_index.get_keyword_index()
+    assert index.keywords() == ['Machine Learning', 'Robotics', 'Databases']
+    assert index.names_of(index.query(['Machine Learning', 'Databases'], match='all')) == ['Bob Lim']
+    assert keyword_index.get_keyword_index() is index
+
+    # A changed export is served without waiting for the query cache to expire
+    (tmp_path / 'keywordsAndNames.json').write_text(json.dumps(entries[:1]))
+    assert keyword_index.get_keyword_index().keywords() == ['Machine Learning']
+
+
+def test_index_from_unversioned_backend(use_backend):
+    repository = use_backend(KeywordsBackend(entries))
+
+    index = keyword_index.get_keyword_index()
+    assert index.names_of(index.query(['Robotics'], exclude=['Databases'])) == ['Alice Tan']
+    assert index.names_of(index.query(areas=['Artificial Intelligence'])) == ['Alice Tan', 'Bob Lim']
+
+    # Documents fetched again but unchanged keep the index
+    repository.clear()
+    assert keyword_index.get_keyword_index() is index
@@ -0,0 +1,61 @@
+import os
+import csv
+
+import pytest
+
+from name_matching import NameResolver, normalize_name
+
+
+data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+@pytest.fixture(scope='module')
+def professors():
+    with open(os.path.join(data_dir, 'professors.csv'), 'r', encoding='utf-8', errors='replace', newline='') as f:
+        return [row['Full Name'] for row in csv.DictReader(f)]
+
+
+def test_normalize_name():
+    assert normalize_name('Lei Wei 0002') == normalize_name('Wei Lei')
+    assert normalize_name('Kwok-Yan Lam') == normalize_name('Lam Kwok Yan')
+
+
+def test_resolves_exact_and_given_name_and_surname(professors):
+    resolver = NameResolver(professors)
+    assert resolver.resolve_many(['Kwok-Yan Lam', 'Ziwei Liu 0001', 'Douglas L. Maskell', 'Chunyan Miao']) == [
+        'Lam Kwok Yan', 'Liu Ziwei', 'Douglas Leslie Maskell', 'Miao Chun Yan']
+
+
+def test_similar_names_are_only_proposed(professors):
+    resolver = NameResolver(professors)
+    names = ['Ang Li', 'Bang Liu', 'Bo Ai', 'Cheng Wang', 'Chen Wei', 'Chia-Wen Lin', 'Aijin Zhang',
+             'Jianming Zheng', 'Lei Yang 0045', 'Fang Liu 0009']
+    assert resolver.resolve_many(names) == [None] * len(names)
+    assert resolver.proposals['Jianming Zheng'][0][0] == 'Zheng Jianmin'
+
+
+def test_reviewed_aliases(professors, tmp_path):
+    path = tmp_path / 'name_aliases.json'
+    path.write_text('{"aliases": {"Jianming Zheng": "Zheng Jianmin", "Kwok-Yan Lam": null}}')
+    resolver = NameResolver(professors, str(path))
+    assert resolver.resolve_many(['Jianming Zheng', 'Kwok-Yan Lam']) == ['Zheng Jianmin', None]
+
+
+def test_build_reproduces_coauthors_scse(committed_data):
+    import build
+
+    build.build(force=True)
+    with open(committed_data / 'coauthors_scse.json', 'rb') as built, \
+            open(os.path.join(data_dir, 'coauthors_scse.json'), 'rb') as committed:
+        assert built.read() == committed.read()
+
+
+def test_synthetic_names_resolve_to_themselves():
+    import numpy as np
+    from benchmarks.synthetic import _professor_names, _name_token
+
+    names = _professor_names(5000, np.random.default_rng(42))
+    assert len({normalize_name(name) for name in names}) == len(names)
+    resolver = NameResolver(names)
+    assert resolver.resolve_many(names) == names
+    assert resolver.resolve_many([f"External Author {_name_token(i)}" for i in range(100)]) == [None] * 100
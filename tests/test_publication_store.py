@@ -0,0 +1,86 @@
+import os
+import json
+import shutil
+
+import pytest
+
+import data_store
+import publication_store
+from backends import StorageBackend, SQLiteBackend
+from repository import ProfessorRepository
+
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'core_ranking')
+
+
+class RecordsBackend(StorageBackend):
+    '''
+    Backend serving fixed publication records, without a version (like MongoDB)
+    '''
+
+    def __init__(self, records):
+        self.records = records
+        self.fetches = 0
+
+    def fetch_all_publications(self):
+        self.fetches += 1
+        return self.records
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(publication_store, '_backend_store', None)
+    return tmp_path
+
+
+def use_backend(monkeypatch, backend):
+    repository = ProfessorRepository(backend)
+    monkeypatch.setattr(publication_store, 'get_repository', lambda: repository)
+
+
+def _export():
+    with open(os.path.join(fixtures, 'DBLP_publications.json'), 'r') as f:
+        return json.load(f)
+
+
+def test_store_from_sqlite_backend(data_dir, monkeypatch):
+    shutil.copy(os.path.join(fixtures, 'DBLP_publications.json'), data_dir / 'DBLP_publications.json')
+    use_backend(monkeypatch, SQLiteBackend())
+
+    store = publication_store.get_publication_store()
+    assert store.version.startswith('sqlite:')
+    assert set(store.offsets) == {'Alice Tan', 'Bob Lim'}
+    assert publication_store.get_publication_store() is store
+
+    # The backend is rebuilt from the changed export, and so is the store
+    records = _export()[:1]
+    with open(data_dir / 'DBLP_publications.json', 'w') as f:
+        json.dump(records, f)
+    os.utime(data_dir / 'DBLP_publications.json', ns=(1, 1))
+    assert set(publication_store.get_publication_store().offsets) == {records[0]['name']}
+
+
+def test_store_from_unversioned_backend(data_dir, monkeypatch):
+    backend = RecordsBackend(_export())
+    use_backend(monkeypatch, backend)
+
+    store = publication_store.get_publication_store()
+    assert set(store.offsets) == {'Alice Tan', 'Bob Lim'}
+    assert publication_store.get_publication_store() is store
+    assert backend.fetches == 1
+
+    # Fetched again once expired; unchanged publications keep the same store
+    monkeypatch.setattr(publication_store, 'refresh_interval', -1)
+    assert publication_store.get_publication_store() is store
+    assert publication_store.get_publication_store() is store
+    assert backend.fetches == 3
+
+
+def test_falls_back_to_local_export(data_dir, monkeypatch):
+    use_backend(monkeypatch, RecordsBackend([]))
+    assert publication_store.get_publication_store() is None
+
+    shutil.copy(os.path.join(fixtures, 'DBLP_publications.json'), data_dir / 'DBLP_publications.json')
+    store = publication_store.get_publication_store()
+    assert set(store.offsets) == {'Alice Tan', 'Bob Lim'}
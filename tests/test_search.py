@@ -0,0 +1,30 @@
+from publication_store import PublicationStore
+from search import SearchIndex, _paper_documents
+
+
+def _paper(title, venue, url=None):
+    return {'title': title, 'conference_name': venue, 'url': url, 'coauthors': []}
+
+
+records = [
+    {'name': 'Alice Tan', 'publications': {
+        '2022': {'Editorship': [_paper('Preface.', 'ICRA'), _paper('Preface.', 'IROS')]},
+        '2021': {'Journal Articles': [_paper('Learning to Grasp.', 'TRO', 'https://doi.org/10.1/grasp')]}}},
+    {'name': 'Bob Lim', 'publications': {
+        '2022': {'Editorship': [_paper('Preface.', 'VLDB')]}}},
+]
+
+
+def test_papers_with_the_same_title_are_kept():
+    store = PublicationStore.from_records(records, None)
+    index = SearchIndex()
+    index.update({}, _paper_documents(store))
+
+    results = index.search_papers('preface')
+    assert sorted((result['name'], result['venue']) for result in results) == [
+        ('Alice Tan', 'ICRA'), ('Alice Tan', 'IROS'), ('Bob Lim', 'VLDB')]
+
+    # Updating from a new store version moves the fields with the rows
+    store = PublicationStore.from_records(records[1:], None)
+    assert index.update({}, _paper_documents(store)) == 3
+    assert [(result['name'], result['venue']) for result in index.search_papers('preface')] == [('Bob Lim', 'VLDB')]
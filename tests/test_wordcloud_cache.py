@@ -0,0 +1,31 @@
+from wordcloud import WordCloud
+
+from wordcloud_cache import YearTermTable
+
+
+def _publications(titles_by_year):
+    return {str(year): {'Journal Articles': [{'title': title} for title in titles]}
+            for year, titles in titles_by_year.items()}
+
+
+def _titles(publications, first_year, last_year):
+    return ' '.join(paper['title'] for year, categories in sorted(publications.items())
+                    if first_year <= int(year) <= last_year
+                    for papers in categories.values() for paper in papers if paper['title'] is not None)
+
+
+def test_range_counts_match_the_text_of_the_range():
+    publications = _publications({
+        2020: ["Graph Networks for Learning.", "Alice's 3 robots."],
+        2021: ["A graph network.", "Learning to learn robot policies."],
+        2022: ["Networks of robots and the Network."],
+    })
+    table = YearTermTable(publications)
+    processor = WordCloud(collocations=False)
+    for first_year, last_year in [(2020, 2020), (2020, 2021), (2021, 2022), (2020, 2022)]:
+        assert table.frequencies(first_year, last_year) == processor.process_text(
+            _titles(publications, first_year, last_year))
+    # "Networks" only merges into "network" in ranges where both appear
+    assert table.frequencies(2020, 2020)['Networks'] == 1
+    assert table.frequencies(2020, 2021)['network'] == 2
+
@@ -0,0 +1,173 @@
+'''
+School-wide publication trends as a dense professor x year x category cube.
+
+The categories are the contribution types of num_contributions followed by the
+CORE ranks of all_conference_count.json. The cube is built once per version of
+its sources; every trend query (a set of professors selected by name, research
+keyword or broad area, a year range and a measure) is then a boolean mask and
+a tensordot over the professor axis.
+'''
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import core_ranking
+from keyword_index import get_keyword_index
+from publication_store import get_publication_store
+from repository import get_repository
+
+
+measures = {'type': 'Contribution type', 'rank': 'CORE rank'}
+
+_lock = threading.Lock()
+# (sources, TrendCube); the source objects identify the versions the cube was built from
+_cube = None
+
+
+class TrendCube:
+    '''
+    counts[professor, year, category] with the professor names, the (dense) years and
+    the categories of every measure along the axes
+    '''
+
+    def __init__(self, names, years, types, counts):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.years = np.asarray(years)
+        self.categories = {'type': list(types), 'rank': list(core_ranking.core_ranks)}
+        self.columns = {'type': np.arange(len(types)),
+                        'rank': np.arange(len(types), len(types) + len(core_ranking.core_ranks))}
+        self.counts = counts
+
+    @classmethod
+    def from_sources(cls, names, contributions, ranks):
+        '''
+        Build the cube from (name, year, type, count) and (name, year, rank, count) arrays
+        '''
+        names = list(dict.fromkeys(list(names) + list(contributions[0]) + list(ranks[0])))
+        years = np.concatenate([contributions[1], ranks[1]]).astype(np.int64)
+        years = np.arange(years.min(), years.max() + 1) if len(years) else np.zeros(0, dtype=np.int64)
+        types = sorted(set(contributions[2]))
+        cube = cls(names, years, types, np.zeros((len(names), len(years), len(types) + len(core_ranking.core_ranks)),
+                                                 dtype=np.int32))
+        rows = pd.Index(cube.names)
+        for (professors, year, category, count), offset, categories in (
+                (contributions, 0, types), (ranks, len(types), core_ranking.core_ranks)):
+            if not len(professors):
+                continue
+            codes = pd.Categorical(category, categories=categories).codes + offset
+            np.add.at(cube.counts, (rows.get_indexer(professors), np.asarray(year, dtype=np.int64) - years[0], codes),
+                      np.asarray(count, dtype=np.int32))
+        return cube
+
+    def rows(self, names=None, keywords=(), areas=(), match='any', exclude=()):
+        '''
+        Get the boolean mask of the professors in names (all if None) that match the
+        research keywords and broad areas, as in the sidebar filter
+        '''
+        mask = np.ones(len(self.names), dtype=bool)
+        if names is not None:
+            mask[:] = False
+            mask[[self.ids[name] for name in names if name in self.ids]] = True
+        if keywords or areas or exclude:
+            index = get_keyword_index()
+            selected = np.zeros(len(self.names), dtype=bool)
+            selected[[self.ids[name] for name in index.names_of(index.query(keywords, areas, match, exclude))
+                      if name in self.ids]] = True
+            mask &= selected
+        return mask
+
+    def _years(self, years):
+        if years is None:
+            return np.ones(len(self.years), dtype=bool)
+        return (self.years >= years[0]) & (self.years <= years[1])
+
+    def slice(self, measure='type', years=None, **selection):
+        '''
+        Get the counts of the selected professors by year (rows) and category (columns)
+        of a measure ('type' or 'rank'). selection is passed to rows().
+        '''
+        mask = self.rows(**selection)
+        in_range = self._years(years)
+        totals = np.tensordot(mask.astype(np.int32), self.counts[:, in_range][:, :, self.columns[measure]], axes=1)
+        return pd.DataFrame(totals, index=pd.Index(self.years[in_range], name='year'),
+                            columns=self.categories[measure])
+
+    def groups(self, groups, measure='type', categories=None, years=None):
+        '''
+        Get the total counts by year (rows) of several professor groups (columns) at once.
+        groups maps a label to a boolean mask from rows(); categories restricts the
+        categories of the measure that are summed.
+        '''
+        columns = self.columns[measure]
+        if categories is not None:
+            columns = columns[np.isin(self.categories[measure], list(categories))]
+        in_range = self._years(years)
+        # professor x year totals, then one product with the group membership matrix
+        totals = self.counts[:, in_range][:, :, columns].sum(axis=2)
+        membership = np.array([mask for mask in groups.values()], dtype=np.int32).reshape(len(groups), len(self.names))
+        return pd.DataFrame((membership @ totals).T, index=pd.Index(self.years[in_range], name='year'),
+                            columns=list(groups))
+
+    def area_trends(self, measure='type', categories=None, years=None):
+        '''
+        Get the counts by year (rows) of the professors of every broad research area (columns)
+        '''
+        areas = data_store.get_research_areas()
+        return self.groups({area: self.rows(areas=[area]) for area in areas}, measure, categories, years)
+
+
+def _contributions(names, store):
+    '''
+    (name, year, type, count) arrays of every professor
+    '''
+    if store is not None:
+        counts = store.frame.groupby(['name', 'year', 'type'], observed=True).size()
+        counts = counts[counts > 0].reset_index()
+        return (counts['name'].astype(str).to_numpy(), counts['year'].to_numpy(),
+                counts['type'].astype(str).to_numpy(), counts[0].to_numpy())
+
+    # Without the publication export, from the num_contributions of the backend in one batch
+    rows = [(name, int(year), category, count)
+            for name, profile in get_repository().get_profiles(names).items()
+            for year, year_data in (profile['num_contributions'] or {}).items()
+            for category, count in year_data.items()]
+    return tuple(np.array(column) for column in zip(*rows)) if rows else ([], [], [], [])
+
+
+def _ranks(store):
+    '''
+    (name, year, rank, count) arrays of every professor
+    '''
+    if store is not None:
+        matrix = core_ranking.get_rank_matrix()
+        stacked = matrix.stack()
+        stacked = stacked[stacked > 0]
+        return (stacked.index.get_level_values(0).astype(str).to_numpy(), stacked.index.get_level_values(1).to_numpy(),
+                stacked.index.get_level_values(2).astype(str).to_numpy(), stacked.to_numpy())
+
+    rows = [(name, int(year), rank, count)
+            for name, entry in data_store.get_all_conference_counts().items()
+            for year, year_counts in entry['counts'].items()
+            for rank, count in year_counts.items() if count]
+    return tuple(np.array(column) for column in zip(*rows)) if rows else ([], [], [], [])
+
+
+def get_trend_cube():
+    '''
+    Get the trend cube, rebuilt when the professors, publications or conference counts changed
+    '''
+    global _cube
+    store = get_publication_store()
+    professors = data_store.get_professors_table()
+    ranks = core_ranking.get_rank_matrix() if store is not None else data_store.get_all_conference_counts()
+    sources = (professors, store, ranks)
+    with _lock:
+        if _cube is not None and all(a is b for a, b in zip(_cube[0], sources)):
+            return _cube[1]
+        names = professors['Full Name'].tolist()
+        cube = TrendCube.from_sources(names, _contributions(names, store), _ranks(store))
+        _cube = (sources, cube)
+        return cube
@@ -1,413 +1,464 @@
-import pymongo
-import json
+import time
 
-import plotly.express as px
-import plotly.graph_objs as go
 import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
-import networkx as nx
-import igviz as ig
-from wordcloud import WordCloud
-
-
-
-conn_str = "" #mongoDB connection string
-client = pymongo.MongoClient(conn_str, serverSelectionTimeoutMS=5000)
-db = client['scsedash']
 
+import data_store
+import core_ranking
+from instrumentation import timed, payload
+from figure_payload import plotly_chart
+from repository import get_repository
+from keyword_index import get_keyword_index
+from search import get_search_index
+from similarity import get_similarity_index
+from graph_analytics import get_graph_analytics
+from layout import paginate, kept, keep, kept_index, kept_range
+import prefetch
+from publication_store import get_publications, filter_publications, search_publications, sort_publications, sort_orders
+
+# The renderers (plotly, networkx and igviz, wordcloud and matplotlib) are imported by
+# the display functions that use them, so importing this module stays cheap and a
+# worker only loads the renderers of the pages it serves.
+
+
+@timed
 def get_research_areas():
-    f = open ('./data/research_areas.json', "r")
-    broader_to_specific_areas = json.loads(f.read())
-    f.close()
-    return dict(broader_to_specific_areas)
+    return dict(data_store.get_research_areas())
 
 
-def find_name_using_keyword(keywords=[]):
+@timed
+def find_name_using_keyword(keywords=[], areas=[], match='any', exclude=[]):
     '''
-    Identifies all professors with specified keyword
-    '''  
-    if len(keywords) == 0:
+    Identifies all professors with any (or all) of the specified keywords and broad areas,
+    without the excluded keywords
+    '''
+    if not keywords and not areas and not exclude:
         names = []
     else:
-        cursor = db.keywordsAndNames.find({"keyword": {"$in": keywords}},{"_id":0,"names":1})
-        names = set()
-        for dic in cursor:
-            names.update(dic["names"])
+        index = get_keyword_index()
+        names = index.names_of(index.query(keywords, areas, match, exclude))
     return names
 
 
+@timed
+def count_professors_by_keyword(keywords=[], areas=[], match='any', exclude=[]):
+    '''
+    Get the number of professors having each keyword among the professors matching a selection
+    '''
+    index = get_keyword_index()
+    return index.facet_counts(index.query(keywords, areas, match, exclude))
+
+
+@timed
 def find_num_contributions_using_name(name):
     '''
     Identifies number of publications with specified professor
     '''   
-    cursor = db.DBLP_publications.find({"name":name},{"_id":0,"name":1,"num_contributions":1})
-    result = []
-    for dic in cursor:
-        result.append(dic)
-    return result
+    profile = get_repository().get_profile(name)
+    if profile["num_contributions"] is None:
+        return []
+    return [{"name": name, "num_contributions": profile["num_contributions"]}]
 
 
+@timed
 def get_list_of_keywords():
     '''
     Get the entire list of keywords 
     '''
-    collection = db['keywordsAndNames']
-    result = collection.distinct('keyword')
-    return result
+    return get_keyword_index().keywords()
 
 
+@timed
 def get_keywords_given_name(name):
     '''
     Get the list of keywords given professor's name
     '''
-    cursor = db.professors.find({"name":name},{"_id":0})
-    result = []
-    for dic in cursor:
-        result.append(dic)
-    return result[0]['keywords']
+    return get_repository().get_profile(name)["keywords"]
 
 
+@timed
 def plot_year_of_involvement(data):
-    #years = sorted([int(year) for year in data['num_contributions'].keys()])
-    contribution_types = set()
-    for year_data in data['num_contributions'].values():
-        contribution_types.update(year_data.keys())
-
-    data_list = []
-    for year, year_data in data['num_contributions'].items():
-        row = {'Year': int(year)}
-        row.update(year_data)
-        data_list.append(row)
-
-    df = pd.DataFrame(data_list)
-
-    # Define a custom color scale for contribution types
-    custom_color_scale = {
-        'Journal Articles': '#aec7e8',  # Light blue
-        'Conference and Workshop Papers': '#ff7f0e',  # Orange
-        'Informal and Other Publications': '#1f77b4',  # Dark blue
-        'Editorship': '#ffbb78',  # Light orange
-        'Books and Theses': '#98df8a',  # Light green
-        'Parts in Books or Collections': '#d62728',  # Red
-        'Reference Works': '#c5b0d5'  # Lavender
-    }
-
-    # Create the stacked bar chart
-    fig = px.bar(df, x='Year', y=list(contribution_types), title=f'{data["name"]}',
-                 labels={'value': 'Number of Contributions', 'variable': 'Contribution Type'},
-                 barmode='relative',color='variable', color_discrete_map=custom_color_scale)
-
-    # Show the chart
-    fig.update_layout(xaxis_title='Year', yaxis_title='Number of Contributions',
-                     plot_bgcolor='white',paper_bgcolor='#ebd2b9')
-    
+    import figures
+    fig = figures.year_of_involvement_figure(data)
     # Display the Plotly chart in Streamlit
     st.subheader("Year of Involvement")
-    st.plotly_chart(fig)
+    plotly_chart(fig)
 
 
+@timed
 def find_publications(name):
-    cursor = db.DBLP_publications.find({"name":name},{"_id":0,"num_contributions":0})
-    data = []
-    for dic in cursor:
-        data.append(dic)
-    if len(data) == 0:
+    profile = get_repository().get_profile(name)
+    if profile["publications"] is None:
         return print("Sorry, currently no publication data is found.")
     else:
-        return data[0]
+        return {"name": name, "publications": profile["publications"]}
 
 
+@timed
+def prefetch_professor_page(name, options):
+    '''
+    Load everything the page of a professor shows in parallel and wait for it, then
+    warm the pages of the likely next selections in the background
+    '''
+    from graph_figures import layouts
+
+    labels = {label: layout for layout, label in layouts.items()}
+    layout = labels.get(st.session_state.get('individual_graph_layout'), 'circular')
+    prefetch.prefetch(name, layout)
+    prefetch.wait(name)
+    prefetch.speculate(prefetch.likely_next(name, options), layout)
+
+
+@timed
+def display_paper(paper, show_year=False):
+    st.markdown((f"**Year:** {paper['year']}  \n" if show_year else "") +
+                f"**Title:** {paper['title']}  \n"
+                f"**Coauthors:** {paper['coauthors']}  \n"
+                f"**Conference/Venue:** {paper['venue']}  \n"
+                f"**URL:** {paper['url']}")
+
+
+@timed
+def display_publication_list(publications, key, group_by=None):
+    '''
+    Render one page of a searchable, sortable publication list.
+    Search, sort and paging happen on the table, so only the visible page is sent
+    to the browser whatever the number of publications.
+    '''
+    search_column, sort_column = st.columns([3, 1])
+    with search_column:
+        query = keep(f"{key}_search", st.text_input("Search titles, venues and coauthors",
+                                                    value=kept(f"{key}_search", ""), key=f"{key}_search"))
+    with sort_column:
+        order = keep(f"{key}_sort", st.selectbox("Sort by", list(sort_orders), index=kept_index(f"{key}_sort", sort_orders),
+                                                 key=f"{key}_sort"))
+    selected = sort_publications(search_publications(publications, query), order)
+    start, end = paginate(len(selected), key=f"{key}_page")
+
+    # Group headers only make sense when the list is ordered by the grouped column
+    grouped = group_by is not None and sort_orders[order][0][0] == group_by
+    group = None
+    for paper in selected.iloc[start:end].to_dict('records'):
+        if grouped and paper[group_by] != group:
+            group = paper[group_by]
+            st.markdown(f"#### {group}")
+        display_paper(paper, show_year=not grouped)
+
+
+@timed
 def display_publications_by_year(name):
-    data = find_publications(name)
-    if not data['publications']:
+    publications = get_publications(name)
+    if publications is None:
         st.error("No publications found for this author.")
         return
 
-    all_years = sorted(map(int, data['publications'].keys()), reverse=True)
+    first_year, last_year = int(publications['year'].min()), int(publications['year'].max())
     # Create a slider for selecting the range of years
-    years_range = st.slider(
+    key = f"by_year_{name}_years"
+    years_range = keep(key, st.slider(
         "Select the range of years to display publication information",
-        min_value=min(all_years),
-        max_value=max(all_years),
-        value=(min(all_years), max(all_years))
-    )
-
-    # Display the publication by year and then type
-    for year in all_years:
-        if years_range[0] <= year <= years_range[1]:
-            with st.expander(f"{year}"):
-                publications = data['publications'][str(year)]
-                for category, papers in publications.items():
-                    st.markdown(f"#### {category}")
-                    for paper in papers:
-                        st.markdown(f"**Title:** {paper['title']}  \n"
-                                    f"**Coauthors:** {', '.join(paper['coauthors'])}  \n"
-                                    f"**Conference/Venue:** {paper['conference_name']}  \n"
-                                    f"**URL:** {paper['url']}")
-                    st.divider()
+        min_value=first_year,
+        max_value=last_year,
+        value=kept_range(key, first_year, last_year),
+        key=key
+    ))
 
+    # Display the publication by year
+    selected = filter_publications(publications, years=years_range)
+    display_publication_list(selected, key=f"by_year_{name}", group_by='year')
 
+
+@timed
 def display_publications_by_type(name):
-    data = find_publications(name)
-    years = sorted(map(int, data['publications'].keys()), reverse=True)
-
-    # Get a list of all unique publication types
-    unique_types = set()
-    for year_data in data['publications'].values():
-        unique_types.update(year_data.keys())
-
-    # Display the publications by type and year
-    for publication_type in unique_types:
-        with st.expander(publication_type):
-            for year in years:
-                year_data = data['publications'].get(str(year), {})
-                publications = year_data.get(publication_type, [])
-                if publications:
-                    st.markdown(f"#### {year}")
-                    for paper in reversed(publications):  # Show the most recent publications on top
-                        st.markdown(f"**Title:** {paper['title']}  \n"
-                                    f"**Coauthors:** {', '.join(paper['coauthors'])}  \n"
-                                    f"**Conference/Venue:** {paper['conference_name']}  \n"
-                                    f"**URL:** {paper['url']}")
+    publications = get_publications(name)
+    if publications is None:
+        st.error("No publications found for this author.")
+        return
 
+    # Display the publications of one type by year
+    types = publications['type'].unique().tolist()
+    publication_type = keep(f"by_type_{name}", st.selectbox("Publication type", types,
+                                                            index=kept_index(f"by_type_{name}", types),
+                                                            key=f"by_type_{name}"))
+    selected = filter_publications(publications, types=[publication_type])
+    display_publication_list(selected, key=f"by_type_{name}_{publication_type}", group_by='year')
 
+
+@timed
 def display_word_cloud(name,key):
     st.subheader("Publication Keywords")
     data = find_publications(name)
-    if not data['publications']:
+    if not data or not data['publications']:
         st.error("No publications found for this author.")
         return
 
     all_years = sorted(map(int, data['publications'].keys()), reverse=True)
-    years_range = st.slider(
+    key = f"{key}_{name}"
+    years_range = keep(key, st.slider(
         "Select the range of years to display publication keywords",
         min_value=min(all_years),
         max_value=max(all_years),
-        value=(min(all_years), max(all_years)),
+        value=kept_range(key, min(all_years), max(all_years)),
         key=key
-    )
+    ))
 
     # Generate a word cloud for the selected range of years
-    selected_years = [str(year) for year in range(years_range[0], years_range[1] + 1)]
-    text = ""
-    for year in selected_years:
-        if year in data['publications']:
-            publications = data['publications'][year]
-            # Combine all paper titles into a single string
-            text = " ".join(str(paper['title']) for category in publications.values() for paper in category if paper['title'] is not None)
-    if text:
-        # Create a WordCloud object
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-        
-        # Display the word cloud using matplotlib
-        st.set_option('deprecation.showPyplotGlobalUse', False)  # Avoid warning
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis("off")
-        #plt.title(f"Word Cloud for {min_year} to {max_year}")
-        st.pyplot(plt)
+    from wordcloud_cache import word_cloud_png
+    png = word_cloud_png(name, years_range[0], years_range[1])
+    if png:
+        payload('image', len(png))
+        st.image(png, use_column_width=True)
     else:
         st.error(f"No publications found for the selected year range.")
 
 
+@timed
+def display_similar_professors(name):
+    similar = get_similarity_index().similar(name, k=5)
+    if not similar:
+        st.write("No similar professors found.")
+        return
+    for similar_name, similarity in similar:
+        st.markdown(f"- **{similar_name}** ({similarity:.0%} similar)")
+
+
+@timed
+def display_collaboration_metrics(name):
+    '''
+    Show the position of a professor in the SCSE co-authorship network: centrality,
+    key collaborators and research cluster, all precomputed by graph_analytics
+    '''
+    from graph_index import get_scse_graph
+
+    st.subheader("Collaboration Network")
+    analytics = get_graph_analytics()
+    metrics = analytics.metrics(name)
+    if metrics is None:
+        st.write("No collaborations with other SCSE professors found.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("SCSE Collaborators", metrics['degree'])
+    col2.metric("Joint Papers", metrics['weighted_degree'])
+    col3.metric("Centrality Rank", f"{metrics['pagerank_position']} of {len(analytics)}")
+    col4.metric("Research Cluster", f"#{metrics['community'] + 1}", f"{metrics['community_size']} professors",
+                delta_color='off')
+
+    st.markdown("**Key collaborators**")
+    for collaborator, weight, same_cluster in analytics.key_collaborators(name, get_scse_graph()):
+        st.markdown(f"- **{collaborator}**: {weight} joint papers" + (" (same cluster)" if same_cluster else ""))
+
+    members = [member for member in analytics.members(metrics['community']) if member != name]
+    if members:
+        index = get_keyword_index()
+        counts = index.facet_counts(index.bits_of(members + [name]))
+        topics = sorted(counts, key=lambda keyword: -counts[keyword])[:3]
+        st.markdown(f"**Research cluster #{metrics['community'] + 1}**" +
+                    (f" ({', '.join(topics)})" if topics else "") + f": {', '.join(members[:8])}" +
+                    (f" and {len(members) - 8} more" if len(members) > 8 else ""))
+
+
+@timed
 def display_top_coauthors(name):
-    # Load the data from the JSON file
-    with open('./data/coauthors.json', "r") as f:
-        data = json.load(f)
+    import figures
     st.subheader("Top Coauthors")
 
-    selected_value = st.slider("Number of coauthors:", min_value=1, max_value=10, value=5, step=1)
+    selected_value = keep('top_coauthors', st.slider("Number of coauthors:", min_value=1, max_value=10,
+                                                     value=kept('top_coauthors', 5), step=1, key='top_coauthors'))
     st.write(f"**Top {selected_value} Coauthors for {name} (based on DBLP)**")
 
-    coauthor_data = []
-    for professor in data:
-        if professor["name"] == name:
-            coauthors = professor["coauthors"]
-            # Loop through the coauthors and add their data to the list
-            for coauthor in coauthors[:selected_value]:
-                coauthor_data.append((coauthor['coauthor_name'], coauthor['times']))
-    df_coauthors = pd.DataFrame(coauthor_data, columns=["name (DBLP)", "number of collaborations"])
-
-    fig = px.bar(df_coauthors, 
-                 x="name (DBLP)", 
-                 y="number of collaborations",
-                 title=f"Top {selected_value} Coauthors for {name}",
-                 labels={"name (DBLP)": "Coauthor Name", "number of collaborations": "Number of Collaborations"},
-                 color="number of collaborations",
-                 color_continuous_scale=px.colors.sequential.Plasma)
-
-    fig.update_layout(xaxis={'categoryorder':'total descending'})
-    st.plotly_chart(fig, use_container_width=True)
+    fig = figures.top_coauthors_figure(name, selected_value)
+    plotly_chart(fig, use_container_width=True)
 
 
+@timed
 def plot_scse_bar():
+    import figures
     st.markdown("#### Top Research Areas")
-    df = pd.read_csv('./data/research_area_with_counts.csv')
-    df = df.sort_values(by='Number of Professors', ascending=False)
-    
-    fig = px.pie(df, 
-                 values='Number of Professors', 
-                 names='Broader Area', 
-                 title="Research Area Distribution by Number of Professors")
-
-    fig.update_traces(textinfo='percent+label')
-    fig.update_layout(
-        title="Research Area Distribution by Number of Professors",
-    )
-
-    st.plotly_chart(fig, use_container_width=True) 
+    fig = figures.research_area_figure()
+    plotly_chart(fig, use_container_width=True) 
 
 
+@timed
 def display_top_n_keywords():
-    df = pd.read_csv('./data/keywords_count.csv')
-    df = df[1:]  # Assuming the first row is not relevant
+    import figures
     st.markdown("#### Top Keywords")
     st.markdown("Use the slider to select and display keywords associated with the highest number of professors participating in the research.")
 
-    selected_value = st.slider("Number of Keywords", min_value=1, max_value=len(df), value=10, step=1)
+    count = len(figures.keyword_counts())
+    selected_value = keep('top_keywords', st.slider("Number of Keywords", min_value=1, max_value=count,
+                                                    value=min(kept('top_keywords', 10), count), step=1,
+                                                    key='top_keywords'))
+    fig = figures.top_keywords_figure(selected_value)
+    plotly_chart(fig, use_container_width=True)
 
-    df_sorted = df.sort_values(by='Number of Professors', ascending=False)
-    df_top_n = df_sorted.head(selected_value)
-    
-    # Find the max value for highlighting
-    max_professors = df_top_n['Number of Professors'].max()
-    df_top_n['Color'] = 'LightSkyBlue'
-    df_top_n.loc[df_top_n['Number of Professors'] == max_professors, 'Color'] = 'Crimson'
 
-    fig = px.bar(df_top_n, x='Keywords', y='Number of Professors', 
-                 color='Color', color_discrete_map="identity",
-                 title="Top Keywords by Number of Professors")
-
-    fig.update_layout(showlegend=False)
-    fig.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
-
-
-def build_adjacency_matrix():
-    f = open ('./data/coauthors_scse.json', "r")
-    filtered_professors_data = json.loads(f.read())
-    f.close()
-    # plot overall network
-    # Step 1: Create a list of unique professor names
-    professors = set()
-    for entry in filtered_professors_data:
-        professors.add(entry['name'])
-        for coauthor in entry['coauthors']:
-            professors.add(coauthor['coauthor_name'])
-
-    # Step 2: Create an empty adjacency matrix
-    adjacency_matrix = {professor: {} for professor in professors}
-
-    # Step 3: Populate the adjacency matrix
-    for entry in filtered_professors_data:
-        professor = entry['name']
-        for coauthor in entry['coauthors']:
-            coauthor_name = coauthor['coauthor_name']
-            times = coauthor['times']
-            adjacency_matrix[professor][coauthor_name] = times
-
-    # Step 4: Create a NetworkX graph (G) from the adjacency matrix
-    G = nx.Graph(adjacency_matrix)
-    return G, adjacency_matrix
+@timed
+def select_graph_layout(key):
+    from graph_figures import layouts
+    labels = {label: layout for layout, label in layouts.items()}
+    label = keep(key, st.radio("Graph layout", list(labels), index=kept_index(key, labels), horizontal=True, key=key))
+    return labels[label]
 
 
+@timed
 def display_overall_graph():
-    G, adjacency_matrix = build_adjacency_matrix()
+    from graph_figures import overall_graph_figure
+    layout = select_graph_layout(key='overall_graph_layout')
+    fig = overall_graph_figure(layout)
+    plotly_chart(fig, use_container_width=True)
 
-    nx.set_node_attributes(G, adjacency_matrix,"type")
-    nx.set_edge_attributes(G, 5, "edge_prop")
 
-    fig = ig.plot(G,title="SCSE Network Graph", layout="circular", 
-                  colorscale='YlOrRd')
-    st.plotly_chart(fig, use_container_width=True)
+@timed
+def display_trends(keywords=[], areas=[], match='any', exclude=[]):
+    '''
+    School-wide and area-level publication trends, for the professors selected in the
+    sidebar when there is a selection
+    '''
+    import figures
+    from trend_cube import get_trend_cube, measures
 
+    st.markdown("#### Publication Trends")
+    cube = get_trend_cube()
+    if not len(cube.years):
+        st.error("No publication data found.")
+        return
 
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        labels = {label: measure for measure, label in measures.items()}
+        measure = labels[keep('trend_measure', st.radio("Count by", list(labels), index=kept_index('trend_measure', labels),
+                                                        horizontal=True, key='trend_measure'))]
+    with col2:
+        first_year, last_year = int(cube.years[0]), int(cube.years[-1])
+        years = keep('trend_years', st.slider("Years", min_value=first_year, max_value=last_year,
+                                              value=kept_range('trend_years', first_year, last_year),
+                                              key='trend_years'))
+
+    selected = bool(keywords or areas or exclude)
+    col1, col2 = st.columns(2, gap='large')
+    with col1:
+        fig = figures.school_trend_figure(measure, years, keywords=keywords, areas=areas, match=match,
+                                          exclude=exclude,
+                                          title="Selected Professors by Year" if selected else "SCSE Publications by Year")
+        plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig = figures.area_trend_figure(measure, years=years)
+        plotly_chart(fig, use_container_width=True)
+
+
+@timed
 def display_treemap():
-    df = pd.read_csv("./data/keywords_count.csv")
-    df = df[1:]
-    fig = px.treemap(df, path=[px.Constant("SCSE"),'broad_topic', 'Keywords'], values='Number of Professors',
-                 color_continuous_scale='RdBu',color='Number of Professors',
-                 title='Research Areas and Keywords by Number of Professors')
-
+    import figures
+    fig = figures.treemap_figure()
     # Display the treemap in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 
 
+@timed
 def display_individual_graph(professor_name):
-    subgraph = nx.Graph()
-    subgraph.add_node(professor_name)
-
-    # Dictionary to store the frequency of collaborations among professors
-    collaboration_counts = {}
-    _, adjacency_matrix = build_adjacency_matrix()
-    # Loop through all adjacency matrices
-    for professor, matrix in adjacency_matrix.items():
-        if professor != professor_name:
-            if professor_name in matrix:
-                weight = matrix[professor_name]
-                subgraph.add_node(professor)
-                subgraph.add_edge(professor_name, professor, weight=weight)
-                # Check if other professors have connections with the target professor
-                for other_professor, other_weight in matrix.items():
-                    if other_professor != professor_name and other_weight > 0:
-                        if (professor, other_professor) not in collaboration_counts:
-                            collaboration_counts[(professor, other_professor)] = other_weight
-                        else:
-                            collaboration_counts[(professor, other_professor)] += other_weight
-
-    # Add edges for collaborations among professors
-    for (professor_1, professor_2), frequency in collaboration_counts.items():
-        if frequency > 0:
-            subgraph.add_edge(professor_1, professor_2, weight=frequency)
-
-    nx.set_node_attributes(subgraph, 3, "prop")
-    nx.set_edge_attributes(subgraph, 5, "edge_prop")
-
-    fig = ig.plot(subgraph, title=f"{professor_name}'s graph",
-            node_label_position="top center",
-            edge_label="weight", 
-            edge_label_position="bottom center",
-            layout="circular",
-            colorscale='YlOrRd') 
-    st.plotly_chart(fig, use_container_width=True)
+    from graph_figures import individual_graph_figure
+    layout = select_graph_layout(key='individual_graph_layout')
+    fig = individual_graph_figure(professor_name, layout)
+    plotly_chart(fig, use_container_width=True)
 
 
+@timed
 def conference_count_plot(name):
-    f = open ('./data/all_conference_count.json', "r")
-    all_professors_data = json.loads(f.read())
-    f.close()
-    for professor in all_professors_data:
-        if professor['name'] == name:
-            data = professor
-
-    df = pd.DataFrame(data['counts']).T
-    df.index = df.index.map(int)  
-    df = df.sort_index() 
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df.index, y=df['C'], mode='lines', name='C', stackgroup='one'
-    ))
-    fig.add_trace(go.Scatter(
-        x=df.index, y=df['B'], mode='lines', name='B', stackgroup='one'
-    ))
-    fig.add_trace(go.Scatter(
-        x=df.index, y=df['A'], mode='lines', name='A', stackgroup='one'
-    ))
-    fig.add_trace(go.Scatter(
-        x=df.index, y=df['A*'], mode='lines', name='A*', stackgroup='one'
-    ))
+    import figures
+    fig = figures.conference_count_figure(name)
+    if fig is None:
+        st.error("No conference data found for this author.")
+        return
+    plotly_chart(fig, use_container_width=True)
+
+
+@timed
+def comparison_frames(names):
+    '''
+    Get the data compared between professors as two DataFrames: the yearly counts
+    (name, year, chart, category, count) and one row of totals per professor.
+    The profiles of all professors are fetched in one batch.
+    '''
+    profiles = get_repository().get_profiles(names)
+    rows = []
+    for name in names:
+        for year, year_data in (profiles[name]['num_contributions'] or {}).items():
+            for category, count in year_data.items():
+                rows.append((name, int(year), 'Contributions', category, count))
+        ranks = core_ranking.get_conference_counts(name)
+        if ranks is not None:
+            for year, year_ranks in ranks.iterrows():
+                for rank, count in year_ranks.items():
+                    rows.append((name, int(year), 'CORE rank', rank, int(count)))
+    yearly = pd.DataFrame(rows, columns=['name', 'year', 'chart', 'category', 'count'])
+
+    professors = data_store.get_professors_table()
+    summary = professors[professors['Full Name'].isin(names)].set_index('Full Name').reindex(names)
+    summary = summary[['Citations (All)', 'publications_count', 'top_conference_count']]
+    summary.columns = ['Citations', 'Publications', 'Top Conferences']
+    summary.index.name = 'Professor'
+    return yearly, summary
+
+
+@timed
+def display_comparison(names):
+    import plotly.express as px
+    yearly, summary = comparison_frames(names)
+    st.dataframe(summary, use_container_width=True)
+
+    fig = px.bar(summary.reset_index(), x='Professor', y='Citations', title='Citations', color='Professor')
+    fig.update_layout(showlegend=False)
+    plotly_chart(fig, use_container_width=True)
+
+    contributions = yearly[yearly['chart'] == 'Contributions'].groupby(['name', 'year'], as_index=False)['count'].sum()
+    fig = px.line(contributions, x='year', y='count', color='name', markers=True,
+                  title='Contributions per Year',
+                  labels={'year': 'Year', 'count': 'Number of Contributions', 'name': 'Professor'})
+    plotly_chart(fig, use_container_width=True)
+
+    ranks = yearly[yearly['chart'] == 'CORE rank']
+    if ranks.empty:
+        st.error("No conference data found for these authors.")
+        return
+    # One row per professor, sharing the year and count axes
+    fig = px.bar(ranks, x='year', y='count', color='category', facet_row='name',
+                 category_orders={'category': list(core_ranking.core_ranks), 'name': names},
+                 title='Number of Conferences by Year and CORE Rank',
+                 labels={'year': 'Year', 'count': 'Conferences', 'category': 'CORE rank'},
+                 height=max(300, 180 * ranks['name'].nunique()))
+    fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split('=')[-1]))
+    plotly_chart(fig, use_container_width=True)
+
+
+@timed
+def display_search():
+    query = keep('search_query', st.text_input("Search biographies, research keywords and paper titles",
+                                               value=kept('search_query', ""), key='search_query'))
+    if not query.strip():
+        return
 
-    # Customize the layout
-    fig.update_layout(
-        title='Number of Conferences by Year',
-        xaxis_title='Year',
-        yaxis_title='Conference Count',
-        xaxis=dict(tickmode='linear'),
-        yaxis=dict(type='linear')
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    start = time.perf_counter()
+    index = get_search_index()
+    professors = index.search_professors(query, limit=10)
+    papers = index.search_papers(query, limit=20)
+    st.caption(f"Found in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    col1, col2 = st.columns(2, gap='large')
+    with col1:
+        st.markdown("#### Professors")
+        if not professors:
+            st.write("No matching professors.")
+        for name, score, snippet in professors:
+            st.markdown(f"**{name}**  \n{snippet}")
+    with col2:
+        st.markdown("#### Papers")
+        if not papers:
+            st.write("No matching papers.")
+        for paper in papers:
+            st.markdown(f"{paper['title']}  \n"
+                        f"*{paper['name']}, {paper['venue']} {paper['year']}*  \n"
+                        f"{paper['url'] or ''}")
 
 
 faculty_intro = '''
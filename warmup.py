@@ -0,0 +1,85 @@
+'''
+Background warm-up of a dashboard worker.
+
+The first script run of a fresh worker otherwise pays for the connection to the
+storage backend, the loading (or building) of every index and the import of the
+chart renderers. start() does that work once per process in a daemon thread, so
+it overlaps with the first page being served. Every step is also done lazily by
+the code that needs it, so a step that fails only logs a warning.
+Set SCSEDASH_WARMUP=0 to disable it.
+'''
+import os
+import logging
+import threading
+
+from instrumentation import span
+
+
+enabled = os.environ.get('SCSEDASH_WARMUP', '1') != '0'
+
+logger = logging.getLogger(__name__)
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _import_renderers():
+    import figures
+    import graph_figures
+    import wordcloud_cache
+    import plotly.express
+
+
+def _steps():
+    '''
+    (name, function) pairs in the order the pages need them: the backend and the
+    sidebar first, then the SCSE tab (charts and graph), then the other tabs
+    '''
+    from repository import get_repository
+    from keyword_index import get_keyword_index
+    from graph_index import get_scse_graph
+    from graph_analytics import get_graph_analytics
+    from publication_store import get_publication_store
+    from core_ranking import get_rank_matrix
+    from trend_cube import get_trend_cube
+    from search import get_search_index
+    from similarity import get_similarity_index
+
+    return [
+        ('backend', lambda: get_repository().backend.warm_up()),
+        ('keyword_index', get_keyword_index),
+        ('renderers', _import_renderers),
+        ('scse_graph', get_scse_graph),
+        ('graph_analytics', get_graph_analytics),
+        ('publication_store', get_publication_store),
+        # Without the publication export the precomputed counts are used
+        ('rank_matrix', lambda: get_publication_store() is not None and get_rank_matrix()),
+        ('trend_cube', get_trend_cube),
+        ('search_index', get_search_index),
+        ('similarity_index', get_similarity_index),
+    ]
+
+
+def warm_up():
+    '''
+    Run every warm-up step in the calling thread
+    '''
+    with span('warmup'):
+        for name, step in _steps():
+            try:
+                with span(f'warmup.{name}'):
+                    step()
+            except Exception as error:
+                logger.warning("Warm-up step %s failed: %s", name, error)
+
+
+def start():
+    '''
+    Start the warm-up in a daemon thread, once per process
+    '''
+    global _thread
+    with _lock:
+        if _thread is None and enabled:
+            _thread = threading.Thread(target=warm_up, name='scsedash-warmup', daemon=True)
+            _thread.start()
+        return _thread
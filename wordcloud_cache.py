@@ -0,0 +1,139 @@
+import io
+import re
+import threading
+
+import numpy as np
+from cachetools import LRUCache
+from wordcloud import WordCloud
+
+from repository import get_repository
+from instrumentation import span, cache_access
+
+
+# Collocations (frequent word pairs) depend on the whole text, so they are not
+# detected: only then do the counts of the years add up to those of the range
+_cloud_settings = {'width': 800, 'height': 400, 'background_color': 'white', 'collocations': False}
+_stopwords = frozenset(word.lower() for word in WordCloud().stopwords)
+_word = re.compile(r"\w[\w']*")
+# Bytes of rendered PNGs kept per process (a cloud is about 100 KB)
+image_cache_bytes = 16 * 2 ** 20
+
+# name -> (publications, YearTermTable). The publications object identifies the
+# profile version the table was built from, so a refreshed profile rebuilds it.
+_tables = LRUCache(maxsize=256)
+# (name, first year, last year) -> (publications, PNG bytes)
+_images = LRUCache(maxsize=image_cache_bytes, getsizeof=lambda entry: len(entry[1] or b'') or 1)
+_lock = threading.Lock()
+
+
+def tokenize(text):
+    '''
+    Split a text into words as WordCloud.process_text does: without possessive 's,
+    numbers and stopwords, and before the cases and plurals of a word are merged
+    '''
+    words = (word[:-2] if word.lower().endswith("'s") else word for word in _word.findall(text))
+    return [word for word in words if not word.isdigit() and word.lower() not in _stopwords]
+
+
+def merge_words(counts):
+    '''
+    Merge the counts of the cases and plurals of every word as WordCloud.process_text
+    does, each word under its most frequent case
+    '''
+    cases = {}
+    for word, count in counts.items():
+        case_counts = cases.setdefault(word.lower(), {})
+        case_counts[word] = case_counts.get(word, 0) + count
+    # A word ending in "s" (but not "ss") is the plural of the same word without it
+    for lower in list(cases):
+        if lower.endswith('s') and not lower.endswith('ss') and lower[:-1] in cases:
+            singular = cases[lower[:-1]]
+            for word, count in cases.pop(lower).items():
+                singular[word[:-1]] = singular.get(word[:-1], 0) + count
+    return {max(case_counts.items(), key=lambda item: item[1])[0]: sum(case_counts.values())
+            for case_counts in cases.values()}
+
+
+class YearTermTable:
+    '''
+    Title word counts of one professor by year, stored as prefix sums over
+    consecutive years so the counts of any year range are one subtraction.
+    The cases and plurals of a word are only merged on the counts of a range,
+    as they are in the text of the whole range.
+    '''
+
+    def __init__(self, publications):
+        years = sorted(map(int, publications.keys()))
+        self.first_year = years[0] if years else 0
+        self.last_year = years[-1] if years else -1
+
+        per_year = {}
+        vocabulary = {}
+        for year in years:
+            titles = " ".join(str(paper['title']) for category in publications[str(year)].values()
+                              for paper in category if paper['title'] is not None)
+            frequencies = {}
+            for word in tokenize(titles):
+                frequencies[word] = frequencies.get(word, 0) + 1
+            per_year[year] = frequencies
+            for word in frequencies:
+                vocabulary.setdefault(word, len(vocabulary))
+
+        counts = np.zeros((self.last_year - self.first_year + 2, len(vocabulary)), dtype=np.int32)
+        for year, frequencies in per_year.items():
+            row = counts[year - self.first_year + 1]
+            for word, count in frequencies.items():
+                row[vocabulary[word]] = count
+        self.words = np.array(list(vocabulary), dtype=object)
+        self.prefix = np.cumsum(counts, axis=0)
+
+    def frequencies(self, first_year, last_year):
+        '''
+        Get the term frequencies of the titles published from first_year to last_year,
+        as WordCloud(collocations=False).process_text gives them for all these titles
+        '''
+        first_year = max(first_year, self.first_year)
+        last_year = min(last_year, self.last_year)
+        if first_year > last_year:
+            return {}
+        counts = self.prefix[last_year - self.first_year + 1] - self.prefix[first_year - self.first_year]
+        nonzero = np.flatnonzero(counts)
+        return merge_words(dict(zip(self.words[nonzero], counts[nonzero].tolist())))
+
+
+def get_term_table(name):
+    publications = get_repository().get_profile(name)["publications"] or {}
+    with _lock:
+        entry = _tables.get(name)
+    if entry is None or entry[0] is not publications:
+        entry = (publications, YearTermTable(publications))
+        with _lock:
+            _tables[name] = entry
+    return entry[1]
+
+
+def word_cloud_png(name, first_year, last_year):
+    '''
+    Get the rendered word cloud of a professor's titles in a year range as PNG bytes,
+    or None if no titles were published in the range
+    '''
+    publications = get_repository().get_profile(name)["publications"]
+    key = (name, first_year, last_year)
+    with _lock:
+        entry = _images.get(key)
+    cache_access('word_cloud', entry is not None and entry[0] is publications)
+    if entry is not None and entry[0] is publications:
+        return entry[1]
+
+    frequencies = get_term_table(name).frequencies(first_year, last_year)
+    png = None
+    if frequencies:
+        wordcloud = WordCloud(**_cloud_settings)
+        with span('WordCloud.generate'):
+            image = wordcloud.generate_from_frequencies(frequencies).to_image()
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        png = buffer.getvalue()
+    with _lock:
+        _images[key] = (publications, png)
+    return png